@@ -0,0 +1,394 @@
+#!/usr/bin/env python3
+"""백엔드 핫패스 오프라인 마이크로벤치마크.
+
+네트워크 없이 scripts/bench_fixtures 의 자막 녹화본(YouTube 자동 생성 자막, 수동 자막)과
+고정 시드로 만든 픽스처만 사용한다. 쿠키는 실제 계정 값을 커밋할 수 없으므로 합성본을 쓴다.
+각 케이스는 repeat 회 측정한 중앙값을 기준선과 비교하고, 기준선과 이번 측정의 편차만큼은
+허용 범위를 넓힌다. 기준선보다 느리게 나온 케이스는 --confirm 회까지 다시 재서 계속 느릴 때만
+성능 저하로 본다 (공용 러너의 순간 부하를 거르기 위함).
+
+    PYTHONPATH=. python scripts/bench_backend.py                 # 기준선과 비교
+    PYTHONPATH=. python scripts/bench_backend.py --save-baseline # 기준선 갱신 (3바퀴 중앙값)
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from pydantic import TypeAdapter
+
+from youtube_backend import main as backend
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "bench_baseline.json")
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "bench_fixtures")
+# 큰 자막 케이스는 녹화본 본문을 이어 붙여 이 크기까지 키운다 (긴 강연·라이브 다시보기 수준).
+LARGE_VTT_BYTES = 1_500_000
+
+_KO_WORDS = [
+    "정부", "지원금", "신청", "대상", "소득", "기준", "청년", "주거", "정책", "발표",
+    "금리", "인상", "물가", "안정", "예산", "확대", "부모", "급여", "육아", "휴직",
+    "건강", "보험료", "감면", "세액", "공제", "연말정산", "환급", "일자리", "창출", "지역",
+]
+_EN_WORDS = ["policy", "update", "market", "rate", "support", "program", "income", "tax"]
+
+
+def _log(message: str):
+    print(message, flush=True)
+
+
+def _ts(total_ms: int) -> str:
+    h, rem = divmod(total_ms, 3_600_000)
+    m, rem = divmod(rem, 60_000)
+    s, ms = divmod(rem, 1000)
+    return f"{h:02d}:{m:02d}:{s:02d}.{ms:03d}"
+
+
+def _make_vtt(rng: random.Random, cues: int) -> str:
+    """YouTube 자동 자막처럼 단어 타이밍 태그와 롤링 중복 줄이 섞인 VTT를 만든다."""
+
+    lines = ["WEBVTT", "Kind: captions", "Language: ko", ""]
+    start = 0
+    prev_text = ""
+    for _ in range(cues):
+        end = start + rng.randint(800, 4000)
+        words = [rng.choice(_KO_WORDS + _EN_WORDS) for _ in range(rng.randint(3, 9))]
+        tagged = "".join(
+            f"<{_ts(start + idx * 120)}><c> {word}</c>" for idx, word in enumerate(words[1:])
+        )
+        lines.append(f"{_ts(start)} --> {_ts(end)} align:start position:0%")
+        if prev_text:
+            lines.append(prev_text)
+        lines.append(f"{words[0]}{tagged}")
+        lines.append("")
+        prev_text = " ".join(words)
+        start = end
+    return "\n".join(lines)
+
+
+def _make_cookie_export(rng: random.Random, count: int) -> str:
+    """브라우저 확장에서 내보낸 형태(탭/공백 혼용, HttpOnly, 주석)의 쿠키 텍스트."""
+
+    domains = [".youtube.com", ".google.com", "accounts.google.com", ".googlevideo.com"]
+    names = ["SAPISID", "__Secure-3PAPISID", "SID", "HSID", "SSID", "APISID", "LOGIN_INFO", "PREF"]
+    lines = ["# Netscape HTTP Cookie File", "# exported for benchmark", ""]
+    for idx in range(count):
+        domain = rng.choice(domains)
+        name = names[idx] if idx < len(names) else f"COOKIE_{idx}"
+        value = "".join(rng.choice("abcdefghijklmnopqrstuvwxyz0123456789-_") for _ in range(rng.randint(16, 160)))
+        fields = [domain, "TRUE", "/", "TRUE", str(1_800_000_000 + idx), name, value]
+        if idx % 5 == 0:
+            fields[0] = f"#HttpOnly_{domain}"
+        separator = "\t" if idx % 3 else "  "
+        lines.append(separator.join(fields) + ("\r" if idx % 7 == 0 else ""))
+    return "\n".join(lines)
+
+
+def _make_video_items(rng: random.Random, count: int) -> List[Dict[str, Any]]:
+    items = []
+    for idx in range(count):
+        year = rng.randint(2019, 2024)
+        published = f"{year}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}T{rng.randint(0, 23):02d}:{rng.randint(0, 59):02d}:00Z"
+        hours = rng.choice([0, 0, 0, 1, 2])
+        duration = f"PT{hours}H{rng.randint(0, 59)}M{rng.randint(0, 59)}S" if hours else f"PT{rng.randint(0, 59)}M{rng.randint(1, 59)}S"
+        date_raw, _ = backend._format_upload_datestr_iso8601_to_pair(published)
+        items.append(
+            {
+                "published": published,
+                "duration": duration,
+                "view_count": None if idx % 17 == 0 else rng.randint(0, 5_000_000),
+                "date_raw": date_raw,
+            }
+        )
+    return items
+
+
+def _make_search_response_items(rng: random.Random, keywords: int, per_keyword: int) -> Dict[str, List[Dict[str, Any]]]:
+    """search_youtube_videos_api가 돌려주는 형태의 결과 (키워드 × 영상)."""
+
+    response: Dict[str, List[Dict[str, Any]]] = {}
+    for kw in range(keywords):
+        items = []
+        for idx in range(per_keyword):
+            vid = f"{kw:02d}{idx:03d}{rng.getrandbits(24):06x}"
+            date_raw, date_fmt = backend._format_upload_datestr_iso8601_to_pair("2024-05-01T12:00:00Z")
+            items.append(
+                {
+                    "url": f"https://www.youtube.com/watch?v={vid}",
+                    "title": " ".join(rng.choice(_KO_WORDS) for _ in range(8)),
+                    "video_id": vid,
+                    "channel_title": f"채널 {rng.randint(0, 99)}",
+                    "channel_id": f"UC{rng.getrandbits(88):022x}",
+                    "date_raw": date_raw,
+                    "date_fmt": date_fmt,
+                    "published_at_iso": "2024-05-01T12:00:00Z",
+                    "view_count": rng.randint(0, 5_000_000),
+                    "dur_seconds": 754,
+                    "dur_hms": "12:34",
+                    "thumbnails": {
+                        size: {"url": f"https://i.ytimg.com/vi/{vid}/{size}.jpg", "width": w, "height": h}
+                        for size, w, h in (
+                            ("default", 120, 90),
+                            ("medium", 320, 180),
+                            ("high", 480, 360),
+                            ("standard", 640, 480),
+                            ("maxres", 1280, 720),
+                        )
+                    },
+                    "language": "ko",
+                    "has_captions": bool(idx % 2),
+                }
+            )
+        response[f"키워드 {kw}"] = items
+    return response
+
+
+def _report_payload_sizes(search_response: Dict[str, List[Dict[str, Any]]]):
+    body = backend._dump_json(
+        {key: [backend._search_item_payload(item) for item in items] for key, items in search_response.items()}
+    )
+    gz, _ = backend._compress_body(body, "gzip")
+    _log(f"search 50x10 응답 크기: raw {len(body) / 1024:.1f}KB, gzip {len(gz) / 1024:.1f}KB")
+    if backend.brotli is not None:
+        br, _ = backend._compress_body(body, "br")
+        _log(f"search 50x10 응답 크기: brotli {len(br) / 1024:.1f}KB")
+
+
+def _load_recorded(fixtures_dir: str, suffix: str) -> List[str]:
+    if not fixtures_dir or not os.path.isdir(fixtures_dir):
+        return []
+    texts = []
+    for name in sorted(os.listdir(fixtures_dir)):
+        if name.endswith(suffix):
+            with open(os.path.join(fixtures_dir, name), "r", encoding="utf-8") as file:
+                texts.append(file.read())
+    return texts
+
+
+def _tile_vtt(texts: List[str], target_bytes: int) -> str:
+    """녹화본들의 큐 본문을 헤더 하나 아래에 반복해 이어 붙여 큰 자막을 만든다."""
+
+    bodies = [text.split("\n\n", 1)[1] if "\n\n" in text else text for text in texts]
+    parts = ["WEBVTT\nKind: captions\nLanguage: ko\n"]
+    size = len(parts[0])
+    while size < target_bytes:
+        for body in bodies:
+            parts.append(body)
+            size += len(body)
+    return "\n".join(parts)
+
+
+def _measure(fn: Callable[[], Any], min_time: float, repeat: int) -> Tuple[float, float, int]:
+    """(초당 실행 횟수 중앙값, 측정 편차, 1회 실행 최대 메모리 바이트)를 반환한다.
+
+    측정 편차는 repeat 회 측정의 (최대 - 최소) / 중앙값이다.
+    """
+
+    fn()  # 워밍업
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    def timed_loops(loops: int) -> float:
+        started = time.perf_counter()
+        for _ in range(loops):
+            fn()
+        return time.perf_counter() - started
+
+    loops = 1
+    while True:
+        elapsed = timed_loops(loops)
+        if elapsed >= min_time:
+            break
+        estimate = int(loops * min_time / max(elapsed, 1e-9)) + 1
+        loops = min(loops * 10, max(loops * 2, estimate))
+    samples = [loops / elapsed] + [loops / timed_loops(loops) for _ in range(repeat - 1)]
+    median = statistics.median(samples)
+    return median, (max(samples) - min(samples)) / median, peak
+
+
+def _build_cases(fixtures_dir: str, job_dir: str) -> Dict[str, Callable[[], Any]]:
+    rng = random.Random(20240501)
+    small_vtts = [_make_vtt(rng, 40) for _ in range(20)]
+    large_vtt = _make_vtt(rng, 6000)
+    recorded_vtts = _load_recorded(fixtures_dir, ".vtt")
+    if recorded_vtts:
+        small_vtts = [text for text in recorded_vtts if len(text) < 200_000] or small_vtts
+        large_vtt = max(recorded_vtts, key=len)
+        if len(large_vtt) < LARGE_VTT_BYTES:
+            large_vtt = _tile_vtt(recorded_vtts, LARGE_VTT_BYTES)
+
+    cookie_text = _make_cookie_export(rng, 3000)
+    recorded_cookies = _load_recorded(fixtures_dir, ".cookies.txt")
+    if recorded_cookies:
+        cookie_text = max(recorded_cookies, key=len)
+    normalized_cookie_text = backend._ensure_netscape_cookie_text(cookie_text)
+
+    video_items = _make_video_items(rng, 5000)
+    durations = [item["duration"] for item in video_items]
+    published = [item["published"] for item in video_items]
+    search_results = [
+        {"view_count": item["view_count"], "date_raw": item["date_raw"]} for item in video_items[:500]
+    ]
+
+    transcript = "\n".join(" ".join(rng.choice(_KO_WORDS) for _ in range(12)) for _ in range(60_000))
+    job = {
+        "job_id": "bench-job",
+        "status": "completed",
+        "urls": [f"https://www.youtube.com/watch?v=vid{idx:08d}" for idx in range(20)],
+        "results": [
+            {
+                "url": f"https://www.youtube.com/watch?v=vid{idx:08d}",
+                "title": f"벤치마크 영상 {idx}",
+                "filename": f"벤치마크 영상 {idx}.txt",
+                "text": transcript if idx == 0 else transcript[: len(transcript) // 10],
+                "warning": None,
+            }
+            for idx in range(5)
+        ],
+        "error": None,
+    }
+    backend.JOB_STORE_DIR = job_dir
+    backend._save_job(job)
+
+    search_response = _make_search_response_items(rng, 10, 50)
+    search_adapter = TypeAdapter(Dict[str, List[backend.SearchItem]])
+
+    def search_response_pydantic():
+        # 기존 경로: SearchItem 생성 → response_model 재검증 → 직렬화
+        merged = {
+            key: [backend.SearchItem(**backend._search_item_payload(item)) for item in items]
+            for key, items in search_response.items()
+        }
+        return search_adapter.dump_json(search_adapter.validate_python(merged))
+
+    def search_response_fast():
+        return backend._dump_json(
+            {key: [backend._search_item_payload(item) for item in items] for key, items in search_response.items()}
+        )
+
+    def search_response_fast_gzip():
+        return backend._compress_body(search_response_fast(), "gzip")
+
+    project = backend._search_projector(["title", "url", "view_count", "dur_hms", "thumbnails.medium"])
+
+    def search_response_projected():
+        return backend._dump_json({key: list(map(project, items)) for key, items in search_response.items()})
+
+    def sort_views():
+        items = list(search_results)
+        backend._sort_search_items(items, "views")
+
+    def sort_date():
+        items = list(search_results)
+        backend._sort_search_items(items, "date")
+
+    _report_payload_sizes(search_response)
+
+    return {
+        "clean_vtt_small": lambda: [backend.clean_vtt(text) for text in small_vtts],
+        "clean_vtt_large": lambda: backend.clean_vtt(large_vtt),
+        "ensure_netscape_cookie_text": lambda: backend._ensure_netscape_cookie_text(cookie_text),
+        "extract_cookie_map": lambda: backend._extract_cookie_map(normalized_cookie_text),
+        "parse_iso8601_duration_x5000": lambda: [backend._parse_iso8601_duration_to_seconds(d) for d in durations],
+        "format_upload_date_x5000": lambda: [backend._format_upload_datestr_iso8601_to_pair(p) for p in published],
+        "sort_search_items_views_x500": sort_views,
+        "sort_search_items_date_x500": sort_date,
+        "search_response_pydantic_50x10": search_response_pydantic,
+        "search_response_fast_50x10": search_response_fast,
+        "search_response_fast_gzip_50x10": search_response_fast_gzip,
+        "search_response_projected_50x10": search_response_projected,
+        "save_job_large_transcript": lambda: backend._save_job(job),
+        "load_job_large_transcript": lambda: backend._load_job("bench-job"),
+    }
+
+
+def _load_baseline() -> Dict[str, Any]:
+    try:
+        with open(BASELINE_PATH, "r", encoding="utf-8") as file:
+            data = json.load(file)
+            if isinstance(data, dict):
+                return data
+    except Exception:
+        pass
+    return {}
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument(
+        "--fixtures", default=os.environ.get("BENCH_FIXTURES_DIR", FIXTURES_DIR), help="녹화된 *.vtt / *.cookies.txt 디렉터리"
+    )
+    parser.add_argument("--min-time", type=float, default=0.5, help="케이스당 최소 측정 시간(초)")
+    parser.add_argument("--repeat", type=int, default=5, help="케이스당 반복 측정 횟수 (중앙값을 비교)")
+    parser.add_argument("--tolerance", type=float, default=0.3, help="허용 성능 저하 비율 (케이스별 측정 편차가 더 크면 그만큼 넓힌다)")
+    parser.add_argument("--confirm", type=int, default=2, help="느리게 나온 케이스를 다시 재는 최대 횟수")
+    parser.add_argument("--baseline-rounds", type=int, default=3, help="기준선 저장 때 전체 케이스를 재는 바퀴 수")
+    parser.add_argument("--only", default="", help="쉼표로 구분한 케이스 이름")
+    parser.add_argument("--save-baseline", action="store_true")
+    args = parser.parse_args(argv)
+
+    only = {name.strip() for name in args.only.split(",") if name.strip()}
+    baseline = _load_baseline().get("cases", {})
+    results: Dict[str, Dict[str, float]] = {}
+    regressions: List[str] = []
+
+    with tempfile.TemporaryDirectory() as job_dir:
+        cases = {name: fn for name, fn in _build_cases(args.fixtures, job_dir).items() if not only or name in only}
+        if args.save_baseline:
+            # 기준선은 전체 케이스를 rounds 바퀴 번갈아 재서 중앙값을 쓰고, 바퀴 사이 편차를 잡음으로 남긴다.
+            rounds: Dict[str, List[Tuple[float, float, int]]] = {name: [] for name in cases}
+            for round_idx in range(max(1, args.baseline_rounds)):
+                _log(f"기준선 측정 {round_idx + 1}/{max(1, args.baseline_rounds)}")
+                for name, fn in cases.items():
+                    rounds[name].append(_measure(fn, args.min_time, max(1, args.repeat)))
+            for name, samples in rounds.items():
+                ops_samples = [ops for ops, _, _ in samples]
+                ops = statistics.median(ops_samples)
+                noise = max([(max(ops_samples) - min(ops_samples)) / ops] + [noise for _, noise, _ in samples])
+                results[name] = {"ops_per_sec": round(ops, 3), "noise": round(noise, 3), "peak_bytes": samples[-1][2]}
+        _log(f"{'case':<32} {'ops/sec':>12} {'peak mem':>12} {'vs baseline':>12}")
+        for name, fn in cases.items():
+            previous = baseline.get(name) or {}
+            previous_ops = previous.get("ops_per_sec")
+            if name in results:
+                ops, noise, peak = results[name]["ops_per_sec"], results[name]["noise"], results[name]["peak_bytes"]
+            else:
+                ops, noise, peak = _measure(fn, args.min_time, max(1, args.repeat))
+            # 기준선과 이번 측정의 편차를 합친 만큼은 잡음으로 본다. 저하 허용치는 최대 60%.
+            tolerance = min(0.6, max(args.tolerance, float(previous.get("noise") or 0.0) + noise))
+            for _ in range(0 if args.save_baseline else max(0, args.confirm)):
+                if not previous_ops or ops >= previous_ops * (1 - tolerance):
+                    break
+                retry_ops, retry_noise, _ = _measure(fn, args.min_time, max(1, args.repeat))
+                if retry_ops > ops:
+                    ops, noise = retry_ops, retry_noise
+            results[name] = {"ops_per_sec": round(ops, 3), "noise": round(noise, 3), "peak_bytes": peak}
+            ratio = f"{ops / previous_ops:>11.2f}x" if previous_ops else f"{'-':>12}"
+            _log(f"{name:<32} {ops:>12.1f} {peak / 1024:>10.1f}KB {ratio}")
+            if previous_ops and ops < previous_ops * (1 - tolerance):
+                regressions.append(name)
+
+    if args.save_baseline:
+        merged = dict(baseline)
+        merged.update(results)
+        with open(BASELINE_PATH, "w", encoding="utf-8") as file:
+            json.dump({"python": sys.version.split()[0], "cases": merged}, file, ensure_ascii=False, indent=2)
+            file.write("\n")
+        _log(f"기준선을 저장했습니다: {BASELINE_PATH}")
+        return 0
+
+    if regressions:
+        _log(f"성능 저하 감지 (기본 허용 {args.tolerance:.0%}): {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,324 @@
+#!/usr/bin/env python3
+"""부하 테스트용 가짜 YouTube Data API / 플레이어·자막 / GitHub Actions 업스트림.
+
+    python scripts/fake_upstream.py --port 8900 --latency-ms 80 --error-rate 0.01 --quota-rate 0.005
+
+백엔드는 YOUTUBE_API_BASE_URL=http://127.0.0.1:8900 / GITHUB_API_URL=http://127.0.0.1:8900
+환경변수로, 자막 실행기는 INNERTUBE_BASE_URL=http://127.0.0.1:8900 환경변수로 이 서버를 바라보게 한다.
+플레이어 응답의 자막 트랙 baseUrl은 이 서버의 /api/timedtext를 가리킨다.
+"""
+import argparse
+import hashlib
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+DEFAULT_CONFIG: Dict[str, float] = {
+    "latency_ms": 50.0,
+    "jitter_ms": 20.0,
+    "error_rate": 0.0,
+    "quota_rate": 0.0,
+}
+
+
+def _video_id(seed: str) -> str:
+    return hashlib.sha1(seed.encode("utf-8")).hexdigest()[:11]
+
+
+def _video_resource(video_id: str) -> Dict[str, Any]:
+    rng = random.Random(video_id)
+    minutes = rng.randint(0, 90)
+    return {
+        "kind": "youtube#video",
+        "id": video_id,
+        "snippet": {
+            "publishedAt": f"2024-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}T{rng.randint(0, 23):02d}:00:00Z",
+            "channelId": "UC" + hashlib.sha1(f"ch{rng.randint(0, 40)}".encode()).hexdigest()[:22],
+            "title": f"가짜 영상 {video_id}",
+            "description": "부하 테스트용 설명 " * rng.randint(1, 20),
+            "thumbnails": {
+                size: {"url": f"https://i.ytimg.com/vi/{video_id}/{size}.jpg", "width": w, "height": h}
+                for size, w, h in (("default", 120, 90), ("medium", 320, 180), ("high", 480, 360))
+            },
+            "channelTitle": f"가짜 채널 {rng.randint(0, 40)}",
+            "defaultAudioLanguage": "ko",
+        },
+        "contentDetails": {
+            "duration": f"PT{minutes}M{rng.randint(1, 59)}S",
+            "caption": "true" if rng.random() < 0.6 else "false",
+        },
+        "statistics": {"viewCount": str(rng.randint(0, 3_000_000))},
+    }
+
+
+def _parse_fields(mask: str) -> Dict[str, Any]:
+    """YouTube fields 마스크(items(id,snippet(title)))를 중첩 dict로 바꾼다. a/b는 a(b)와 같다."""
+
+    tree: Dict[str, Any] = {}
+    stack = [tree]
+    token = ""
+
+    def flush():
+        nonlocal token
+        if token:
+            node = stack[-1]
+            for segment in token.split("/"):
+                node = node.setdefault(segment, {})
+            token = ""
+            return node
+        return None
+
+    last: Optional[Dict[str, Any]] = None
+    for char in mask:
+        if char == "(":
+            last = flush()
+            stack.append(last if last is not None else stack[-1])
+        elif char == ")":
+            flush()
+            stack.pop()
+        elif char == ",":
+            flush()
+        else:
+            token += char
+    flush()
+    return tree
+
+
+def _apply_fields(value: Any, tree: Dict[str, Any]) -> Any:
+    if not tree:
+        return value
+    if isinstance(value, list):
+        return [_apply_fields(item, tree) for item in value]
+    if not isinstance(value, dict):
+        return value
+    return {key: _apply_fields(value[key], child) for key, child in tree.items() if key in value}
+
+
+def _vtt(video_id: str) -> str:
+    rng = random.Random(video_id)
+    lines = ["WEBVTT", "Kind: captions", "Language: ko", ""]
+    for idx in range(200):
+        lines.append(f"00:{idx // 60:02d}:{idx % 60:02d}.000 --> 00:{idx // 60:02d}:{idx % 60:02d}.900")
+        lines.append(f"자막 줄 {idx} {rng.randint(0, 9999)}")
+        lines.append("")
+    return "\n".join(lines)
+
+
+def _player_response(video_id: str, base_url: str) -> Dict[str, Any]:
+    """innertube /youtubei/v1/player 응답 중 자막 추출 경로가 읽는 부분만 흉내 낸다.
+
+    자막 유무는 /youtube/v3/videos의 contentDetails.caption과 맞춘다.
+    """
+
+    resource = _video_resource(video_id)
+    tracks = []
+    if resource["contentDetails"]["caption"] == "true":
+        tracks = [
+            {
+                "baseUrl": f"{base_url}/api/timedtext?v={video_id}&lang={lang}{'&kind=asr' if kind else ''}&fmt=srv3",
+                "languageCode": lang,
+                **({"kind": kind} if kind else {}),
+            }
+            for lang, kind in (("ko", ""), ("en", "asr"))
+        ]
+    return {
+        "playabilityStatus": {"status": "OK"},
+        "videoDetails": {"videoId": video_id, "title": resource["snippet"]["title"]},
+        "captions": {"playerCaptionsTracklistRenderer": {"captionTracks": tracks}},
+    }
+
+
+class FakeUpstreamHandler(BaseHTTPRequestHandler):
+    config: Dict[str, float] = dict(DEFAULT_CONFIG)
+    counts: Dict[str, int] = {}
+    counts_lock = threading.Lock()
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):  # noqa: A002 - BaseHTTPRequestHandler 시그니처
+        pass
+
+    def _count(self, key: str):
+        with self.counts_lock:
+            self.counts[key] = self.counts.get(key, 0) + 1
+
+    def _send(self, status: int, body: bytes, content_type: str = "application/json; charset=UTF-8"):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if body:
+            self.wfile.write(body)
+
+    def _send_json(self, status: int, payload: Dict[str, Any]):
+        self._send(status, json.dumps(payload, ensure_ascii=False).encode("utf-8"))
+
+    def _simulate(self, key: str) -> bool:
+        """지연을 주고, 설정된 비율로 오류를 돌려준다. 오류를 보냈으면 True."""
+
+        self._count(key)
+        delay = self.config["latency_ms"] + random.uniform(-1, 1) * self.config["jitter_ms"]
+        if delay > 0:
+            time.sleep(delay / 1000.0)
+        roll = random.random()
+        if roll < self.config["quota_rate"]:
+            self._count(f"{key}:403")
+            self._send_json(
+                403,
+                {
+                    "error": {
+                        "code": 403,
+                        "message": "The request cannot be completed because you have exceeded your quota.",
+                        "errors": [{"reason": "quotaExceeded", "domain": "youtube.quota"}],
+                    }
+                },
+            )
+            return True
+        if roll < self.config["quota_rate"] + self.config["error_rate"]:
+            self._count(f"{key}:500")
+            self._send_json(500, {"error": {"code": 500, "message": "Backend Error"}})
+            return True
+        return False
+
+    def do_GET(self):
+        parsed = urlparse(self.path)
+        query = {k: v[-1] for k, v in parse_qs(parsed.query).items()}
+        path = parsed.path.rstrip("/")
+
+        if path == "/_stats":
+            with self.counts_lock:
+                self._send_json(200, {"config": self.config, "counts": dict(self.counts)})
+            return
+        if path == "/youtube/v3/search":
+            if self._simulate("search"):
+                return
+            limit = min(int(query.get("maxResults", "5") or 5), 50)
+            seed = f"{query.get('q', '')}|{query.get('channelId', '')}"
+            items = [{"id": {"kind": "youtube#video", "videoId": _video_id(f"{seed}|{idx}")}} for idx in range(limit)]
+            payload = {"kind": "youtube#searchListResponse", "items": items}
+            if query.get("fields"):
+                payload = _apply_fields(payload, _parse_fields(query["fields"]))
+            self._send_json(200, payload)
+            return
+        if path == "/youtube/v3/videos":
+            if self._simulate("videos"):
+                return
+            ids = [vid for vid in query.get("id", "").split(",") if vid][:50]
+            parts = {"id", *(part for part in query.get("part", "").split(",") if part)}
+            items = [
+                {key: value for key, value in _video_resource(vid).items() if key in parts or key == "kind"}
+                for vid in ids
+            ]
+            payload: Dict[str, Any] = {"kind": "youtube#videoListResponse", "items": items}
+            if query.get("fields"):
+                payload = _apply_fields(payload, _parse_fields(query["fields"]))
+            self._send_json(200, payload)
+            return
+        if path == "/youtube/v3/channels":
+            if self._simulate("channels"):
+                return
+            handle = query.get("forHandle") or query.get("forUsername") or ""
+            ids = [cid for cid in query.get("id", "").split(",") if cid]
+            if handle:
+                ids = ["UC" + hashlib.sha1(handle.encode()).hexdigest()[:22]]
+            items = [
+                {
+                    "id": cid,
+                    "etag": hashlib.sha1(f"etag|{cid}".encode()).hexdigest()[:27],
+                    "snippet": {"title": f"가짜 채널 {cid[-4:]}"},
+                    "contentDetails": {"relatedPlaylists": {"uploads": "UU" + cid[2:]}},
+                    "statistics": {"subscriberCount": "1000", "videoCount": "100", "viewCount": "100000"},
+                }
+                for cid in ids[:50]
+            ]
+            payload = {"kind": "youtube#channelListResponse", "items": items}
+            if query.get("fields"):
+                payload = _apply_fields(payload, _parse_fields(query["fields"]))
+            self._send_json(200, payload)
+            return
+        if path == "/api/timedtext":
+            if self._simulate("timedtext"):
+                return
+            self._send(200, _vtt(query.get("v", "")).encode("utf-8"), "text/vtt; charset=UTF-8")
+            return
+        self._send_json(404, {"error": {"code": 404, "message": "not found"}})
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length) if length else b""
+        path = urlparse(self.path).path
+        if path == "/youtubei/v1/player":
+            if self._simulate("player"):
+                return
+            try:
+                video_id = str(json.loads(body.decode("utf-8") or "{}").get("videoId") or "")
+            except ValueError:
+                video_id = ""
+            if not video_id:
+                self._send_json(400, {"error": {"code": 400, "message": "videoId is required"}})
+                return
+            base_url = f"http://{self.headers.get('Host') or '%s:%d' % self.server.server_address[:2]}"
+            self._send_json(200, _player_response(video_id, base_url))
+            return
+        if path.startswith("/repos/") and path.endswith("/dispatches"):
+            if self._simulate("dispatch"):
+                return
+            self._send(204, b"")
+            return
+        self._send_json(404, {"error": {"code": 404, "message": "not found"}})
+
+
+def start_fake_upstream(
+    host: str = "127.0.0.1",
+    port: int = 0,
+    config: Optional[Dict[str, float]] = None,
+) -> Tuple[ThreadingHTTPServer, str]:
+    """백그라운드 스레드에서 서버를 띄우고 (서버, 기본 URL)을 돌려준다."""
+
+    handler = type("ConfiguredFakeUpstreamHandler", (FakeUpstreamHandler,), {})
+    handler.config = dict(DEFAULT_CONFIG, **(config or {}))
+    handler.counts = {}
+    handler.counts_lock = threading.Lock()
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, name="fake-upstream", daemon=True)
+    thread.start()
+    return server, f"http://{host}:{server.server_address[1]}"
+
+
+def _parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8900)
+    parser.add_argument("--latency-ms", type=float, default=DEFAULT_CONFIG["latency_ms"])
+    parser.add_argument("--jitter-ms", type=float, default=DEFAULT_CONFIG["jitter_ms"])
+    parser.add_argument("--error-rate", type=float, default=DEFAULT_CONFIG["error_rate"])
+    parser.add_argument("--quota-rate", type=float, default=DEFAULT_CONFIG["quota_rate"])
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None):
+    args = _parse_args(argv)
+    server, base_url = start_fake_upstream(
+        args.host,
+        args.port,
+        {
+            "latency_ms": args.latency_ms,
+            "jitter_ms": args.jitter_ms,
+            "error_rate": args.error_rate,
+            "quota_rate": args.quota_rate,
+        },
+    )
+    print(f"가짜 업스트림 실행 중: {base_url} (통계: {base_url}/_stats)", flush=True)
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
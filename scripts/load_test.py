@@ -0,0 +1,329 @@
+#!/usr/bin/env python3
+"""FastAPI 백엔드 종단 간 부하 테스트.
+
+가짜 업스트림(fake_upstream.py)을 띄우고 워커 수별로 uvicorn을 실행한 뒤
+/api/search_videos, /api/extract_captions, 상태 조회 트래픽을 동시성 단계별로 보낸다.
+--runners를 주면 백엔드를 pull 모드로 띄우고 상주 실행기(run_caption_job.py --daemon)도 함께
+실행해, 가짜 플레이어·자막 엔드포인트를 거치는 실제 자막 추출까지 부하를 건다.
+
+    python scripts/load_test.py --workers 1,2,4 --concurrency 1,4,16,32 --duration 10
+    python scripts/load_test.py --workers 2 --concurrency 4,16 --runners 4
+"""
+import argparse
+import http.client
+import json
+import math
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from fake_upstream import start_fake_upstream
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+JOB_TOKEN = "load-test-token"
+KEYWORDS = ["청년 지원금", "금리 인상", "육아 휴직", "연말정산", "주거 정책", "건강 보험료", "물가 안정", "일자리"]
+
+
+def _log(message: str):
+    print(message, flush=True)
+
+
+def _free_port() -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _percentile(sorted_values: List[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, math.ceil(pct / 100.0 * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def _start_app(workers: int, upstream_url: str, data_dir: str, pull_mode: bool = False) -> Tuple[subprocess.Popen, int]:
+    port = _free_port()
+    env = dict(os.environ)
+    env.update(
+        {
+            "YOUTUBE_API_KEY": "fake-key",
+            "YOUTUBE_API_BASE_URL": upstream_url,
+            "INNERTUBE_BASE_URL": upstream_url,
+            "GITHUB_API_URL": upstream_url,
+            "CAPTION_DISPATCH_MODE": "pull" if pull_mode else "workflow",
+            "CAPTION_WORKFLOW_REPO": "load/test",
+            "CAPTION_WORKFLOW_FILE": "captions.yml",
+            "CAPTION_WORKFLOW_TOKEN": "fake-github-token",
+            "CAPTION_JOB_BASE_URL": f"http://127.0.0.1:{port}",
+            "CAPTION_JOB_TOKEN": JOB_TOKEN,
+        }
+    )
+    process = subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "uvicorn",
+            "main:app",
+            "--app-dir",
+            os.path.join(REPO_ROOT, "youtube_backend"),
+            "--host",
+            "127.0.0.1",
+            "--port",
+            str(port),
+            "--workers",
+            str(workers),
+            "--log-level",
+            "warning",
+        ],
+        cwd=data_dir,
+        env=env,
+    )
+    deadline = time.time() + 30
+    while time.time() < deadline:
+        try:
+            conn = http.client.HTTPConnection("127.0.0.1", port, timeout=1)
+            conn.request("GET", "/api/channel_store")
+            conn.getresponse().read()
+            conn.close()
+            return process, port
+        except OSError:
+            time.sleep(0.2)
+    process.terminate()
+    raise RuntimeError("uvicorn 기동 실패")
+
+
+def _start_runner(port: int, upstream_url: str, data_dir: str, concurrency: int) -> subprocess.Popen:
+    """pull 모드 백엔드를 long-poll하는 상주 실행기를 띄운다. 자막은 가짜 업스트림에서 받는다."""
+
+    runner_dir = os.path.join(data_dir, "runner")
+    os.makedirs(runner_dir, exist_ok=True)
+    env = dict(os.environ)
+    env.update(
+        {
+            "PYTHONPATH": os.pathsep.join(filter(None, [REPO_ROOT, env.get("PYTHONPATH", "")])),
+            "INNERTUBE_BASE_URL": upstream_url,
+            "CAPTION_JOB_BASE_URL": f"http://127.0.0.1:{port}",
+            "CAPTION_JOB_TOKEN": JOB_TOKEN,
+        }
+    )
+    return subprocess.Popen(
+        [
+            sys.executable,
+            os.path.join(REPO_ROOT, "scripts", "run_caption_job.py"),
+            "--daemon",
+            "--concurrency",
+            str(concurrency),
+            "--poll-wait",
+            "5",
+        ],
+        cwd=runner_dir,
+        env=env,
+        stdout=subprocess.DEVNULL,
+    )
+
+
+def _upstream_counts(server) -> Dict[str, int]:
+    handler = server.RequestHandlerClass
+    with handler.counts_lock:
+        return dict(handler.counts)
+
+
+class _Recorder:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.latencies: Dict[str, List[float]] = {}
+        self.errors: Dict[str, int] = {}
+        self.job_ids: List[str] = []
+
+    def record(self, kind: str, seconds: float, ok: bool):
+        with self.lock:
+            self.latencies.setdefault(kind, []).append(seconds)
+            if not ok:
+                self.errors[kind] = self.errors.get(kind, 0) + 1
+
+
+def _request(conn: http.client.HTTPConnection, method: str, path: str, body: Optional[Dict[str, Any]] = None):
+    payload = json.dumps(body).encode("utf-8") if body is not None else None
+    headers = {"Content-Type": "application/json"} if payload is not None else {}
+    conn.request(method, path, body=payload, headers=headers)
+    response = conn.getresponse()
+    data = response.read()
+    return response.status, data
+
+
+def _client_loop(port: int, stop_at: float, mix: Dict[str, float], recorder: _Recorder, seed: int):
+    rng = random.Random(seed)
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=60)
+    kinds = list(mix)
+    weights = [mix[kind] for kind in kinds]
+    while time.time() < stop_at:
+        kind = rng.choices(kinds, weights)[0]
+        with recorder.lock:
+            job_ids = list(recorder.job_ids[-50:])
+        if kind == "status" and not job_ids:
+            kind = "extract"
+        started = time.perf_counter()
+        ok = False
+        try:
+            if kind == "search":
+                keywords = rng.sample(KEYWORDS, rng.randint(1, 4))
+                status, _ = _request(conn, "POST", "/api/search_videos", {"keywords": keywords, "limit": 50})
+                ok = status == 200
+            elif kind == "extract":
+                urls = [f"https://www.youtube.com/watch?v={rng.getrandbits(40):011x}" for _ in range(rng.randint(1, 10))]
+                status, data = _request(conn, "POST", "/api/extract_captions", {"urls": urls})
+                ok = status == 200
+                if ok:
+                    with recorder.lock:
+                        recorder.job_ids.append(json.loads(data)["job_id"])
+            else:
+                status, _ = _request(conn, "GET", f"/api/extract_captions/{rng.choice(job_ids)}")
+                ok = status == 200
+        except (OSError, http.client.HTTPException):
+            conn.close()
+            conn = http.client.HTTPConnection("127.0.0.1", port, timeout=60)
+        recorder.record(kind, time.perf_counter() - started, ok)
+    conn.close()
+
+
+def _run_level(port: int, concurrency: int, duration: float, mix: Dict[str, float]) -> Dict[str, Any]:
+    recorder = _Recorder()
+    stop_at = time.time() + duration
+    threads = [
+        threading.Thread(target=_client_loop, args=(port, stop_at, mix, recorder, idx), daemon=True)
+        for idx in range(concurrency)
+    ]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    all_latencies = sorted(value for values in recorder.latencies.values() for value in values)
+    per_kind = {}
+    for kind, values in recorder.latencies.items():
+        values.sort()
+        per_kind[kind] = {
+            "count": len(values),
+            "errors": recorder.errors.get(kind, 0),
+            "p50_ms": _percentile(values, 50) * 1000,
+            "p95_ms": _percentile(values, 95) * 1000,
+            "p99_ms": _percentile(values, 99) * 1000,
+        }
+    return {
+        "concurrency": concurrency,
+        "throughput_rps": len(all_latencies) / elapsed if elapsed else 0.0,
+        "errors": sum(recorder.errors.values()),
+        "p50_ms": _percentile(all_latencies, 50) * 1000,
+        "p95_ms": _percentile(all_latencies, 95) * 1000,
+        "p99_ms": _percentile(all_latencies, 99) * 1000,
+        "by_kind": per_kind,
+    }
+
+
+def _saturation_point(levels: List[Dict[str, Any]], min_gain: float) -> Optional[int]:
+    """처리량 증가율이 min_gain 미만으로 떨어지는 첫 동시성 단계를 찾는다."""
+
+    for prev, cur in zip(levels, levels[1:]):
+        if prev["throughput_rps"] and cur["throughput_rps"] < prev["throughput_rps"] * (1 + min_gain):
+            return prev["concurrency"]
+    return None
+
+
+def _parse_int_list(value: str) -> List[int]:
+    return [int(part) for part in value.split(",") if part.strip()]
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", default="1,2,4", help="uvicorn 워커 수 목록")
+    parser.add_argument("--concurrency", default="1,4,8,16,32", help="동시 클라이언트 수 목록")
+    parser.add_argument("--duration", type=float, default=10.0, help="단계별 측정 시간(초)")
+    parser.add_argument("--mix", default="search=0.3,extract=0.2,status=0.5", help="요청 비율")
+    parser.add_argument("--latency-ms", type=float, default=80.0)
+    parser.add_argument("--jitter-ms", type=float, default=30.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--quota-rate", type=float, default=0.0)
+    parser.add_argument("--runners", type=int, default=0, help="함께 띄울 상주 자막 실행기 동시 처리 수 (0이면 디스패치만 측정)")
+    parser.add_argument("--min-gain", type=float, default=0.1, help="포화 판단 기준 처리량 증가율")
+    parser.add_argument("--json", default="", help="결과를 저장할 JSON 경로")
+    args = parser.parse_args(argv)
+
+    mix = {}
+    for part in args.mix.split(","):
+        kind, _, weight = part.partition("=")
+        mix[kind.strip()] = float(weight or 0)
+
+    server, upstream_url = start_fake_upstream(
+        config={
+            "latency_ms": args.latency_ms,
+            "jitter_ms": args.jitter_ms,
+            "error_rate": args.error_rate,
+            "quota_rate": args.quota_rate,
+        }
+    )
+    _log(f"가짜 업스트림: {upstream_url}")
+
+    report: Dict[str, Any] = {"upstream": upstream_url, "runs": []}
+    try:
+        for workers in _parse_int_list(args.workers):
+            with tempfile.TemporaryDirectory() as data_dir:
+                process, port = _start_app(workers, upstream_url, data_dir, pull_mode=args.runners > 0)
+                runner = _start_runner(port, upstream_url, data_dir, args.runners) if args.runners > 0 else None
+                counts_before = _upstream_counts(server)
+                try:
+                    levels = []
+                    _log(f"\n== workers={workers} ==")
+                    _log(f"{'conc':>5} {'rps':>9} {'p50ms':>9} {'p95ms':>9} {'p99ms':>9} {'errors':>7}")
+                    for concurrency in _parse_int_list(args.concurrency):
+                        level = _run_level(port, concurrency, args.duration, mix)
+                        levels.append(level)
+                        _log(
+                            f"{concurrency:>5} {level['throughput_rps']:>9.1f} {level['p50_ms']:>9.1f} "
+                            f"{level['p95_ms']:>9.1f} {level['p99_ms']:>9.1f} {level['errors']:>7}"
+                        )
+                    saturation = _saturation_point(levels, args.min_gain)
+                    _log(f"포화 지점(동시성): {saturation if saturation is not None else '측정 범위 내 없음'}")
+                    counts_after = _upstream_counts(server)
+                    upstream_calls = {
+                        key: counts_after[key] - counts_before.get(key, 0)
+                        for key in counts_after
+                        if counts_after[key] != counts_before.get(key, 0)
+                    }
+                    if runner is not None:
+                        _log(
+                            f"자막 추출 업스트림 호출: player {upstream_calls.get('player', 0)}, "
+                            f"timedtext {upstream_calls.get('timedtext', 0)}"
+                        )
+                    report["runs"].append(
+                        {
+                            "workers": workers,
+                            "levels": levels,
+                            "saturation_concurrency": saturation,
+                            "upstream_calls": upstream_calls,
+                        }
+                    )
+                finally:
+                    if runner is not None:
+                        runner.terminate()
+                        runner.wait(timeout=30)
+                    process.terminate()
+                    process.wait(timeout=30)
+    finally:
+        server.shutdown()
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as file:
+            json.dump(report, file, ensure_ascii=False, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,16 +1,33 @@
 #!/usr/bin/env python3
-"""GitHub Actions 자막 추출 작업 실행기."""
+"""자막 추출 작업 실행기.
+
+기본은 GitHub Actions에서 CAPTION_JOB_ID 작업 하나를 처리하고 끝낸다.
+--daemon을 주면 백엔드(CAPTION_DISPATCH_MODE=pull)를 long-poll하며 작업을 계속 처리한다.
+
+    python scripts/run_caption_job.py --daemon --concurrency 4
+"""
+import argparse
+import base64
+import json
 import os
-import tempfile
-from typing import Any, Dict, List
+import signal
+import socket
+import threading
+import time
+from typing import Any, Dict, List, Optional
 
 import requests
+import yt_dlp
 
 from youtube_backend.main import (
-    _build_sapisidhash_header,
-    _ensure_netscape_cookie_text,
-    _extract_cookie_map,
+    DEFAULT_EXTRACT_HEADERS,
+    PROFILE_DIR,
+    LocalThrottleError,
+    ThrottledError,
     _extract_text_and_title,
+    _profiling,
+    _should_profile,
+    load_credential_pool,
     sanitize_filename,
     ExtractItem,
 )
@@ -27,75 +44,150 @@ def _get_env(name: str) -> str:
     return value
 
 
-def _fetch_job(base_url: str, job_id: str, token: str) -> Dict[str, Any]:
+def _fetch_job(base_url: str, job_id: str, token: str) -> Optional[Dict[str, Any]]:
+    """작업에 리스를 걸어 가져온다. 이미 끝났거나 다른 실행기가 처리 중이면 None."""
+
     url = f"{base_url.rstrip('/')}/internal/caption_jobs/{job_id}"
     _log(f"[job:{job_id}] 작업 정보를 요청합니다: {url}")
     resp = requests.get(url, headers={"X-Job-Token": token}, timeout=60)
+    if resp.status_code == 409:
+        return None
     if resp.status_code != 200:
         raise RuntimeError(f"작업 정보 조회 실패: {resp.status_code} {resp.text}")
     return resp.json()
 
 
-def _post_result(base_url: str, job_id: str, token: str, payload: Dict[str, Any]):
+def _post_result(
+    base_url: str, job_id: str, token: str, payload: Dict[str, Any], http: Optional[requests.Session] = None
+):
     url = f"{base_url.rstrip('/')}/internal/caption_jobs/{job_id}/complete"
     _log(f"[job:{job_id}] 작업 결과를 전송합니다: {url}")
-    resp = requests.post(url, headers={"X-Job-Token": token}, json=payload, timeout=60)
+    resp = (http or requests).post(url, headers={"X-Job-Token": token}, json=payload, timeout=60)
     if resp.status_code != 200:
         raise RuntimeError(f"작업 결과 전송 실패: {resp.status_code} {resp.text}")
     return resp.json()
 
 
-def main():
-    job_id = _get_env("CAPTION_JOB_ID")
-    base_url = _get_env("CAPTION_JOB_BASE_URL")
-    token = _get_env("CAPTION_JOB_TOKEN")
+def _upload_profiles(
+    base_url: str, job_id: str, token: str, profile_ids: List[str], http: Optional[requests.Session] = None
+):
+    """실행기에서 남긴 프로파일을 백엔드로 올린다. 실패해도 작업 결과에는 영향을 주지 않는다."""
 
-    try:
-        job_data = _fetch_job(base_url, job_id, token)
-    except Exception as exc:  # pragma: no cover - 네트워크 의존
-        _log(f"[job:{job_id}] 작업 정보 조회 중 오류: {exc}")
-        raise
+    url = f"{base_url.rstrip('/')}/internal/profiles"
+    for profile_id in profile_ids:
+        try:
+            with open(os.path.join(PROFILE_DIR, f"{profile_id}.json"), "r", encoding="utf-8") as file:
+                record = json.load(file)
+            prof_path = os.path.join(PROFILE_DIR, f"{profile_id}.prof")
+            prof_b64 = ""
+            if os.path.exists(prof_path):
+                with open(prof_path, "rb") as file:
+                    prof_b64 = base64.b64encode(file.read()).decode("ascii")
+            resp = (http or requests).post(
+                url, headers={"X-Job-Token": token}, json={"record": record, "prof_b64": prof_b64}, timeout=60
+            )
+            if resp.status_code != 200:
+                raise RuntimeError(f"{resp.status_code} {resp.text}")
+        except Exception as exc:  # pragma: no cover - 네트워크·파일 시스템 의존
+            _log(f"[job:{job_id}] 프로파일 업로드 실패: {profile_id} ({exc})")
+
+
+def _claim_job(
+    http: requests.Session, base_url: str, token: str, wait: float, worker: str = ""
+) -> Optional[Dict[str, Any]]:
+    """대기 작업을 하나 가져온다. wait초 안에 작업이 없으면 None."""
+
+    url = f"{base_url.rstrip('/')}/internal/caption_jobs/claim"
+    resp = http.post(
+        url, headers={"X-Job-Token": token}, params={"wait": wait, "worker": worker}, timeout=wait + 30
+    )
+    if resp.status_code == 204:
+        return None
+    if resp.status_code != 200:
+        raise RuntimeError(f"작업 가져오기 실패: {resp.status_code} {resp.text}")
+    return resp.json()
+
+
+class _LeaseHeartbeat:
+    """작업을 처리하는 동안 백그라운드에서 리스를 연장한다."""
+
+    def __init__(self, base_url: str, job_id: str, token: str, job_data: Dict[str, Any]):
+        self.url = f"{base_url.rstrip('/')}/internal/caption_jobs/{job_id}/heartbeat"
+        self.job_id = job_id
+        self.token = token
+        self.lease_id = job_data.get("lease_id") or ""
+        self.interval = max(1.0, float(job_data.get("lease_timeout_sec") or 300) / 3)
+        self.lost = False
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name=f"lease-{job_id}", daemon=True)
+
+    def __enter__(self) -> "_LeaseHeartbeat":
+        if self.lease_id:
+            self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._stop.set()
+        if self._thread.is_alive():
+            self._thread.join(timeout=5)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                resp = requests.post(
+                    self.url, headers={"X-Job-Token": self.token}, json={"lease_id": self.lease_id}, timeout=30
+                )
+            except Exception as exc:  # pragma: no cover - 네트워크 의존
+                _log(f"[job:{self.job_id}] 하트비트 실패: {exc}")
+                continue
+            if resp.status_code == 409:
+                self.lost = True
+                _log(f"[job:{self.job_id}] 리스를 잃었습니다. 결과는 버려질 수 있습니다.")
+                return
+
+
+def _process_job(job_id: str, job_data: Dict[str, Any]) -> Dict[str, Any]:
+    """작업 하나의 URL을 모두 처리해 완료 보고 본문을 만든다."""
 
     urls: List[str] = [url for url in job_data.get("urls", []) if isinstance(url, str) and url]
     cookie_text = job_data.get("cookie_text") or ""
-    http_headers: Dict[str, str] = {
-        "User-Agent": "Mozilla/5.0",
-        "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
-        "Accept-Language": "ko-KR,ko;q=0.9,en-US;q=0.8,en;q=0.7",
-        "Referer": "https://www.youtube.com/",
-    }
+    titles: Dict[str, str] = job_data.get("titles") if isinstance(job_data.get("titles"), dict) else {}
+    http_headers: Dict[str, str] = dict(DEFAULT_EXTRACT_HEADERS)
     if isinstance(job_data.get("http_headers"), dict):
         http_headers.update({k: str(v) for k, v in job_data["http_headers"].items()})
+    # SAPISIDHASH는 시각 기반이므로 요청마다 세션에서 새로 만든다.
+    http_headers.pop("Authorization", None)
 
-    tmp_file = None
     results: List[Dict[str, Any]] = []
+    profile_ids: List[str] = []
     status = "completed"
     error_message = None
 
     try:
-        if cookie_text:
-            cookie_text = _ensure_netscape_cookie_text(cookie_text)
-            cookies = _extract_cookie_map(cookie_text)
-            auth_header = _build_sapisidhash_header(cookies)
-            if auth_header:
-                http_headers["Authorization"] = auth_header
-                http_headers.setdefault("Origin", "https://www.youtube.com")
-                http_headers.setdefault("X-Origin", "https://www.youtube.com")
-                http_headers.setdefault("X-Youtube-Client-Name", "1")
-                http_headers.setdefault("X-Youtube-Client-Version", "2.20240501.01.00")
-            tmp_file = tempfile.NamedTemporaryFile(delete=False, mode="w", encoding="utf-8", suffix=".txt")
-            tmp_file.write(cookie_text)
-            tmp_file.flush()
-            tmp_file.close()
-            cookie_path = tmp_file.name
-        else:
-            cookie_path = ""
+        # 작업 쿠키와 실행기 환경변수에 설정된 계정을 한 풀로 묶어 URL마다 돌려 쓴다.
+        # 세션은 쿠키 텍스트별로 캐시되므로 상주 모드에서는 쿠키 파일과 계정 점수가 작업 사이에 유지된다.
+        pool = load_credential_pool([cookie_text] if cookie_text else [])
+        if len(pool):
+            _log(f"[job:{job_id}] 사용 가능한 계정 수: {len(pool)}")
+        profile_job = bool(job_data.get("profile"))
 
         for url in urls:
+            session = pool.acquire()
+            profile = None
             try:
-                text, title = _extract_text_and_title(
-                    url, cookie_path=cookie_path, http_headers=dict(http_headers)
-                )
+                with _profiling(
+                    "runner_item", enabled=profile_job or _should_profile(), meta={"job_id": job_id, "url": url}
+                ) as profile:
+                    text, title = _extract_text_and_title(
+                        url,
+                        cookie_path=session.cookie_path() if session else "",
+                        http_headers=session.http_headers(http_headers) if session else dict(http_headers),
+                        proxy_key=session.key if session else "",
+                        cookies=session.cookies if session else None,
+                        title_hint=titles.get(url, ""),
+                    )
+                if profile is not None:
+                    _log(f"[job:{job_id}] 프로파일 저장: {profile.profile_id}")
                 filename = sanitize_filename(title) + ".txt"
                 if text:
                     item = ExtractItem(url=url, title=title, filename=filename, text=text)
@@ -108,7 +200,28 @@ def main():
                         warning="자막 없음",
                     )
                 results.append(item.dict())
+                pool.release(session, True)
+            except ThrottledError as exc:  # pragma: no cover - 네트워크 의존
+                # 요청 제한에 걸린 항목은 실패로 끝내지 않고 재시도 대상으로 남긴다.
+                # 회로가 열려 있으면 남은 URL도 곧바로 여기로 떨어진다. 이때는 요청이 나가지 않았으므로
+                # 계정 쿨다운을 늘리지 않고, 업스트림이 실제로 제한을 돌려준 경우만 계정 탓으로 센다.
+                if isinstance(exc, LocalThrottleError):
+                    pool.release(session, None)
+                else:
+                    pool.release(session, False, throttled=True)
+                _log(f"[job:{job_id}] 요청 제한으로 보류: {url} ({exc})")
+                results.append(
+                    ExtractItem(
+                        url=url,
+                        title="(unknown)",
+                        filename="video.txt",
+                        text=None,
+                        warning=f"요청 제한으로 보류됨: {exc}",
+                        deferred=True,
+                    ).dict()
+                )
             except Exception as exc:  # pragma: no cover - 네트워크 의존
+                pool.release(session, False)
                 results.append(
                     ExtractItem(
                         url=url,
@@ -118,31 +231,161 @@ def main():
                         warning=str(exc),
                     ).dict()
                 )
+            finally:
+                if profile is not None:
+                    profile_ids.append(profile.profile_id)
     except Exception as exc:  # pragma: no cover
         status = "failed"
         error_message = str(exc)
         _log(f"[job:{job_id}] 작업 실행 중 오류: {exc}")
-    finally:
-        if tmp_file is not None:
-            try:
-                os.unlink(tmp_file.name)
-            except Exception:
-                pass
 
-    payload = {
+    return {
         "status": status,
         "results": results,
         "error": error_message,
+        "lease_id": job_data.get("lease_id"),
+        # 완료 보고 본문에는 넣지 않고, 보고 뒤 _upload_profiles로 따로 올린다.
+        "profile_ids": profile_ids,
     }
 
+
+def run_once():
+    """CAPTION_JOB_ID로 지정된 작업 하나를 처리한다 (GitHub Actions 실행 방식)."""
+
+    job_id = _get_env("CAPTION_JOB_ID")
+    base_url = _get_env("CAPTION_JOB_BASE_URL")
+    token = _get_env("CAPTION_JOB_TOKEN")
+
+    try:
+        job_data = _fetch_job(base_url, job_id, token)
+    except Exception as exc:  # pragma: no cover - 네트워크 의존
+        _log(f"[job:{job_id}] 작업 정보 조회 중 오류: {exc}")
+        raise
+    if job_data is None:
+        _log(f"[job:{job_id}] 가져갈 수 있는 상태가 아니어서 종료합니다.")
+        return
+
+    with _LeaseHeartbeat(base_url, job_id, token, job_data):
+        payload = _process_job(job_id, job_data)
+    profile_ids = payload.pop("profile_ids", [])
+
     try:
         _post_result(base_url, job_id, token, payload)
     except Exception as exc:  # pragma: no cover - 네트워크 의존
         _log(f"[job:{job_id}] 결과 전송 실패: {exc}")
         raise
+    finally:
+        _upload_profiles(base_url, job_id, token, profile_ids)
+
+    if payload["status"] != "completed":
+        raise RuntimeError(payload["error"] or "자막 추출 실패")
+
+
+def _warm_up():
+    """yt_dlp 유튜브 추출기 모듈을 미리 불러오고 계정 쿠키를 파싱해 둔다.
+
+    YoutubeDL 인스턴스는 전략마다 옵션이 달라 재사용하지 않으므로, 줄이는 것은 첫 작업의
+    모듈 로딩·쿠키 파싱 비용뿐이다.
+    """
+
+    try:
+        with yt_dlp.YoutubeDL({"quiet": True, "no_warnings": True}) as ydl:
+            ydl.get_info_extractor("Youtube")
+    except Exception as exc:  # pragma: no cover - 선택적 준비 단계
+        _log(f"[daemon] yt_dlp 준비 실패(무시): {exc}")
+    # 설정된 계정 쿠키를 한 번 파싱해 세션 캐시에 올려 둔다.
+    load_credential_pool()
+
+
+def _worker_loop(worker_id: int, base_url: str, token: str, wait: float, stop: threading.Event):
+    http = requests.Session()
+    worker_name = f"{socket.gethostname()}:{os.getpid()}:{worker_id}"
+    backoff = 1.0
+    while not stop.is_set():
+        try:
+            job_data = _claim_job(http, base_url, token, wait, worker_name)
+        except Exception as exc:  # pragma: no cover - 네트워크 의존
+            _log(f"[worker:{worker_id}] 작업 가져오기 오류: {exc} ({backoff:.0f}초 후 재시도)")
+            stop.wait(backoff)
+            backoff = min(backoff * 2, 60.0)
+            continue
+        backoff = 1.0
+        if job_data is None:
+            continue
+        job_id = str(job_data.get("job_id") or "")
+        _log(
+            f"[worker:{worker_id}] [job:{job_id}] 처리 시작 "
+            f"(URL {len(job_data.get('urls') or [])}개, 시도 {job_data.get('attempt') or 1}회차)"
+        )
+        started = time.monotonic()
+        with _LeaseHeartbeat(base_url, job_id, token, job_data):
+            payload = _process_job(job_id, job_data)
+        profile_ids = payload.pop("profile_ids", [])
+        try:
+            _post_result(base_url, job_id, token, payload, http=http)
+        except Exception as exc:  # pragma: no cover - 네트워크 의존
+            _log(f"[worker:{worker_id}] [job:{job_id}] 결과 전송 실패: {exc}")
+            continue
+        finally:
+            _upload_profiles(base_url, job_id, token, profile_ids, http=http)
+        _log(f"[worker:{worker_id}] [job:{job_id}] {payload['status']} ({time.monotonic() - started:.1f}초)")
+    http.close()
+
+
+def run_daemon(concurrency: int, wait: float):
+    """백엔드를 long-poll하며 대기 작업을 계속 처리한다.
+
+    SIGINT/SIGTERM을 받으면 새 작업을 가져오지 않고, 처리 중인 작업을 보고한 뒤 끝낸다.
+    """
+
+    base_url = _get_env("CAPTION_JOB_BASE_URL")
+    token = _get_env("CAPTION_JOB_TOKEN")
+    stop = threading.Event()
+
+    def request_stop(signum, _frame):
+        if not stop.is_set():
+            _log(f"[daemon] 종료 신호({signum}) 수신: 처리 중인 작업을 마친 뒤 종료합니다.")
+        stop.set()
+
+    signal.signal(signal.SIGINT, request_stop)
+    signal.signal(signal.SIGTERM, request_stop)
+
+    _warm_up()
+    _log(f"[daemon] 시작: 동시 작업 {concurrency}개, long-poll {wait:.0f}초")
+    threads = [
+        threading.Thread(
+            target=_worker_loop, args=(idx, base_url, token, wait, stop), name=f"caption-worker-{idx}", daemon=True
+        )
+        for idx in range(concurrency)
+    ]
+    for thread in threads:
+        thread.start()
+    while any(thread.is_alive() for thread in threads):
+        for thread in threads:
+            thread.join(timeout=0.5)
+    _log("[daemon] 종료")
+
 
-    if status != "completed":
-        raise RuntimeError(error_message or "자막 추출 실패")
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="자막 추출 작업 실행기")
+    parser.add_argument("--daemon", action="store_true", help="백엔드 대기열을 계속 처리하는 상주 모드")
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=int(os.environ.get("CAPTION_WORKER_CONCURRENCY", "") or 1),
+        help="상주 모드에서 동시에 처리할 작업 수",
+    )
+    parser.add_argument(
+        "--poll-wait",
+        type=float,
+        default=float(os.environ.get("CAPTION_WORKER_POLL_WAIT", "") or 25),
+        help="대기 작업이 없을 때 long-poll로 기다릴 시간(초)",
+    )
+    args = parser.parse_args(argv)
+    if args.daemon:
+        run_daemon(max(1, args.concurrency), max(0.0, min(args.poll_wait, 60.0)))
+    else:
+        run_once()
 
 
 if __name__ == "__main__":
@@ -1,17 +1,39 @@
 import os
 import re
 import json
+import base64
+import asyncio
+import binascii
 import time
 import uuid
+import random
+import bisect
+import atexit
+import shutil
 import hashlib
+import tempfile
+import threading
+import contextlib
+import collections
+import contextvars
+import cProfile
+import io
+import pstats
+import concurrent.futures
+import gzip
+import sqlite3
+import unicodedata
 import datetime as dt
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, Union
+from urllib.parse import parse_qsl, urlsplit
 
 import urllib.error
 import urllib.request
 
-from fastapi import Body, FastAPI, Header, HTTPException
+from fastapi import Body, FastAPI, Header, HTTPException, Query, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import FileResponse, PlainTextResponse, Response
+from starlette.concurrency import run_in_threadpool
 from pydantic import BaseModel, Field
 import yt_dlp
 from yt_dlp.utils import DownloadError
@@ -23,8 +45,30 @@ except Exception:  # pragma: no cover - google client가 설치되지 않은 로
     build = None
     HttpError = Exception
 
+try:
+    import orjson
+except Exception:  # pragma: no cover - 선택 의존성
+    orjson = None
+
+try:
+    import brotli
+except Exception:  # pragma: no cover - 선택 의존성
+    brotli = None
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows에는 없다
+    fcntl = None
+
 YOUTUBE_API_KEY = os.environ.get("YOUTUBE_API_KEY", "").strip()
+# 부하 테스트 등에서 가짜 업스트림을 가리킬 때만 설정한다.
+YOUTUBE_API_BASE_URL = os.environ.get("YOUTUBE_API_BASE_URL", "").strip()
+GITHUB_API_URL = (os.environ.get("GITHUB_API_URL", "").strip() or "https://api.github.com").rstrip("/")
 DEFAULT_COOKIE_TEXT = os.environ.get("YOUTUBE_COOKIE_TEXT", "").strip()
+# 여러 계정을 돌려 쓰기 위한 Netscape 쿠키 파일 경로 목록 (쉼표 구분)
+YOUTUBE_COOKIE_FILES = [
+    path.strip() for path in os.environ.get("YOUTUBE_COOKIE_FILES", "").split(",") if path.strip()
+]
 def _normalize_origin(origin: str) -> str:
     return origin.strip().rstrip("/")
 
@@ -58,6 +102,7 @@ else:
 DATA_DIR = "data"
 CHANNEL_STORE_PATH = os.path.join(DATA_DIR, "channels.json")
 JOB_STORE_DIR = os.path.join(DATA_DIR, "caption_jobs")
+TRANSCRIPT_INDEX_PATH = os.path.join(DATA_DIR, "transcripts.sqlite3")
 os.makedirs(DATA_DIR, exist_ok=True)
 os.makedirs(JOB_STORE_DIR, exist_ok=True)
 
@@ -68,6 +113,10 @@ CAPTION_WORKFLOW_TOKEN = os.environ.get("CAPTION_WORKFLOW_TOKEN", "").strip()
 CAPTION_WORKFLOW_BASE_URL = os.environ.get("CAPTION_JOB_BASE_URL", "").strip()
 CAPTION_WORKFLOW_RUNNER_LABELS = os.environ.get("CAPTION_WORKFLOW_RUNNER_LABELS", "").strip()
 CAPTION_INTERNAL_JOB_TOKEN = os.environ.get("CAPTION_JOB_TOKEN", "").strip()
+# workflow: 작업마다 GitHub Actions를 호출한다. pull: 상주 실행기가 /internal/caption_jobs/claim으로 가져간다.
+CAPTION_DISPATCH_MODE = os.environ.get("CAPTION_DISPATCH_MODE", "workflow").strip().lower() or "workflow"
+METRICS_TOKEN = os.environ.get("METRICS_TOKEN", "").strip()
+RESPONSE_COMPRESSION_MIN_BYTES = int(os.environ.get("RESPONSE_COMPRESSION_MIN_BYTES", "") or 1024)
 
 app = FastAPI(title="YouTube Search & Caption API", version="1.1.0")
 app.add_middleware(
@@ -79,6 +128,615 @@ app.add_middleware(
 )
 
 
+_LATENCY_BUCKETS: Tuple[float, ...] = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0,
+)
+
+_LabelKey = Tuple[Tuple[str, str], ...]
+
+
+def _label_key(labels: Optional[Dict[str, str]]) -> _LabelKey:
+    if not labels:
+        return ()
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _escape_label_value(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(key: _LabelKey, extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = list(key)
+    if extra:
+        pairs.append(extra)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape_label_value(v)}"' for k, v in pairs) + "}"
+
+
+class MetricsRegistry:
+    """Prometheus 텍스트 포맷으로 노출하는 프로세스 내 지표 저장소.
+
+    핫패스에서는 잠금 한 번과 딕셔너리 갱신만 수행하고, 누적 버킷 계산과
+    문자열 생성은 `/metrics` 수집 시점으로 미룬다.
+    """
+
+    def __init__(self, buckets: Tuple[float, ...] = _LATENCY_BUCKETS):
+        self._lock = threading.Lock()
+        self._buckets = buckets
+        self._help: Dict[str, Tuple[str, str]] = {}
+        self._counters: Dict[str, Dict[_LabelKey, float]] = {}
+        self._histograms: Dict[str, Dict[_LabelKey, List[float]]] = {}
+        self._gauges: Dict[str, Callable[[], List[Tuple[Dict[str, str], float]]]] = {}
+
+    def describe(self, name: str, kind: str, help_text: str):
+        self._help[name] = (kind, help_text)
+
+    def inc(self, name: str, labels: Optional[Dict[str, str]] = None, value: float = 1.0):
+        key = _label_key(labels)
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0.0) + value
+
+    def observe(self, name: str, seconds: float, labels: Optional[Dict[str, str]] = None):
+        key = _label_key(labels)
+        index = bisect.bisect_left(self._buckets, seconds)
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            state = series.get(key)
+            if state is None:
+                # [버킷별 개수..., +Inf 개수, 합계]
+                state = [0.0] * (len(self._buckets) + 2)
+                series[key] = state
+            state[index] += 1
+            state[-1] += seconds
+
+    def register_gauge(
+        self,
+        name: str,
+        help_text: str,
+        collect: Callable[[], List[Tuple[Dict[str, str], float]]],
+    ):
+        self.describe(name, "gauge", help_text)
+        self._gauges[name] = collect
+
+    def render(self) -> str:
+        with self._lock:
+            counters = {name: dict(series) for name, series in self._counters.items()}
+            histograms = {
+                name: {key: list(state) for key, state in series.items()}
+                for name, series in self._histograms.items()
+            }
+        lines: List[str] = []
+
+        def header(name: str, default_kind: str):
+            kind, help_text = self._help.get(name, (default_kind, ""))
+            if help_text:
+                lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+
+        for name in sorted(counters):
+            header(name, "counter")
+            for key, value in sorted(counters[name].items()):
+                lines.append(f"{name}{_format_labels(key)} {value:g}")
+        for name in sorted(histograms):
+            header(name, "histogram")
+            for key, state in sorted(histograms[name].items()):
+                cumulative = 0.0
+                for bound, count in zip(self._buckets, state):
+                    cumulative += count
+                    lines.append(f"{name}_bucket{_format_labels(key, ('le', f'{bound:g}'))} {cumulative:g}")
+                cumulative += state[len(self._buckets)]
+                lines.append(f"{name}_bucket{_format_labels(key, ('le', '+Inf'))} {cumulative:g}")
+                lines.append(f"{name}_sum{_format_labels(key)} {state[-1]:.6f}")
+                lines.append(f"{name}_count{_format_labels(key)} {cumulative:g}")
+        for name in sorted(self._gauges):
+            header(name, "gauge")
+            try:
+                samples = self._gauges[name]()
+            except Exception:
+                continue
+            for labels, value in samples:
+                lines.append(f"{name}{_format_labels(_label_key(labels))} {value:g}")
+        lines.append("")
+        return "\n".join(lines)
+
+
+METRICS = MetricsRegistry()
+METRICS.describe("upstream_requests_total", "counter", "외부 호출 횟수 (operation, outcome)")
+METRICS.describe("upstream_errors_total", "counter", "외부 호출 오류 횟수 (operation, type)")
+METRICS.describe("upstream_latency_seconds", "histogram", "외부 호출 소요 시간")
+METRICS.describe("http_requests_total", "counter", "API 요청 횟수 (route, method, status)")
+METRICS.describe("http_request_duration_seconds", "histogram", "API 요청 처리 시간")
+METRICS.describe("api_errors_total", "counter", "API 내부에서 삼킨 오류 횟수 (route, type)")
+
+
+def _error_type(exc: BaseException) -> str:
+    status = getattr(getattr(exc, "resp", None), "status", None)
+    if status is not None:
+        return f"{type(exc).__name__}:{status}"
+    return type(exc).__name__
+
+
+@contextlib.contextmanager
+def _timed(operation: str) -> Iterator[None]:
+    """외부 호출(YouTube API, yt_dlp, GitHub, 작업 저장소)의 지연과 오류를 기록한다."""
+
+    started = time.perf_counter()
+    try:
+        yield
+    except BaseException as exc:
+        METRICS.observe("upstream_latency_seconds", time.perf_counter() - started, {"operation": operation})
+        METRICS.inc("upstream_requests_total", {"operation": operation, "outcome": "error"})
+        METRICS.inc("upstream_errors_total", {"operation": operation, "type": _error_type(exc)})
+        session = _ACTIVE_PROFILE.get()
+        if session is not None:
+            session.add_span(operation, started, _error_type(exc))
+        raise
+    METRICS.observe("upstream_latency_seconds", time.perf_counter() - started, {"operation": operation})
+    METRICS.inc("upstream_requests_total", {"operation": operation, "outcome": "ok"})
+    session = _ACTIVE_PROFILE.get()
+    if session is not None:
+        session.add_span(operation, started, "ok")
+
+
+class ThrottledError(RuntimeError):
+    """요청 제한(429/403·봇 확인) 또는 회로 차단으로 호출을 미룬 경우."""
+
+
+class LocalThrottleError(ThrottledError):
+    """속도 제한기나 회로 차단기가 호출 전에 거절한 경우. 업스트림에는 요청이 나가지 않았다."""
+
+
+_THROTTLE_MESSAGES = (
+    "http error 429",
+    "too many requests",
+    "confirm you're not a bot",
+    "confirm you’re not a bot",
+    "rate-limited",
+    "ratelimitexceeded",
+    "userratelimitexceeded",
+    "quotaexceeded",
+)
+
+
+def _http_status(exc: BaseException) -> Optional[int]:
+    status = getattr(getattr(exc, "resp", None), "status", None)
+    if status is None:
+        status = getattr(exc, "status", None) or getattr(exc, "code", None)
+    try:
+        return int(status) if status is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+def _is_throttle_error(exc: BaseException) -> bool:
+    if isinstance(exc, ThrottledError):
+        return True
+    status = _http_status(exc)
+    message = str(exc).lower()
+    if status == 429:
+        return True
+    if status == 403 and any(reason in message for reason in ("quota", "ratelimit")):
+        return True
+    return any(pattern in message for pattern in _THROTTLE_MESSAGES)
+
+
+def _is_upstream_failure(exc: BaseException) -> bool:
+    """회로 차단기에 실패로 셀 오류인지 판단한다. 잘못된 요청(4xx)과 요청 전 거절은 제외한다."""
+
+    if isinstance(exc, LocalThrottleError):
+        return False
+    if _is_throttle_error(exc):
+        return True
+    status = _http_status(exc)
+    if status is not None:
+        return status >= 500
+    return isinstance(exc, (OSError, TimeoutError))
+
+
+class AdaptiveRateLimiter:
+    """토큰 버킷 속도 제한기.
+
+    요청 제한 응답을 받으면 속도를 절반으로 줄이고(최저 min_rate), 성공이 이어지면
+    초기 속도까지 조금씩 되돌린다.
+    """
+
+    def __init__(self, name: str, rate: float, burst: float, min_rate: float):
+        self.name = name
+        self.max_rate = max(rate, min_rate)
+        self.min_rate = min_rate
+        self.rate = self.max_rate
+        self.burst = max(burst, 1.0)
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float):
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self, timeout: float = 30.0) -> bool:
+        deadline = time.monotonic() + timeout
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return True
+                wait = (1 - self._tokens) / self.rate
+            if now + wait > deadline:
+                return False
+            time.sleep(wait)
+
+    def on_success(self):
+        with self._lock:
+            if self.rate < self.max_rate:
+                self.rate = min(self.max_rate, self.rate + self.max_rate * 0.05)
+
+    def on_throttle(self):
+        with self._lock:
+            self.rate = max(self.min_rate, self.rate / 2)
+            self._tokens = 0.0
+        METRICS.inc("throttle_events_total", {"scope": self.name})
+
+
+class CircuitBreaker:
+    """최근 호출의 실패 비율이 높아지면 열리고, 지터가 섞인 대기 후 시험 호출을 허용한다."""
+
+    def __init__(
+        self,
+        name: str,
+        *,
+        window: int = 20,
+        min_calls: int = 5,
+        failure_ratio: float = 0.5,
+        cooldown: float = 60.0,
+        max_cooldown: float = 900.0,
+        jitter: float = 0.3,
+    ):
+        self.name = name
+        self.min_calls = min_calls
+        self.failure_ratio = failure_ratio
+        self.cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        self.jitter = jitter
+        self._results: "collections.deque[bool]" = collections.deque(maxlen=window)
+        self._state = "closed"
+        self._open_until = 0.0
+        self._consecutive_opens = 0
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._state == "open" and time.monotonic() >= self._open_until:
+                return "half_open"
+            return self._state
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self._state == "closed":
+                return True
+            if self._state == "open":
+                if time.monotonic() < self._open_until:
+                    return False
+                self._state = "half_open"
+                self._probe_in_flight = False
+            if self._probe_in_flight:
+                return False
+            self._probe_in_flight = True
+            return True
+
+    def record(self, ok: bool):
+        with self._lock:
+            if self._state == "half_open":
+                self._probe_in_flight = False
+                if ok:
+                    self._state = "closed"
+                    self._consecutive_opens = 0
+                    self._results.clear()
+                else:
+                    self._open()
+                return
+            self._results.append(ok)
+            failures = self._results.count(False)
+            if len(self._results) >= self.min_calls and failures / len(self._results) >= self.failure_ratio:
+                self._open()
+
+    def _open(self):
+        self._consecutive_opens += 1
+        base = min(self.max_cooldown, self.cooldown * (2 ** (self._consecutive_opens - 1)))
+        self._open_until = time.monotonic() + base * (1 + random.uniform(0, self.jitter))
+        self._state = "open"
+        self._results.clear()
+        METRICS.inc("circuit_open_total", {"scope": self.name})
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.environ.get(name, "") or default)
+    except ValueError:
+        return default
+
+
+CAPTION_RATE_LIMITER = AdaptiveRateLimiter(
+    "caption", _env_float("CAPTION_RATE_PER_SEC", 1.0), burst=3, min_rate=0.05
+)
+DATA_API_RATE_LIMITER = AdaptiveRateLimiter(
+    "data_api", _env_float("YOUTUBE_API_RATE_PER_SEC", 10.0), burst=20, min_rate=0.5
+)
+CAPTION_RATE_WAIT_SEC = _env_float("CAPTION_RATE_WAIT_SEC", 120.0)
+CAPTION_CIRCUIT = CircuitBreaker("caption", cooldown=_env_float("CAPTION_CIRCUIT_COOLDOWN_SEC", 120.0))
+DATA_API_CIRCUIT = CircuitBreaker("data_api", cooldown=_env_float("YOUTUBE_API_CIRCUIT_COOLDOWN_SEC", 60.0))
+METRICS.describe("throttle_events_total", "counter", "요청 제한 응답으로 속도를 줄인 횟수")
+METRICS.describe("circuit_open_total", "counter", "회로 차단기가 열린 횟수")
+METRICS.register_gauge(
+    "circuit_open",
+    "회로 차단기 상태 (1=열림, 0.5=시험 중, 0=닫힘)",
+    lambda: [
+        ({"scope": breaker.name}, {"open": 1.0, "half_open": 0.5}.get(breaker.state, 0.0))
+        for breaker in (CAPTION_CIRCUIT, DATA_API_CIRCUIT)
+    ],
+)
+
+
+@contextlib.contextmanager
+def _guarded(limiter: AdaptiveRateLimiter, breaker: CircuitBreaker, timeout: float) -> Iterator[None]:
+    """속도 제한과 회로 차단을 통과한 뒤 호출하고, 결과를 둘 모두에 반영한다."""
+
+    if breaker.state == "open":
+        raise LocalThrottleError(f"{breaker.name} 회로 차단 중: 잠시 후 다시 시도하세요.")
+    if not limiter.acquire(timeout):
+        raise LocalThrottleError(f"{limiter.name} 요청 속도 제한 대기 시간 초과")
+    if not breaker.allow():
+        raise LocalThrottleError(f"{breaker.name} 회로 차단 중: 잠시 후 다시 시도하세요.")
+    try:
+        yield
+    except BaseException as exc:
+        if _is_throttle_error(exc):
+            limiter.on_throttle()
+        breaker.record(not _is_upstream_failure(exc))
+        if _is_throttle_error(exc) and not isinstance(exc, ThrottledError):
+            raise ThrottledError(str(exc)) from exc
+        raise
+    limiter.on_success()
+    breaker.record(True)
+
+
+# 요청 단위 프로파일링. 꺼져 있으면 _timed에서 ContextVar 하나를 읽는 것 말고는 비용이 없다.
+PROFILE_DIR = os.path.join(DATA_DIR, "profiles")
+PROFILE_TOKEN = os.environ.get("PROFILE_TOKEN", "").strip()
+PROFILE_SAMPLE_RATE = _env_float("PROFILE_SAMPLE_RATE", 0.0)
+PROFILE_MAX_ARTIFACTS = int(_env_float("PROFILE_MAX_ARTIFACTS", 200))
+_PROFILE_ID_RE = re.compile(r"^[0-9]{14}-[a-z_]+-[0-9a-f]{8}$")
+
+
+class ProfileSession:
+    """cProfile 결과와 외부 호출 구간(_timed) 시간을 모아 data/profiles에 남긴다."""
+
+    def __init__(self, name: str, meta: Optional[Dict[str, Any]] = None):
+        now_utc = dt.datetime.now(dt.timezone.utc)
+        self.profile_id = f"{now_utc.strftime('%Y%m%d%H%M%S')}-{name}-{uuid.uuid4().hex[:8]}"
+        self.name = name
+        self.meta = dict(meta or {})
+        self.started_at = now_utc.isoformat()
+        self.spans: List[Dict[str, Any]] = []
+        self._started = time.perf_counter()
+        self._lock = threading.Lock()
+        self._profiler: Optional[cProfile.Profile] = cProfile.Profile()
+
+    def start(self):
+        try:
+            self._profiler.enable()
+        except ValueError:
+            # 다른 프로파일러가 이미 켜져 있으면 구간 시간만 기록한다.
+            self._profiler = None
+
+    def add_span(self, name: str, started: float, outcome: str):
+        ended = time.perf_counter()
+        with self._lock:
+            self.spans.append(
+                {
+                    "name": name,
+                    "start_ms": round((started - self._started) * 1000, 3),
+                    "duration_ms": round((ended - started) * 1000, 3),
+                    "outcome": outcome,
+                }
+            )
+
+    def stop(self, error: Optional[BaseException] = None) -> str:
+        duration_ms = round((time.perf_counter() - self._started) * 1000, 3)
+        os.makedirs(PROFILE_DIR, exist_ok=True)
+        summary = ""
+        if self._profiler is not None:
+            self._profiler.disable()
+            self._profiler.dump_stats(os.path.join(PROFILE_DIR, f"{self.profile_id}.prof"))
+            buffer = io.StringIO()
+            pstats.Stats(self._profiler, stream=buffer).sort_stats("cumulative").print_stats(30)
+            summary = buffer.getvalue()
+        record = {
+            "profile_id": self.profile_id,
+            "name": self.name,
+            "started_at": self.started_at,
+            "duration_ms": duration_ms,
+            "cpu_profile": self._profiler is not None,
+            "error": _error_type(error) if error is not None else None,
+            "meta": self.meta,
+            "spans": sorted(self.spans, key=lambda span: span["start_ms"]),
+            "summary": summary,
+        }
+        _save_profile_record(record)
+        return self.profile_id
+
+
+def _save_profile_record(record: Dict[str, Any], prof_bytes: Optional[bytes] = None):
+    """프로파일 요약(.json)과, 받은 경우 cProfile 원본(.prof)을 PROFILE_DIR에 남긴다."""
+
+    profile_id = record["profile_id"]
+    os.makedirs(PROFILE_DIR, exist_ok=True)
+    if prof_bytes:
+        tmp_path = os.path.join(PROFILE_DIR, f"{profile_id}.prof.tmp")
+        with open(tmp_path, "wb") as file:
+            file.write(prof_bytes)
+        os.replace(tmp_path, os.path.join(PROFILE_DIR, f"{profile_id}.prof"))
+    tmp_path = os.path.join(PROFILE_DIR, f"{profile_id}.json.tmp")
+    with open(tmp_path, "w", encoding="utf-8") as file:
+        json.dump(record, file, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, os.path.join(PROFILE_DIR, f"{profile_id}.json"))
+    _prune_profiles()
+    METRICS.inc("profiles_recorded_total", {"name": record.get("name") or "unknown"})
+
+
+_ACTIVE_PROFILE: "contextvars.ContextVar[Optional[ProfileSession]]" = contextvars.ContextVar(
+    "active_profile", default=None
+)
+
+
+def _should_profile(profile_token: str = "") -> bool:
+    if PROFILE_TOKEN and profile_token and profile_token == PROFILE_TOKEN:
+        return True
+    return PROFILE_SAMPLE_RATE > 0 and random.random() < PROFILE_SAMPLE_RATE
+
+
+@contextlib.contextmanager
+def _profiling(name: str, *, enabled: bool, meta: Optional[Dict[str, Any]] = None) -> Iterator[Optional[ProfileSession]]:
+    """enabled일 때만 현재 스레드를 프로파일링한다. 예외가 나도 결과는 저장한다."""
+
+    if not enabled or _ACTIVE_PROFILE.get() is not None:
+        yield None
+        return
+    session = ProfileSession(name, meta)
+    token = _ACTIVE_PROFILE.set(session)
+    session.start()
+    error: Optional[BaseException] = None
+    try:
+        yield session
+    except BaseException as exc:
+        error = exc
+        raise
+    finally:
+        _ACTIVE_PROFILE.reset(token)
+        try:
+            session.stop(error)
+        except OSError as exc:  # pragma: no cover - 저장 실패가 요청을 막지 않게 한다
+            METRICS.inc("api_errors_total", {"route": "profiling", "type": _error_type(exc)})
+
+
+def _prune_profiles():
+    try:
+        names = sorted(name for name in os.listdir(PROFILE_DIR) if name.endswith(".json"))
+    except OSError:
+        return
+    for name in names[: max(0, len(names) - PROFILE_MAX_ARTIFACTS)]:
+        for ext in (".json", ".prof"):
+            with contextlib.suppress(OSError):
+                os.remove(os.path.join(PROFILE_DIR, name[: -len(".json")] + ext))
+
+
+METRICS.describe("profiles_recorded_total", "counter", "저장한 프로파일 수 (name)")
+
+
+class SingleFlight:
+    """같은 키로 동시에 들어온 호출을 하나로 합친다.
+
+    먼저 온 호출만 fn을 실행하고, 나머지는 timeout까지 기다렸다가 같은 결과(또는 예외)를 받는다.
+    결과는 보관하지 않으므로 호출이 끝난 뒤 들어온 요청은 다시 실행된다.
+    """
+
+    def __init__(self, name: str, timeout: float = 30.0):
+        self.name = name
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._calls: Dict[str, concurrent.futures.Future] = {}
+
+    def do(self, key: str, fn: Callable[[], Any], timeout: Optional[float] = None) -> Any:
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = concurrent.futures.Future()
+                self._calls[key] = future
+        if not leader:
+            METRICS.inc("singleflight_shared_total", {"group": self.name})
+            try:
+                return future.result(self.timeout if timeout is None else timeout)
+            except concurrent.futures.TimeoutError:
+                raise TimeoutError(f"{self.name}: 진행 중인 동일 요청 대기 시간 초과") from None
+        try:
+            result = fn()
+        except BaseException as exc:
+            future.set_exception(exc)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+
+
+SINGLEFLIGHT_TIMEOUT_SEC = _env_float("SINGLEFLIGHT_TIMEOUT_SEC", 30.0)
+YOUTUBE_FLIGHT = SingleFlight("youtube_api", timeout=SINGLEFLIGHT_TIMEOUT_SEC)
+METRICS.describe("singleflight_shared_total", "counter", "진행 중인 동일 요청의 결과를 공유한 횟수 (group)")
+
+
+def _request_flight_key(request) -> str:
+    """googleapiclient 요청을 메서드·경로·정렬된 쿼리로 정규화한 키."""
+
+    parts = urlsplit(getattr(request, "uri", "") or "")
+    query = sorted(parse_qsl(parts.query, keep_blank_values=True))
+    return json.dumps([getattr(request, "method", "GET"), parts.path, query, getattr(request, "body", None)])
+
+
+def _execute_youtube(request, operation: str) -> Dict[str, Any]:
+    def call() -> Dict[str, Any]:
+        with _guarded(DATA_API_RATE_LIMITER, DATA_API_CIRCUIT, timeout=10.0), _timed(operation):
+            return request.execute()
+
+    if not getattr(request, "uri", None):
+        return call()
+    return YOUTUBE_FLIGHT.do(_request_flight_key(request), call)
+
+
+class RequestMetricsMiddleware:
+    """라우트 템플릿 단위로 요청 수와 처리 시간을 기록하는 ASGI 미들웨어."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        started = time.perf_counter()
+        status_code = 500
+
+        async def send_with_status(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            # 작업 ID 등이 라벨로 새어 나가지 않도록 실제 경로 대신 라우트 템플릿을 쓴다.
+            route = getattr(scope.get("route"), "path", None) or "unmatched"
+            method = scope.get("method", "")
+            METRICS.observe(
+                "http_request_duration_seconds",
+                time.perf_counter() - started,
+                {"route": route, "method": method},
+            )
+            METRICS.inc("http_requests_total", {"route": route, "method": method, "status": str(status_code)})
+
+
+app.add_middleware(RequestMetricsMiddleware)
+
+
 class QuietLogger:
     def debug(self, msg):  # pragma: no cover - yt_dlp 내부용
         pass
@@ -93,10 +751,188 @@ class QuietLogger:
         print(msg)
 
 
+class ProxyPool:
+    """지연 시간과 오류율로 점수를 매겨 yt_dlp 송출 프록시를 고르는 풀.
+
+    오류가 이어진 프록시는 잠시 격리했다가, 다시 내보내기 전에 probe_url로
+    한 번 확인한다. assignment="session"이면 같은 키(계정)는 같은 프록시를 쓴다.
+    """
+
+    def __init__(
+        self,
+        proxies: List[str],
+        *,
+        probe_url: str = "https://www.youtube.com/generate_204",
+        quarantine_sec: float = 120.0,
+        assignment: str = "request",
+    ):
+        self.probe_url = probe_url
+        self.quarantine_sec = quarantine_sec
+        self.assignment = assignment
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        for proxy in proxies:
+            self._entries.setdefault(
+                proxy,
+                {
+                    "latency": 1.0,
+                    "error_rate": 0.0,
+                    "samples": 0,
+                    "consecutive_failures": 0,
+                    "quarantined_until": 0.0,
+                    "quarantine_count": 0,
+                    "probing": False,
+                    "in_flight": 0,
+                },
+            )
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def _score(entry: Dict[str, Any]) -> float:
+        return (1.0 - entry["error_rate"]) / (1.0 + entry["latency"]) / (1 + entry["in_flight"])
+
+    def acquire(self, sticky_key: str = "") -> Optional[str]:
+        if not self._entries:
+            return None
+        self._probe_expired()
+        with self._lock:
+            now = time.monotonic()
+            healthy = [proxy for proxy, entry in self._entries.items() if entry["quarantined_until"] <= now]
+            if not healthy:
+                # 전부 격리 중이면 가장 먼저 풀리는 프록시라도 쓴다.
+                healthy = [min(self._entries, key=lambda proxy: self._entries[proxy]["quarantined_until"])]
+            if sticky_key and self.assignment == "session":
+                # 랜데뷰 해싱: 프록시가 빠지거나 돌아와도 나머지 키의 배정은 유지된다.
+                chosen = max(
+                    healthy, key=lambda proxy: hashlib.sha1(f"{sticky_key}|{proxy}".encode("utf-8")).digest()
+                )
+            else:
+                chosen = max(healthy, key=lambda proxy: self._score(self._entries[proxy]))
+            self._entries[chosen]["in_flight"] += 1
+            return chosen
+
+    def release(self, proxy: Optional[str], ok: Optional[bool], latency: float = 0.0):
+        """ok=None이면 이 프록시로 요청이 나가지 않은 것이므로 점수에 반영하지 않는다."""
+
+        if not proxy or proxy not in self._entries:
+            return
+        with self._lock:
+            entry = self._entries[proxy]
+            entry["in_flight"] = max(0, entry["in_flight"] - 1)
+            if ok is None:
+                return
+            entry["samples"] += 1
+            entry["latency"] = entry["latency"] * 0.8 + latency * 0.2
+            entry["error_rate"] = entry["error_rate"] * 0.8 + (0.0 if ok else 0.2)
+            if ok:
+                entry["consecutive_failures"] = 0
+                return
+            entry["consecutive_failures"] += 1
+            if entry["consecutive_failures"] >= 3 or (entry["samples"] >= 5 and entry["error_rate"] > 0.5):
+                self._quarantine(proxy, entry)
+
+    def _quarantine(self, proxy: str, entry: Dict[str, Any]):
+        entry["quarantine_count"] += 1
+        backoff = min(3600.0, self.quarantine_sec * (2 ** (entry["quarantine_count"] - 1)))
+        entry["quarantined_until"] = time.monotonic() + backoff
+        entry["consecutive_failures"] = 0
+        METRICS.inc("proxy_quarantined_total", {"proxy": _proxy_label(proxy)})
+
+    def _probe_expired(self):
+        with self._lock:
+            now = time.monotonic()
+            due = [
+                proxy
+                for proxy, entry in self._entries.items()
+                if 0 < entry["quarantined_until"] <= now and not entry["probing"]
+            ]
+            for proxy in due:
+                self._entries[proxy]["probing"] = True
+        for proxy in due:
+            ok = self._probe(proxy)
+            with self._lock:
+                entry = self._entries[proxy]
+                entry["probing"] = False
+                if ok:
+                    entry["quarantined_until"] = 0.0
+                    entry["quarantine_count"] = 0
+                    entry["error_rate"] = 0.0
+                    entry["samples"] = 0
+                else:
+                    self._quarantine(proxy, entry)
+
+    def _probe(self, proxy: str) -> bool:
+        opener = urllib.request.build_opener(urllib.request.ProxyHandler({"http": proxy, "https": proxy}))
+        try:
+            with _timed("proxy_probe"), opener.open(self.probe_url, timeout=10) as response:
+                return response.status < 500
+        except Exception:
+            return False
+
+    def snapshot(self) -> List[Dict[str, Any]]:
+        now = time.monotonic()
+        with self._lock:
+            return [
+                {
+                    "proxy": _proxy_label(proxy),
+                    "score": round(self._score(entry), 4),
+                    "latency": round(entry["latency"], 3),
+                    "error_rate": round(entry["error_rate"], 3),
+                    "quarantined": entry["quarantined_until"] > now,
+                    "in_flight": entry["in_flight"],
+                }
+                for proxy, entry in self._entries.items()
+            ]
+
+
+def _proxy_label(proxy: str) -> str:
+    """지표·로그에 자격 증명이 새지 않도록 user:pass@ 부분을 지운다."""
+
+    return re.sub(r"//[^/@]+@", "//", proxy)
+
+
+def load_proxy_pool() -> ProxyPool:
+    """YOUTUBE_PROXY_LIST / YOUTUBE_PROXY_FILE, 없으면 HTTPS_PROXY / HTTP_PROXY로 풀을 만든다."""
+
+    proxies = [
+        item.strip() for item in re.split(r"[,\n]", os.environ.get("YOUTUBE_PROXY_LIST", "")) if item.strip()
+    ]
+    proxy_file = os.environ.get("YOUTUBE_PROXY_FILE", "").strip()
+    if proxy_file:
+        try:
+            with open(proxy_file, "r", encoding="utf-8") as file:
+                proxies.extend(line.strip() for line in file if line.strip() and not line.startswith("#"))
+        except OSError:
+            pass
+    if not proxies:
+        fallback = os.environ.get("HTTPS_PROXY") or os.environ.get("HTTP_PROXY") or ""
+        if fallback:
+            proxies.append(fallback)
+    return ProxyPool(
+        proxies,
+        probe_url=os.environ.get("YOUTUBE_PROXY_PROBE_URL", "").strip() or "https://www.youtube.com/generate_204",
+        quarantine_sec=float(os.environ.get("YOUTUBE_PROXY_QUARANTINE_SEC", "") or 120.0),
+        assignment=os.environ.get("YOUTUBE_PROXY_ASSIGNMENT", "").strip() or "request",
+    )
+
+
+PROXY_POOL = load_proxy_pool()
+METRICS.describe("proxy_quarantined_total", "counter", "격리된 프록시 횟수")
+METRICS.register_gauge(
+    "proxy_pool_healthy",
+    "격리되지 않은 프록시 수",
+    lambda: [({}, float(sum(1 for entry in PROXY_POOL.snapshot() if not entry["quarantined"])))],
+)
+
+
 def _build_ydl_opts(
     base_opts: Optional[dict] = None,
     *,
     disable_adaptive_formats: bool = True,
+    proxy: Optional[str] = None,
+    player_clients: Tuple[str, ...] = ("android", "ios"),
 ) -> dict:
     ydl_opts = {
         "skip_download": True,
@@ -109,15 +945,14 @@ def _build_ydl_opts(
         "simulate": True,
         "http_headers": {"User-Agent": "Mozilla/5.0"},
     }
-    extractor_args: Dict[str, Any] = {"youtube": {"player_client": ["android", "ios"]}}
+    extractor_args: Dict[str, Any] = {"youtube": {"player_client": list(player_clients)}}
     if disable_adaptive_formats:
         extractor_args["youtube"]["skip"] = ["dash", "hls"]
     ydl_opts["extractor_args"] = extractor_args
     if base_opts:
         ydl_opts.update(base_opts)
-    proxy_url = os.environ.get("HTTPS_PROXY") or os.environ.get("HTTP_PROXY") or ""
-    if proxy_url:
-        ydl_opts["proxy"] = proxy_url
+    if proxy:
+        ydl_opts["proxy"] = proxy
     return ydl_opts
 
 
@@ -164,10 +999,11 @@ def _load_job(job_id: str) -> Optional[Dict[str, Any]]:
     if not os.path.exists(path):
         return None
     try:
-        with open(path, "r", encoding="utf-8") as file:
-            data = json.load(file)
-            if isinstance(data, dict):
-                return data
+        with _timed("job_store_read"):
+            with open(path, "r", encoding="utf-8") as file:
+                data = json.load(file)
+        if isinstance(data, dict):
+            return data
     except Exception:
         pass
     return None
@@ -178,9 +1014,479 @@ def _save_job(job: Dict[str, Any]):
     if not path:
         raise RuntimeError("잘못된 작업 ID")
     tmp_path = f"{path}.tmp"
-    with open(tmp_path, "w", encoding="utf-8") as file:
-        json.dump(job, file, ensure_ascii=False, indent=2)
-    os.replace(tmp_path, path)
+    with _timed("job_store_write"):
+        with open(tmp_path, "w", encoding="utf-8") as file:
+            json.dump(job, file, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, path)
+    _record_job_status(job)
+
+
+# 작업 대기열 설정. 실행기는 리스를 받아 작업을 가져가고, 하트비트로 리스를 연장한다.
+# 리스가 만료되면 작업을 다시 대기열에 넣고, 최대 시도 횟수를 넘기면 dead_letter로 옮긴다.
+JOB_PRIORITIES = ("interactive", "bulk")
+CAPTION_JOB_VISIBILITY_SEC = _env_float("CAPTION_JOB_VISIBILITY_SEC", 300.0)
+CAPTION_JOB_MAX_ATTEMPTS = max(1, int(_env_float("CAPTION_JOB_MAX_ATTEMPTS", 3)))
+CAPTION_JOB_RETRY_DELAY_SEC = _env_float("CAPTION_JOB_RETRY_DELAY_SEC", 30.0)
+CAPTION_BULK_URL_THRESHOLD = int(_env_float("CAPTION_BULK_URL_THRESHOLD", 20))
+# 대화형 작업을 먼저 내주되, 이 횟수마다 한 번은 bulk 작업을 먼저 내줘 굶지 않게 한다.
+CAPTION_BULK_SHARE_EVERY = max(1, int(_env_float("CAPTION_BULK_SHARE_EVERY", 4)))
+
+_JOB_STATUS_LOCK = threading.Lock()
+_JOB_STATUS_INDEX: Optional[Dict[str, Dict[str, Any]]] = None
+# 대기 중인 작업이 생기면 long-poll 중인 claim 요청(이벤트 루프, asyncio.Event)을 깨운다.
+_JOB_QUEUE_WAITERS: "set[Tuple[asyncio.AbstractEventLoop, asyncio.Event]]" = set()
+_JOB_QUEUE_WAITERS_LOCK = threading.Lock()
+
+
+class _JobStoreLock:
+    """스레드 사이는 RLock으로, uvicorn 워커 프로세스 사이는 잠금 파일의 flock으로 직렬화한다.
+
+    같은 스레드가 다시 들어와도 되며, 가장 바깥에서 빠져나갈 때만 파일 잠금을 푼다.
+    fork로 넘어간 파일 객체를 공유하지 않도록 잠글 때마다 파일을 새로 연다.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.RLock()
+        self._depth = 0
+        self._file = None
+
+    def __enter__(self) -> "_JobStoreLock":
+        self._lock.acquire()
+        if self._depth == 0 and fcntl is not None:
+            try:
+                self._file = open(self.path, "a+")
+                fcntl.flock(self._file.fileno(), fcntl.LOCK_EX)
+            except OSError:  # pragma: no cover - 잠금 파일을 못 쓰면 프로세스 안에서만 직렬화한다
+                if self._file is not None:
+                    self._file.close()
+                self._file = None
+        self._depth += 1
+        return self
+
+    def __exit__(self, *exc_info):
+        self._depth -= 1
+        if self._depth == 0 and self._file is not None:
+            try:
+                fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+            finally:
+                self._file.close()
+                self._file = None
+        self._lock.release()
+
+
+# 작업 파일을 읽고-고치고-쓰는 대기열 조작(가져가기, 하트비트, 완료, 회수)을 프로세스 간에도 직렬화한다.
+_JOB_CLAIM_LOCK = _JobStoreLock(os.path.join(JOB_STORE_DIR, ".queue.lock"))
+_JOB_CLAIM_COUNT = 0
+_LAST_LEASE_RECLAIM = 0.0
+
+
+def _job_index_entry(job: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "status": job.get("status") or "unknown",
+        "priority": job.get("priority") or "interactive",
+        "available_at": float(job.get("available_at") or 0.0),
+        "lease_expires_at": float(job.get("lease_expires_at") or 0.0),
+        "dispatch_pending": bool(job.get("dispatch_pending")),
+    }
+
+
+def _scan_job_statuses() -> Dict[str, Dict[str, Any]]:
+    statuses: Dict[str, Dict[str, Any]] = {}
+    try:
+        names = os.listdir(JOB_STORE_DIR)
+    except OSError:
+        return statuses
+    for name in names:
+        if not name.endswith(".json"):
+            continue
+        job = _load_job(name[: -len(".json")])
+        if job:
+            statuses[name[: -len(".json")]] = _job_index_entry(job)
+    return statuses
+
+
+def _record_job_status(job: Dict[str, Any]):
+    entry = _job_index_entry(job)
+    with _JOB_STATUS_LOCK:
+        if _JOB_STATUS_INDEX is not None:
+            _JOB_STATUS_INDEX[job.get("job_id", "")] = entry
+    if entry["status"] == "queued":
+        _notify_queue_waiters()
+
+
+def _notify_queue_waiters():
+    with _JOB_QUEUE_WAITERS_LOCK:
+        waiters = list(_JOB_QUEUE_WAITERS)
+    for loop, event in waiters:
+        try:
+            loop.call_soon_threadsafe(event.set)
+        except RuntimeError:  # pragma: no cover - 이미 닫힌 이벤트 루프
+            pass
+
+
+def _forget_job_status(job_id: str):
+    with _JOB_STATUS_LOCK:
+        if _JOB_STATUS_INDEX is not None:
+            _JOB_STATUS_INDEX.pop(job_id, None)
+
+
+def _job_status_snapshot() -> Dict[str, Dict[str, Any]]:
+    global _JOB_STATUS_INDEX
+    if _JOB_STATUS_INDEX is None:
+        # 처음 한 번만 저장소를 훑고, 이후에는 _save_job이 상태를 갱신한다.
+        scanned = _scan_job_statuses()
+        with _JOB_STATUS_LOCK:
+            if _JOB_STATUS_INDEX is None:
+                _JOB_STATUS_INDEX = scanned
+    with _JOB_STATUS_LOCK:
+        return dict(_JOB_STATUS_INDEX)
+
+
+def _refresh_job_status_index():
+    """다른 워커 프로세스가 바꾼 작업 상태를 색인에 반영한다.
+
+    처음 보는 작업 파일과, 끝나지 않은(queued·running) 작업만 다시 읽는다.
+    끝난 작업은 상태가 더 바뀌지 않으므로 건너뛴다.
+    """
+
+    known = _job_status_snapshot()
+    try:
+        names = os.listdir(JOB_STORE_DIR)
+    except OSError:
+        return
+    present = set()
+    for name in names:
+        job_id = name[: -len(".json")] if name.endswith(".json") else ""
+        if not job_id:
+            continue
+        present.add(job_id)
+        entry = known.get(job_id)
+        if entry is None or entry["status"] in ("queued", "running"):
+            job = _load_job(job_id)
+            if job:
+                _record_job_status(job)
+    for job_id in set(known) - present:
+        _forget_job_status(job_id)
+
+
+def _start_lease(job: Dict[str, Any], worker: str = ""):
+    now = time.time()
+    enqueued_at = float(job.get("available_at") or 0.0)
+    if enqueued_at:
+        METRICS.observe(
+            "caption_job_queue_wait_seconds", max(0.0, now - enqueued_at), {"priority": job.get("priority") or "interactive"}
+        )
+    job["status"] = "running"
+    job["attempts"] = int(job.get("attempts") or 0) + 1
+    job["lease_id"] = uuid.uuid4().hex
+    job["lease_expires_at"] = now + CAPTION_JOB_VISIBILITY_SEC
+    job["worker"] = worker
+    job["updated_at"] = dt.datetime.now(dt.timezone.utc).isoformat()
+    _save_job(job)
+
+
+def _retry_or_dead_letter(job: Dict[str, Any], error: str) -> bool:
+    """실패한 작업을 지수 백오프로 다시 대기열에 넣는다. 시도 횟수를 다 쓰면 dead_letter로 옮기고 False."""
+
+    attempts = int(job.get("attempts") or 0)
+    job["lease_id"] = None
+    job["lease_expires_at"] = None
+    job["updated_at"] = dt.datetime.now(dt.timezone.utc).isoformat()
+    if attempts >= int(job.get("max_attempts") or CAPTION_JOB_MAX_ATTEMPTS):
+        job["status"] = "dead_letter"
+        job["error"] = f"{error} ({attempts}회 시도 후 중단)"
+        job["results"] = _merge_preflight_results(job, [])
+        job["cookie_text"] = ""
+        _save_job(job)
+        METRICS.inc("caption_job_dead_letter_total", {"priority": job.get("priority") or "interactive"})
+        return False
+    job["status"] = "queued"
+    job["error"] = error
+    job["available_at"] = time.time() + CAPTION_JOB_RETRY_DELAY_SEC * (2 ** max(0, attempts - 1))
+    # workflow 모드는 백오프가 끝난 뒤 _dispatch_due_retries가 다시 호출한다.
+    job["dispatch_pending"] = CAPTION_DISPATCH_MODE != "pull"
+    _save_job(job)
+    METRICS.inc("caption_job_retries_total", {"priority": job.get("priority") or "interactive"})
+    return True
+
+
+def _reclaim_expired_leases(min_interval: float = 1.0) -> List[str]:
+    """리스가 만료된 running 작업을 회수한다. 다시 대기열에 넣은 작업 ID를 돌려준다."""
+
+    global _LAST_LEASE_RECLAIM
+    now = time.time()
+    with _JOB_CLAIM_LOCK:
+        if now - _LAST_LEASE_RECLAIM < min_interval:
+            return []
+        _LAST_LEASE_RECLAIM = now
+    expired = [
+        job_id
+        for job_id, entry in _job_status_snapshot().items()
+        if entry["status"] == "running" and entry["lease_expires_at"] and entry["lease_expires_at"] < now
+    ]
+    requeued: List[str] = []
+    for job_id in expired:
+        with _JOB_CLAIM_LOCK:
+            job = _load_job(job_id)
+            if not job:
+                _forget_job_status(job_id)
+                continue
+            if job.get("status") != "running" or float(job.get("lease_expires_at") or 0.0) >= now:
+                # 다른 프로세스가 리스를 연장했거나 이미 끝낸 작업
+                _record_job_status(job)
+                continue
+            METRICS.inc("caption_job_lease_expired_total")
+            if _retry_or_dead_letter(job, "실행기 응답 없음 (리스 만료)"):
+                requeued.append(job_id)
+    return requeued
+
+
+def _collect_job_gauges() -> List[Tuple[Dict[str, str], float]]:
+    values = [entry["status"] for entry in _job_status_snapshot().values()]
+    return [({"status": status}, float(values.count(status))) for status in ("queued", "running", "dead_letter")]
+
+
+def _collect_queue_depth() -> List[Tuple[Dict[str, str], float]]:
+    queued = [entry["priority"] for entry in _job_status_snapshot().values() if entry["status"] == "queued"]
+    return [({"priority": priority}, float(queued.count(priority))) for priority in JOB_PRIORITIES]
+
+
+METRICS.register_gauge("caption_jobs", "상태별 자막 작업 수", _collect_job_gauges)
+METRICS.register_gauge("caption_job_queue_depth", "우선순위별 대기 작업 수", _collect_queue_depth)
+METRICS.describe("caption_job_queue_wait_seconds", "histogram", "작업이 대기열에서 기다린 시간 (priority)")
+METRICS.describe("caption_job_lease_expired_total", "counter", "리스 만료로 회수한 작업 수")
+METRICS.describe("caption_job_retries_total", "counter", "다시 대기열에 넣은 작업 수 (priority)")
+METRICS.describe("caption_job_dead_letter_total", "counter", "시도 횟수를 다 써서 dead_letter로 옮긴 작업 수 (priority)")
+
+
+_VIDEO_ID_RE = re.compile(r"^[0-9A-Za-z_-]{11}$")
+_VIDEO_URL_ID_RE = re.compile(r"(?:v=|/shorts/|/embed/|/live/|youtu\.be/)([0-9A-Za-z_-]{11})")
+
+
+def _parse_video_id(url: str) -> str:
+    value = (url or "").strip()
+    if _VIDEO_ID_RE.match(value):
+        return value
+    match = _VIDEO_URL_ID_RE.search(value)
+    return match.group(1) if match else ""
+
+
+_CJK_RE = re.compile(r"[\u1100-\u11ff\u3040-\u30ff\u3130-\u318f\u3400-\u9fff\uac00-\ud7af]")
+_WORD_RE = re.compile(r"\w+")
+
+
+def _ngram_tokens(text: str) -> List[str]:
+    """한글·한자·가나는 2-gram으로, 그 밖의 단어는 통째로 토큰화한다.
+
+    "청년정책"처럼 띄어쓰기 없이 붙은 말도 "정책"으로 찾을 수 있게 하려는 것이다.
+    """
+
+    tokens: List[str] = []
+    for word in _WORD_RE.findall(unicodedata.normalize("NFKC", text).lower()):
+        if not _CJK_RE.search(word):
+            tokens.append(word)
+            continue
+        if len(word) == 1:
+            tokens.append(word)
+            continue
+        tokens.extend(word[idx : idx + 2] for idx in range(len(word) - 1))
+    return tokens
+
+
+def _search_normalize(text: str) -> str:
+    # FTS 토큰과 같은 기준(NFKC + 소문자)으로 원문을 맞춘다. 전각·호환 문자도 같은 글자로 찾는다.
+    return unicodedata.normalize("NFKC", text or "").lower()
+
+
+def _normalized_with_offsets(text: str) -> Tuple[str, List[int], List[int]]:
+    """_search_normalize 결과와, 정규화된 글자마다 대응하는 원문 구간의 시작·끝 위치를 돌려준다."""
+
+    lowered = text.lower()
+    if len(lowered) == len(text) and unicodedata.is_normalized("NFKC", text):
+        return lowered, list(range(len(text))), list(range(1, len(text) + 1))
+    parts: List[str] = []
+    starts: List[int] = []
+    ends: List[int] = []
+    begin = 0
+    for idx in range(1, len(text) + 1):
+        # 결합 문자와 한글 중성·종성 자모는 앞 글자와 함께 정규화해야 합쳐진다.
+        if idx < len(text) and (unicodedata.combining(text[idx]) or "\u1160" <= text[idx] <= "\u11ff"):
+            continue
+        chunk = _search_normalize(text[begin:idx])
+        parts.append(chunk)
+        starts.extend([begin] * len(chunk))
+        ends.extend([idx] * len(chunk))
+        begin = idx
+    return "".join(parts), starts, ends
+
+
+def _fts_query(query: str) -> str:
+    # 검색어 단어마다 2-gram 구(phrase)를 만들고 AND로 묶는다.
+    phrases = []
+    for word in _WORD_RE.findall(unicodedata.normalize("NFKC", query).lower()):
+        grams = _ngram_tokens(word)
+        if grams:
+            phrases.append('"' + " ".join(gram.replace('"', '""') for gram in grams) + '"')
+    return " AND ".join(phrases)
+
+
+class TranscriptIndex:
+    """추출된 자막을 SQLite FTS5로 색인한다.
+
+    원문은 transcripts 테이블에, 2-gram 토큰은 contentless FTS 테이블에 둔다.
+    같은 영상이 다시 추출되면 이전 색인을 지우고 새로 넣는다.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is not None:
+            return self._conn
+        is_new = not os.path.exists(self.path)
+        conn = sqlite3.connect(self.path, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.create_function("search_normalize", 1, _search_normalize, deterministic=True)
+        conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS transcripts (
+                id INTEGER PRIMARY KEY,
+                video_id TEXT NOT NULL UNIQUE,
+                url TEXT NOT NULL,
+                title TEXT NOT NULL,
+                job_id TEXT NOT NULL,
+                text TEXT NOT NULL,
+                indexed_at TEXT NOT NULL
+            );
+            CREATE VIRTUAL TABLE IF NOT EXISTS transcript_grams USING fts5(
+                title_grams, text_grams, content='', tokenize='unicode61 remove_diacritics 0'
+            );
+            """
+        )
+        self._conn = conn
+        if is_new:
+            self._backfill(conn)
+        return conn
+
+    def _backfill(self, conn: sqlite3.Connection):
+        # 색인 파일이 처음 만들어질 때 기존 작업 결과를 한 번 훑어 넣는다.
+        try:
+            names = sorted(os.listdir(JOB_STORE_DIR))
+        except OSError:
+            return
+        for name in names:
+            if not name.endswith(".json"):
+                continue
+            job = _load_job(name[: -len(".json")])
+            if job and job.get("results"):
+                self._index_locked(conn, job.get("job_id") or name[: -len(".json")], job["results"])
+        conn.commit()
+
+    def _index_locked(self, conn: sqlite3.Connection, job_id: str, results: List[Dict[str, Any]]) -> int:
+        indexed = 0
+        now_iso = dt.datetime.now(dt.timezone.utc).isoformat()
+        for item in results:
+            text = (item or {}).get("text") or ""
+            video_id = _parse_video_id(item.get("url") or "")
+            if not text or not video_id:
+                continue
+            title = item.get("title") or ""
+            previous = conn.execute(
+                "SELECT id, title, text FROM transcripts WHERE video_id = ?", (video_id,)
+            ).fetchone()
+            if previous is not None:
+                row_id, old_title, old_text = previous
+                if old_title == title and old_text == text:
+                    continue
+                conn.execute(
+                    "INSERT INTO transcript_grams(transcript_grams, rowid, title_grams, text_grams) "
+                    "VALUES('delete', ?, ?, ?)",
+                    (row_id, " ".join(_ngram_tokens(old_title)), " ".join(_ngram_tokens(old_text))),
+                )
+                conn.execute(
+                    "UPDATE transcripts SET url = ?, title = ?, job_id = ?, text = ?, indexed_at = ? WHERE id = ?",
+                    (item.get("url") or "", title, job_id, text, now_iso, row_id),
+                )
+            else:
+                row_id = conn.execute(
+                    "INSERT INTO transcripts(video_id, url, title, job_id, text, indexed_at) VALUES(?, ?, ?, ?, ?, ?)",
+                    (video_id, item.get("url") or "", title, job_id, text, now_iso),
+                ).lastrowid
+            conn.execute(
+                "INSERT INTO transcript_grams(rowid, title_grams, text_grams) VALUES(?, ?, ?)",
+                (row_id, " ".join(_ngram_tokens(title)), " ".join(_ngram_tokens(text))),
+            )
+            indexed += 1
+        return indexed
+
+    def index_results(self, job_id: str, results: List[Dict[str, Any]]) -> int:
+        with self._lock, _timed("transcript_index_write"):
+            conn = self._connect()
+            indexed = self._index_locked(conn, job_id, results)
+            conn.commit()
+            return indexed
+
+    def search(self, query: str, limit: int = 20, offset: int = 0) -> List[Dict[str, Any]]:
+        terms = [word for word in _WORD_RE.findall(unicodedata.normalize("NFKC", query).lower()) if word]
+        if not terms:
+            return []
+        with self._lock, _timed("transcript_search"):
+            conn = self._connect()
+            if any(len(term) < 2 and _CJK_RE.search(term) for term in terms):
+                # 한 글자 검색어는 2-gram 색인으로 찾을 수 없어 원문을 직접 훑는다.
+                # 원문도 검색어와 같은 기준으로 정규화해 비교한다 (LIKE의 _·% 해석을 피하려 instr를 쓴다).
+                clause = " AND ".join("instr(search_normalize(text), ?) > 0" for _ in terms)
+                rows = conn.execute(
+                    f"SELECT video_id, url, title, job_id, text, 0.0 FROM transcripts WHERE {clause} "
+                    "ORDER BY indexed_at DESC LIMIT ? OFFSET ?",
+                    list(terms) + [limit, offset],
+                ).fetchall()
+            else:
+                rows = conn.execute(
+                    "SELECT t.video_id, t.url, t.title, t.job_id, t.text, bm25(transcript_grams, 5.0, 1.0) AS score "
+                    "FROM transcript_grams JOIN transcripts t ON t.id = transcript_grams.rowid "
+                    "WHERE transcript_grams MATCH ? ORDER BY score LIMIT ? OFFSET ?",
+                    (_fts_query(query), limit, offset),
+                ).fetchall()
+        return [
+            dict(
+                {"video_id": video_id, "url": url, "title": title, "job_id": job_id, "score": -score},
+                **_make_snippet(text, terms),
+            )
+            for video_id, url, title, job_id, text, score in rows
+        ]
+
+
+def _make_snippet(text: str, terms: List[str], width: int = 80) -> Dict[str, Any]:
+    # 검색어는 정규화된 원문에서 찾고, 위치는 원문 기준으로 되돌려 스니펫과 강조 구간을 만든다.
+    normalized, starts, _ = _normalized_with_offsets(text)
+    positions = [normalized.find(term) for term in terms]
+    positions = [pos for pos in positions if pos >= 0]
+    if not positions:
+        return {"snippet": text[: width * 2].replace("\n", " "), "highlights": []}
+    first = starts[min(positions)]
+    start = max(0, first - width)
+    end = min(len(text), first + width)
+    snippet = text[start:end]
+    lowered, snippet_starts, snippet_ends = _normalized_with_offsets(snippet)
+    highlights: List[List[int]] = []
+    for term in terms:
+        pos = lowered.find(term)
+        while pos >= 0:
+            highlights.append([snippet_starts[pos], snippet_ends[pos + len(term) - 1]])
+            pos = lowered.find(term, pos + len(term))
+    highlights.sort()
+    return {
+        "snippet": ("…" if start > 0 else "") + snippet.replace("\n", " ") + ("…" if end < len(text) else ""),
+        # 앞에 붙인 말줄임표만큼 위치를 민다.
+        "highlights": [[begin + (1 if start > 0 else 0), stop + (1 if start > 0 else 0)] for begin, stop in highlights],
+    }
+
+
+TRANSCRIPT_INDEX = TranscriptIndex(TRANSCRIPT_INDEX_PATH)
 
 
 def _require_internal_token(token: str):
@@ -196,7 +1502,7 @@ def _dispatch_caption_workflow(job_id: str, *, runner_labels: Optional[str] = No
     if not CAPTION_WORKFLOW_BASE_URL:
         raise RuntimeError("CAPTION_JOB_BASE_URL 환경변수 미설정")
     url = (
-        f"https://api.github.com/repos/{CAPTION_WORKFLOW_REPO}/actions/workflows/"
+        f"{GITHUB_API_URL}/repos/{CAPTION_WORKFLOW_REPO}/actions/workflows/"
         f"{CAPTION_WORKFLOW_FILE}/dispatches"
     )
     headers = {
@@ -214,7 +1520,7 @@ def _dispatch_caption_workflow(job_id: str, *, runner_labels: Optional[str] = No
     payload = json.dumps({"ref": CAPTION_WORKFLOW_REF, "inputs": inputs}).encode("utf-8")
     request = urllib.request.Request(url, data=payload, headers=headers, method="POST")
     try:
-        with urllib.request.urlopen(request) as response:
+        with _timed("caption_workflow_dispatch"), urllib.request.urlopen(request) as response:
             if response.status not in (200, 201, 204):
                 raise RuntimeError(f"GitHub Actions 응답 오류: {response.status}")
     except urllib.error.HTTPError as exc:
@@ -254,57 +1560,428 @@ def _format_upload_datestr_iso8601_to_pair(iso_str: str):
         return "", ""
 
 
+CAPTION_LIGHT_EXTRACT = os.environ.get("CAPTION_LIGHT_EXTRACT", "1").strip().lower() not in ("0", "false", "no")
+# 부하 테스트 등에서 가짜 업스트림을 가리킬 때만 설정한다.
+INNERTUBE_BASE_URL = (os.environ.get("INNERTUBE_BASE_URL", "").strip() or "https://www.youtube.com").rstrip("/")
+INNERTUBE_PLAYER_URL = f"{INNERTUBE_BASE_URL}/youtubei/v1/player"
+_INNERTUBE_ANDROID_CLIENT = {
+    "clientName": "ANDROID",
+    "clientVersion": "19.09.37",
+    "androidSdkVersion": 30,
+    "hl": "ko",
+    "gl": "KR",
+}
+_INNERTUBE_USER_AGENT = "com.google.android.youtube/19.09.37 (Linux; U; Android 11) gzip"
+_PREFERRED_CAPTION_LANGS = ("ko", "ko-KR", "ko_KR", "en")
+METRICS.describe("caption_preflight_skipped_total", "counter", "사전 점검으로 실행기에 보내지 않은 URL 수")
+METRICS.describe("caption_extract_path_total", "counter", "자막 추출 경로 (light, ytdlp_fallback)")
+
+
+def _http_fetch(
+    url: str,
+    *,
+    data: Optional[bytes] = None,
+    headers: Optional[Dict[str, str]] = None,
+    proxy: Optional[str] = None,
+    timeout: float = 20.0,
+) -> bytes:
+    request = urllib.request.Request(url, data=data, headers=dict(headers or {}), method="POST" if data else "GET")
+    request.add_header("Accept-Encoding", "gzip")
+    handlers = [urllib.request.ProxyHandler({"http": proxy, "https": proxy})] if proxy else []
+    with urllib.request.build_opener(*handlers).open(request, timeout=timeout) as response:
+        body = response.read()
+        if response.headers.get("Content-Encoding", "").lower() == "gzip":
+            body = gzip.decompress(body)
+        return body
+
+
+def _pick_caption_track(tracks: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    # yt_dlp 경로와 같은 우선순위: 수동 자막 → 자동 자막, 각각 선호 언어 → 아무 언어.
+    manual = [track for track in tracks if track.get("kind") != "asr"]
+    automatic = [track for track in tracks if track.get("kind") == "asr"]
+    for group in (manual, automatic):
+        for lang in _PREFERRED_CAPTION_LANGS:
+            for track in group:
+                if track.get("languageCode") == lang and track.get("baseUrl"):
+                    return track
+        for track in group:
+            if track.get("baseUrl"):
+                return track
+    return None
+
+
+def _fetch_captions_light(
+    video_id: str,
+    *,
+    cookies: Optional[Dict[str, str]] = None,
+    proxy: Optional[str] = None,
+    title_hint: str = "",
+) -> Optional[Tuple[Optional[str], str]]:
+    """플레이어 응답에서 자막 트랙 목록만 받아 고른 트랙 하나를 내려받는다.
+
+    재생 불가·자막 트랙 없음·빈 자막 등 판단이 어려운 경우 None을 돌려 yt_dlp 경로로 넘긴다.
+    """
+
+    headers = {
+        "Content-Type": "application/json",
+        "User-Agent": _INNERTUBE_USER_AGENT,
+        "X-Youtube-Client-Name": "3",
+        "X-Youtube-Client-Version": _INNERTUBE_ANDROID_CLIENT["clientVersion"],
+    }
+    if cookies:
+        headers["Cookie"] = "; ".join(f"{name}={value}" for name, value in cookies.items())
+    payload = {
+        "context": {"client": _INNERTUBE_ANDROID_CLIENT},
+        "videoId": video_id,
+        "contentCheckOk": True,
+        "racyCheckOk": True,
+    }
+    with _timed("caption_track_list"):
+        body = _http_fetch(
+            INNERTUBE_PLAYER_URL, data=json.dumps(payload).encode("utf-8"), headers=headers, proxy=proxy
+        )
+    data = json.loads(body.decode("utf-8"))
+    if (data.get("playabilityStatus") or {}).get("status") != "OK":
+        return None
+    title = ((data.get("videoDetails") or {}).get("title") or title_hint or "video").strip()
+    tracks = (((data.get("captions") or {}).get("playerCaptionsTracklistRenderer") or {}).get("captionTracks")) or []
+    track = _pick_caption_track(tracks)
+    if track is None:
+        # 고정 ANDROID 클라이언트 응답에는 빠져도 yt_dlp의 클라이언트 협상으로는 찾는 자막이 있으므로
+        # "자막 없음"으로 확정하지 않고 전체 extract_info 경로에 맡긴다.
+        return None
+
+    track_url = re.sub(r"([?&])fmt=[^&]*&?", r"\1", track["baseUrl"]).rstrip("&?")
+    track_url += ("&" if "?" in track_url else "?") + "fmt=vtt"
+    with _timed("subtitle_download"):
+        vtt_text = _http_fetch(track_url, headers={"User-Agent": _INNERTUBE_USER_AGENT}, proxy=proxy).decode("utf-8")
+    if "-->" not in vtt_text:
+        return None
+    return clean_vtt(vtt_text), title
+
+
 def _extract_text_and_title(
     youtube_url: str,
     *,
     cookie_path: str = "",
     http_headers: Optional[Dict[str, str]] = None,
+    proxy_key: str = "",
+    cookies: Optional[Dict[str, str]] = None,
+    title_hint: str = "",
 ):
-    opts = {
-        "skip_download": True,
-        "writesubtitles": True,
-        "writeautomaticsub": True,
-        "quiet": True,
-        "forcejson": True,
-        "simulate": True,
-        "http_headers": http_headers or {"User-Agent": "Mozilla/5.0"},
-    }
-    if cookie_path and os.path.exists(cookie_path):
-        opts["cookiefile"] = cookie_path
+    """프록시 풀에서 송출 경로를 받아 자막을 추출하고, 결과를 프록시 점수에 반영한다.
+
+    먼저 자막 트랙 목록만 받는 가벼운 경로를 시도하고, 판단이 안 되면 yt_dlp의
+    전체 extract_info로 넘어간다. 속도 제한 토큰과 회로 차단기 기록은 두 경로를 합쳐
+    영상 하나에 한 번만 쓴다.
+    """
+
+    proxy = PROXY_POOL.acquire(proxy_key)
+    started = time.monotonic()
+    try:
+        with _guarded(CAPTION_RATE_LIMITER, CAPTION_CIRCUIT, CAPTION_RATE_WAIT_SEC):
+            result = None
+            video_id = _parse_video_id(youtube_url)
+            if CAPTION_LIGHT_EXTRACT and video_id:
+                try:
+                    result = _fetch_captions_light(video_id, cookies=cookies, proxy=proxy, title_hint=title_hint)
+                except Exception as exc:
+                    if _is_throttle_error(exc):
+                        raise
+                    result = None
+            if result is not None:
+                METRICS.inc("caption_extract_path_total", {"path": "light"})
+            else:
+                METRICS.inc("caption_extract_path_total", {"path": "ytdlp_fallback"})
+                result = _extract_via_ytdlp(
+                    youtube_url, cookie_path=cookie_path, http_headers=http_headers, proxy=proxy
+                )
+    except LocalThrottleError:
+        # 속도 제한기·회로 차단기가 요청 전에 거절했으므로 프록시 점수에는 반영하지 않는다.
+        PROXY_POOL.release(proxy, None)
+        raise
+    except Exception as exc:
+        # 영상 자체의 문제(비공개 등)는 프록시 탓이 아니므로 실패로 세지 않는다.
+        PROXY_POOL.release(proxy, not _is_upstream_failure(exc), time.monotonic() - started)
+        raise
+    PROXY_POOL.release(proxy, True, time.monotonic() - started)
+    return result
+
+
+# yt_dlp 추출 전략: (player_client 조합, 적응형 포맷 허용 여부, 쿠키 사용 여부)
+ExtractStrategy = Tuple[Tuple[str, ...], bool, bool]
+# 통계는 실행기의 작업 디렉터리에 남으므로 상주 모드(--daemon)에서만 실행 사이에 이어진다.
+# GitHub Actions처럼 매번 새로 체크아웃하는 실행기는 캐시되는 경로를 YTDLP_STRATEGY_STATS_PATH로 지정해야 한다.
+EXTRACT_STRATEGY_PATH = os.environ.get("YTDLP_STRATEGY_STATS_PATH", "").strip() or os.path.join(
+    DATA_DIR, "extract_strategies.json"
+)
+YTDLP_MAX_STRATEGY_ATTEMPTS = max(1, int(_env_float("YTDLP_MAX_STRATEGY_ATTEMPTS", 2)))
+# 기존 고정 순서(android+ios, 적응형 차단 → 허용)가 통계가 없을 때의 기본 순서가 되도록 사전 성공 횟수를 준다.
+# 쿠키 없는 전략은 절반만 준다.
+_DEFAULT_STRATEGY_PRIORS: Dict[Tuple[Tuple[str, ...], bool], float] = {
+    (("android", "ios"), False): 3.0,
+    (("android", "ios"), True): 2.0,
+}
+# 전략을 바꿔도 소용없는 영상 자체의 문제. 전략 실패로 세지 않고 바로 올린다.
+_VIDEO_FATAL_MESSAGES = (
+    "private video",
+    "video has been removed",
+    "members-only",
+    "join this channel",
+    "this live event will begin",
+    "premieres in",
+    "account associated with this video has been terminated",
+    "available in your country",
+    "blocked it in your country",
+    "confirm your age",
+    "age-restricted",
+    "copyright claim",
+)
+# 플레이어 클라이언트·포맷 선택에 따라 달라지는 오류. 이것만 전략 실패로 세고 다음 전략을 시도한다.
+# 그 밖의 DownloadError(단순 "Video unavailable" 등)는 기록 없이 바로 올린다.
+_STRATEGY_FAILURE_MESSAGES = (
+    "requested format is not available",
+    "this video is not available",
+    "no video formats found",
+    "failed to extract any player response",
+    "unable to extract yt initial player response",
+    "the page needs to be reloaded",
+)
+
+
+def _parse_player_client_sets(value: str) -> List[Tuple[str, ...]]:
+    sets = []
+    for group in value.split(";"):
+        clients = tuple(client.strip() for client in group.split(",") if client.strip())
+        if clients and clients not in sets:
+            sets.append(clients)
+    return sets
+
+
+YTDLP_PLAYER_CLIENT_SETS = _parse_player_client_sets(
+    os.environ.get("YTDLP_PLAYER_CLIENT_SETS", "") or "android,ios;web;tv_embedded,web;mweb"
+)
+
+
+def _strategy_name(strategy: ExtractStrategy) -> str:
+    clients, adaptive, cookies = strategy
+    return f"{'+'.join(clients)}|{'adaptive' if adaptive else 'no_adaptive'}|{'cookie' if cookies else 'no_cookie'}"
+
+
+class ExtractStrategySelector:
+    """추출 전략별 성공·실패와 지연을 기록하고, 잘 되던 전략부터 시도하게 순서를 정한다.
+
+    점수는 라플라스 보정 성공률에서 평균 지연/latency_scale을 뺀 값이다. 관측할 때마다 이전 횟수를
+    decay만큼 줄이므로 YouTube 동작이 바뀌어 1순위가 계속 실패하면 곧 다음 전략이 앞으로 올라온다.
+    통계는 path에 JSON으로 남겨 재시작 후에도 이어 쓴다.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        client_sets: List[Tuple[str, ...]],
+        *,
+        decay: float = 0.97,
+        latency_scale: float = 60.0,
+        save_interval: float = 30.0,
+    ):
+        self.path = path
+        self.decay = decay
+        self.latency_scale = latency_scale
+        self.save_interval = save_interval
+        self.strategies: List[ExtractStrategy] = [
+            (clients, adaptive, cookies) for cookies in (True, False) for clients in client_sets for adaptive in (False, True)
+        ]
+        self._stats: Dict[str, Dict[str, float]] = {}
+        self._lock = threading.Lock()
+        self._dirty = False
+        self._last_save = 0.0
+        self._load()
+
+    def _load(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as file:
+                data = json.load(file)
+        except (OSError, ValueError):
+            return
+        for name, entry in (data.get("strategies") or {}).items() if isinstance(data, dict) else ():
+            if isinstance(entry, dict):
+                self._stats[name] = {
+                    key: float(entry.get(key) or 0.0) for key in ("successes", "failures", "latency_ewma", "attempts")
+                }
+
+    def _entry(self, strategy: ExtractStrategy) -> Dict[str, float]:
+        name = _strategy_name(strategy)
+        entry = self._stats.get(name)
+        if entry is None:
+            prior = _DEFAULT_STRATEGY_PRIORS.get((strategy[0], strategy[1]), 0.0)
+            if not strategy[2]:
+                prior /= 2
+            entry = {"successes": prior, "failures": 0.0, "latency_ewma": 0.0, "attempts": 0.0}
+            self._stats[name] = entry
+        return entry
+
+    @staticmethod
+    def _success_rate(entry: Dict[str, float]) -> float:
+        return (entry["successes"] + 1.0) / (entry["successes"] + entry["failures"] + 2.0)
+
+    def ranked(self, *, cookies_available: bool) -> List[ExtractStrategy]:
+        candidates = [strategy for strategy in self.strategies if cookies_available or not strategy[2]]
+        with self._lock:
+            scores = {
+                strategy: self._success_rate(entry) - entry["latency_ewma"] / self.latency_scale
+                for strategy, entry in ((strategy, self._entry(strategy)) for strategy in candidates)
+            }
+        # sorted는 안정 정렬이라 점수가 같으면 strategies 선언 순서(쿠키 우선)를 따른다.
+        return sorted(candidates, key=lambda strategy: scores[strategy], reverse=True)
+
+    def record(self, strategy: ExtractStrategy, ok: bool, latency: float):
+        with self._lock:
+            entry = self._entry(strategy)
+            entry["successes"] = entry["successes"] * self.decay + (1.0 if ok else 0.0)
+            entry["failures"] = entry["failures"] * self.decay + (0.0 if ok else 1.0)
+            entry["attempts"] += 1
+            if ok:
+                entry["latency_ewma"] = latency if not entry["latency_ewma"] else entry["latency_ewma"] * 0.8 + latency * 0.2
+            self._dirty = True
+        METRICS.inc(
+            "caption_strategy_attempts_total",
+            {"strategy": _strategy_name(strategy), "outcome": "ok" if ok else "failed"},
+        )
+        self.save()
+
+    def save(self, force: bool = False):
+        with self._lock:
+            if not self._dirty or (not force and time.monotonic() - self._last_save < self.save_interval):
+                return
+            snapshot = {name: dict(entry) for name, entry in self._stats.items()}
+            self._dirty = False
+            self._last_save = time.monotonic()
+        payload = {"updated_at": dt.datetime.now(dt.timezone.utc).isoformat(), "strategies": snapshot}
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as file:
+                json.dump(payload, file, ensure_ascii=False, indent=2)
+            os.replace(tmp_path, self.path)
+        except OSError:  # pragma: no cover - 통계 저장 실패가 추출을 막지 않게 한다
+            with self._lock:
+                self._dirty = True
+
+    def snapshot(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            rows = []
+            for strategy in self.strategies:
+                entry = self._entry(strategy)
+                rows.append(
+                    {
+                        "strategy": _strategy_name(strategy),
+                        "success_rate": self._success_rate(entry),
+                        "latency_ewma": entry["latency_ewma"],
+                        "attempts": int(entry["attempts"]),
+                    }
+                )
+        rows.sort(key=lambda row: row["success_rate"], reverse=True)
+        return rows
+
+
+EXTRACT_STRATEGIES = ExtractStrategySelector(EXTRACT_STRATEGY_PATH, YTDLP_PLAYER_CLIENT_SETS)
+atexit.register(EXTRACT_STRATEGIES.save, True)
+METRICS.describe("caption_strategy_attempts_total", "counter", "yt_dlp 추출 전략별 시도 결과 (strategy, outcome)")
+METRICS.describe("caption_strategy_fallbacks_total", "counter", "첫 전략이 실패해 다음 전략으로 넘어간 횟수")
+METRICS.register_gauge(
+    "caption_strategy_success_rate",
+    "yt_dlp 추출 전략별 학습된 성공률 (이 프로세스에 불러온 통계 기준)",
+    lambda: [({"strategy": row["strategy"]}, row["success_rate"]) for row in EXTRACT_STRATEGIES.snapshot()],
+)
+METRICS.register_gauge(
+    "caption_strategy_latency_seconds",
+    "yt_dlp 추출 전략별 성공 지연의 지수 이동 평균",
+    lambda: [({"strategy": row["strategy"]}, row["latency_ewma"]) for row in EXTRACT_STRATEGIES.snapshot()],
+)
+
+
+def _is_strategy_failure(exc: BaseException) -> bool:
+    message = str(exc).lower()
+    if any(marker in message for marker in _VIDEO_FATAL_MESSAGES):
+        return False
+    return any(marker in message for marker in _STRATEGY_FAILURE_MESSAGES)
+
+
+def _extract_via_ytdlp(
+    youtube_url: str,
+    *,
+    cookie_path: str = "",
+    http_headers: Optional[Dict[str, str]] = None,
+    proxy: Optional[str] = None,
+):
+    """통계상 가장 잘 되는 전략부터 최대 YTDLP_MAX_STRATEGY_ATTEMPTS개를 차례로 시도한다.
+
+    속도 제한·회로 차단은 호출하는 _extract_text_and_title이 영상 단위로 건다.
+    """
+
+    base_headers = http_headers or {"User-Agent": "Mozilla/5.0"}
+    has_cookies = bool(cookie_path and os.path.exists(cookie_path))
 
     last_error: Optional[Exception] = None
-    for disable_adaptive in (True, False):
-        ydl_opts = _build_ydl_opts(opts, disable_adaptive_formats=disable_adaptive)
+    strategies = EXTRACT_STRATEGIES.ranked(cookies_available=has_cookies)[:YTDLP_MAX_STRATEGY_ATTEMPTS]
+    for attempt, strategy in enumerate(strategies):
+        clients, adaptive, use_cookies = strategy
+        opts = {
+            "skip_download": True,
+            "writesubtitles": True,
+            "writeautomaticsub": True,
+            "quiet": True,
+            "forcejson": True,
+            "simulate": True,
+            "http_headers": dict(base_headers),
+        }
+        if use_cookies:
+            opts["cookiefile"] = cookie_path
+        else:
+            # 쿠키 없는 전략은 계정 인증 헤더도 함께 뺀다.
+            for header in ("Authorization", "Cookie", "X-Goog-AuthUser"):
+                opts["http_headers"].pop(header, None)
+        ydl_opts = _build_ydl_opts(opts, disable_adaptive_formats=not adaptive, proxy=proxy, player_clients=clients)
+        if attempt:
+            METRICS.inc("caption_strategy_fallbacks_total")
+        started = time.monotonic()
         try:
             with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                info = ydl.extract_info(youtube_url, download=False)
+                with _timed("ytdlp_extract_info"):
+                    info = ydl.extract_info(youtube_url, download=False)
                 title = info.get("title") or "video"
                 subs = info.get("subtitles") or {}
                 auto_subs = info.get("automatic_captions") or {}
 
+                def download_vtt(sub_url: str) -> str:
+                    with _timed("subtitle_download"):
+                        return ydl.urlopen(sub_url).read().decode("utf-8")
+
                 def get_vtt(sub_dict, preferred=("ko", "ko-KR", "ko_KR", "en")):
                     for lang in preferred:
                         if lang in sub_dict:
                             for fmt in sub_dict[lang]:
                                 if fmt.get("ext") == "vtt":
-                                    return ydl.urlopen(fmt["url"]).read().decode("utf-8")
+                                    return download_vtt(fmt["url"])
                     for _, formats in sub_dict.items():
                         for fmt in formats:
                             if fmt.get("ext") == "vtt":
-                                return ydl.urlopen(fmt["url"]).read().decode("utf-8")
+                                return download_vtt(fmt["url"])
                     return None
 
                 vtt_text = get_vtt(subs) or get_vtt(auto_subs)
+                EXTRACT_STRATEGIES.record(strategy, True, time.monotonic() - started)
                 if not vtt_text:
                     return None, title
                 return clean_vtt(vtt_text), title
         except DownloadError as exc:
             last_error = exc
-            message = str(exc)
-            if "Requested format is not available" in message or "This video is not available" in message:
-                # 재시도: DASH/HLS 차단 해제 후 한 번 더 시도한다.
-                continue
-            raise
+            if _is_throttle_error(exc) or not _is_strategy_failure(exc):
+                # 요청 제한, 지역·연령 제한 같은 영상 자체의 문제는 전략 탓이 아니므로 기록하지 않는다.
+                raise
+            # 포맷 없음·플레이어 응답 실패는 이 전략의 실패로 기록하고 다음 전략으로 넘어간다.
+            EXTRACT_STRATEGIES.record(strategy, False, time.monotonic() - started)
+            continue
         except Exception as exc:  # pragma: no cover - 네트워크 의존
             last_error = exc
             raise
@@ -330,7 +2007,9 @@ def _resolve_channel_id(youtube, channel_input: str) -> str:
         match = re.search(r"/@([A-Za-z0-9._-]+)", s)
         if match:
             try:
-                resp = youtube.channels().list(part="id", forHandle=match.group(1)).execute()
+                resp = _execute_youtube(
+                    youtube.channels().list(part="id", forHandle=match.group(1)), "youtube_channels_list"
+                )
                 items = resp.get("items", [])
                 if items:
                     return items[0]["id"]
@@ -338,14 +2017,14 @@ def _resolve_channel_id(youtube, channel_input: str) -> str:
                 pass
     if s.startswith("@"):
         try:
-            resp = youtube.channels().list(part="id", forHandle=s[1:]).execute()
+            resp = _execute_youtube(youtube.channels().list(part="id", forHandle=s[1:]), "youtube_channels_list")
             items = resp.get("items", [])
             if items:
                 return items[0]["id"]
         except Exception:
             pass
     try:
-        resp = youtube.channels().list(part="id", forUsername=s).execute()
+        resp = _execute_youtube(youtube.channels().list(part="id", forUsername=s), "youtube_channels_list")
         items = resp.get("items", [])
         if items:
             return items[0]["id"]
@@ -354,6 +2033,78 @@ def _resolve_channel_id(youtube, channel_input: str) -> str:
     return ""
 
 
+def _sort_search_items(items: List[Dict[str, Any]], sort_by: str):
+    if sort_by == "views":
+        items.sort(
+            key=lambda item: (
+                0 if isinstance(item["view_count"], int) else 1,
+                -(item["view_count"] or 0),
+                item["date_raw"] or "00000000",
+            )
+        )
+    else:
+        items.sort(key=lambda item: item["date_raw"] or "00000000", reverse=True)
+
+
+def _build_youtube_client(api_key: str):
+    if YOUTUBE_API_BASE_URL:
+        return build(
+            "youtube",
+            "v3",
+            developerKey=api_key,
+            client_options={"api_endpoint": YOUTUBE_API_BASE_URL.rstrip("/") + "/"},
+        )
+    return build("youtube", "v3", developerKey=api_key)
+
+
+class TTLCache:
+    """항목 수와 유효 시간이 제한된 스레드 안전 캐시."""
+
+    def __init__(self, ttl: float, max_items: int = 5000):
+        self.ttl = ttl
+        self.max_items = max_items
+        self._lock = threading.Lock()
+        self._items: "collections.OrderedDict[str, Tuple[float, Any]]" = collections.OrderedDict()
+
+    def get(self, key: str) -> Any:
+        with self._lock:
+            entry = self._items.get(key)
+            if entry is None:
+                return None
+            if entry[0] < time.monotonic():
+                del self._items[key]
+                return None
+            self._items.move_to_end(key)
+            return entry[1]
+
+    def set(self, key: str, value: Any):
+        with self._lock:
+            self._items[key] = (time.monotonic() + self.ttl, value)
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_items:
+                self._items.popitem(last=False)
+
+
+# 검색·사전 점검에서 받은 영상 메타데이터. 자막 추출 전 점검과 제목 힌트에 재사용한다.
+VIDEO_META_CACHE = TTLCache(ttl=_env_float("VIDEO_META_CACHE_TTL_SEC", 6 * 3600.0))
+
+
+def _remember_video_meta(video: Dict[str, Any]):
+    vid = video.get("id")
+    if not vid:
+        return
+    snippet = video.get("snippet") or {}
+    content_details = video.get("contentDetails") or {}
+    VIDEO_META_CACHE.set(
+        vid,
+        {
+            "title": (snippet.get("title") or "").strip(),
+            "has_captions": str(content_details.get("caption", "")).lower() == "true",
+            "live": (snippet.get("liveBroadcastContent") or "none") != "none",
+        },
+    )
+
+
 def search_youtube_videos_api(
     api_key: str,
     keyword: str,
@@ -364,23 +2115,56 @@ def search_youtube_videos_api(
     duration_filter: str = "any",
     sort_by: str = "views",
     channel_filter: str = "",
+    detail_mask: Optional[Tuple[str, str]] = None,
 ) -> List[Dict[str, Any]]:
     if not api_key:
         raise RuntimeError("YOUTUBE_API_KEY 미설정")
     if build is None:
         raise RuntimeError("google-api-python-client 필요")
 
-    youtube = build("youtube", "v3", developerKey=api_key)
+    youtube = _build_youtube_client(api_key)
+    channel_id = _resolve_channel_id(youtube, channel_filter) if channel_filter else ""
+    params = _build_search_params(
+        keyword,
+        max_results=max_results,
+        time_filter=time_filter,
+        custom_from=custom_from,
+        custom_to=custom_to,
+        duration_filter=duration_filter,
+        sort_by=sort_by,
+        channel_id=channel_id,
+    )
+    video_ids = _search_video_ids(youtube, params)
+    if not video_ids:
+        return []
+
+    details = _fetch_video_details(youtube, video_ids, detail_mask)
+    items = [item for item in map(_video_to_item, details.values()) if item]
+    _sort_search_items(items, sort_by)
+    return items[:max_results]
+
+
+def _build_search_params(
+    keyword: str,
+    *,
+    max_results: int = 50,
+    time_filter: str = "any",
+    custom_from: str = "",
+    custom_to: str = "",
+    duration_filter: str = "any",
+    sort_by: str = "views",
+    channel_id: str = "",
+) -> Dict[str, Any]:
     params: Dict[str, Any] = {
         "q": keyword or "",
         "part": "snippet",
         "type": "video",
         "maxResults": min(max_results, 50),
+        # 검색 결과에서는 영상 ID만 쓰므로 스니펫은 받지 않는다.
+        "fields": "items(id/videoId)",
     }
-    if channel_filter:
-        channel_id = _resolve_channel_id(youtube, channel_filter)
-        if channel_id:
-            params["channelId"] = channel_id
+    if channel_id:
+        params["channelId"] = channel_id
 
     now_utc = dt.datetime.now(dt.timezone.utc)
     if time_filter in ("day", "week", "month", "custom"):
@@ -398,63 +2182,284 @@ def search_youtube_videos_api(
     if duration_filter in ("short", "medium", "long"):
         params["videoDuration"] = duration_filter
     params["order"] = "date" if sort_by == "date" else "viewCount"
-
-    search_resp = youtube.search().list(**params).execute()
-    video_ids = [item["id"]["videoId"] for item in search_resp.get("items", []) if item.get("id")]
-    if not video_ids:
-        return []
-
-    videos_resp = youtube.videos().list(part="snippet,statistics,contentDetails", id=",".join(video_ids)).execute()
-
-    items: List[Dict[str, Any]] = []
-    for video in videos_resp.get("items", []):
-        vid = video.get("id")
-        snippet = video.get("snippet", {}) or {}
-        statistics = video.get("statistics", {}) or {}
-        content_details = video.get("contentDetails", {}) or {}
-        title = (snippet.get("title") or "").strip()
-        url = f"https://www.youtube.com/watch?v={vid}" if vid else ""
-        if not (title and url):
-            continue
-        channel_title = (snippet.get("channelTitle") or "").strip()
-        channel_id = (snippet.get("channelId") or "").strip()
-        date_raw, date_fmt = _format_upload_datestr_iso8601_to_pair(snippet.get("publishedAt") or "")
-        dur_seconds = _parse_iso8601_duration_to_seconds(content_details.get("duration") or "")
-        try:
-            view_count = int(statistics.get("viewCount")) if "viewCount" in statistics else None
-        except Exception:
-            view_count = None
-        items.append(
-            {
-                "url": url,
-                "title": title,
-                "video_id": vid,
-                "channel_title": channel_title,
-                "channel_id": channel_id,
-                "date_raw": date_raw,
-                "date_fmt": date_fmt,
-                "published_at_iso": snippet.get("publishedAt") or "",
-                "view_count": view_count,
-                "dur_seconds": dur_seconds,
-                "dur_hms": _fmt_hhmmss(dur_seconds),
-                "thumbnails": snippet.get("thumbnails") or {},
-                "language": snippet.get("defaultAudioLanguage")
-                or snippet.get("defaultLanguage")
-                or "",
-                "has_captions": str(content_details.get("caption", "")).lower() == "true",
-            }
-        )
-    if sort_by == "views":
-        items.sort(
-            key=lambda item: (
-                0 if isinstance(item["view_count"], int) else 1,
-                -(item["view_count"] or 0),
-                item["date_raw"] or "00000000",
-            )
-        )
-    else:
-        items.sort(key=lambda item: item["date_raw"] or "00000000", reverse=True)
-    return items[:max_results]
+    return params
+
+
+def _search_video_ids(youtube, params: Dict[str, Any]) -> List[str]:
+    search_resp = _execute_youtube(youtube.search().list(**params), "youtube_search_list")
+    return [item["id"]["videoId"] for item in search_resp.get("items", []) if item.get("id")]
+
+
+class VideoDetailBatcher:
+    """동시에 들어온 영상 상세 조회를 모아 videos().list 한 번(50개 단위)으로 처리한다.
+
+    이미 조회 중이거나 대기 중인 ID는 그 결과를 기다리고, 새 ID는 대기열에 넣는다.
+    대기열을 처리하는 스레드가 없으면 호출한 스레드가 window_sec만큼 더 모은 뒤 처리하되,
+    자기 ID가 모두 끝나면 손을 떼고 남은 대기열은 기다리던 다른 호출자가 이어받는다.
+    그래서 한 요청의 지연이 뒤이어 몰린 요청 수에 따라 늘어나지 않는다.
+    """
+
+    def __init__(
+        self,
+        window_sec: float = 0.02,
+        batch_size: int = 50,
+        timeout: float = 30.0,
+        part: str = "snippet,statistics,contentDetails",
+        fields: Optional[str] = None,
+    ):
+        self.window_sec = window_sec
+        self.batch_size = batch_size
+        self.timeout = timeout
+        self.part = part
+        self.fields = fields
+        self._lock = threading.Lock()
+        # 조회가 끝나거나 처리 스레드가 손을 뗄 때 기다리는 호출자를 깨운다.
+        self._changed = threading.Condition(self._lock)
+        self._pending: "collections.OrderedDict[str, concurrent.futures.Future]" = collections.OrderedDict()
+        self._inflight: Dict[str, concurrent.futures.Future] = {}
+        self._draining = False
+
+    def fetch(self, youtube, video_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        futures: Dict[str, concurrent.futures.Future] = {}
+        with self._lock:
+            for vid in video_ids:
+                future = self._inflight.get(vid) or self._pending.get(vid)
+                if future is None:
+                    future = concurrent.futures.Future()
+                    self._pending[vid] = future
+                else:
+                    METRICS.inc("singleflight_shared_total", {"group": "youtube_videos"})
+                futures[vid] = future
+
+        own = list(futures.values())
+        deadline = time.monotonic() + self.timeout
+        while True:
+            with self._changed:
+                drain = False
+                while not all(future.done() for future in own):
+                    if self._pending and not self._draining:
+                        self._draining = drain = True
+                        break
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise TimeoutError("youtube_videos: 진행 중인 상세 조회 대기 시간 초과")
+                    self._changed.wait(remaining)
+            if not drain:
+                break
+            self._drain(youtube, own)
+
+        details: Dict[str, Dict[str, Any]] = {}
+        for vid, future in futures.items():
+            video = future.result(0)
+            if video is not None:
+                details[vid] = video
+        return details
+
+    def _drain(self, youtube, own: List[concurrent.futures.Future]):
+        """own이 모두 끝날 때까지 대기열을 batch_size씩 처리한다."""
+
+        if self.window_sec > 0:
+            time.sleep(self.window_sec)
+        while True:
+            with self._lock:
+                if not self._pending or all(future.done() for future in own):
+                    self._draining = False
+                    self._changed.notify_all()
+                    return
+                batch: Dict[str, concurrent.futures.Future] = {}
+                while self._pending and len(batch) < self.batch_size:
+                    vid, future = self._pending.popitem(last=False)
+                    batch[vid] = future
+                self._inflight.update(batch)
+            params: Dict[str, Any] = {"part": self.part, "id": ",".join(batch)}
+            if self.fields:
+                params["fields"] = self.fields
+            try:
+                videos_resp = _execute_youtube(youtube.videos().list(**params), "youtube_videos_list")
+            except BaseException as exc:
+                for future in batch.values():
+                    future.set_exception(exc)
+            else:
+                found = {video["id"]: video for video in videos_resp.get("items", []) if video.get("id")}
+                if not self.fields:
+                    # 부분 응답은 사전 점검에 필요한 필드가 빠져 있을 수 있어 캐시하지 않는다.
+                    for video in found.values():
+                        _remember_video_meta(video)
+                for vid, future in batch.items():
+                    future.set_result(found.get(vid))
+            finally:
+                with self._lock:
+                    for vid in batch:
+                        self._inflight.pop(vid, None)
+                    self._changed.notify_all()
+
+
+VIDEO_DETAIL_BATCHER = VideoDetailBatcher(
+    window_sec=_env_float("VIDEO_DETAIL_BATCH_WINDOW_SEC", 0.02), timeout=SINGLEFLIGHT_TIMEOUT_SEC
+)
+# 부분 응답 마스크(part, fields)별 배처. 같은 마스크로 동시에 조회하는 요청끼리만 합친다.
+_MASKED_DETAIL_BATCHERS: Dict[Tuple[str, str], VideoDetailBatcher] = {}
+_MASKED_DETAIL_BATCHERS_LOCK = threading.Lock()
+
+
+def _video_detail_batcher(mask: Optional[Tuple[str, str]]) -> VideoDetailBatcher:
+    if mask is None:
+        return VIDEO_DETAIL_BATCHER
+    with _MASKED_DETAIL_BATCHERS_LOCK:
+        batcher = _MASKED_DETAIL_BATCHERS.get(mask)
+        if batcher is None:
+            batcher = VideoDetailBatcher(
+                window_sec=VIDEO_DETAIL_BATCHER.window_sec,
+                timeout=VIDEO_DETAIL_BATCHER.timeout,
+                part=mask[0],
+                fields=mask[1],
+            )
+            _MASKED_DETAIL_BATCHERS[mask] = batcher
+        return batcher
+
+
+def _fetch_video_details(
+    youtube, video_ids: List[str], mask: Optional[Tuple[str, str]] = None
+) -> Dict[str, Dict[str, Any]]:
+    """videos().list를 50개 단위로 호출해 {video_id: video 리소스}를 돌려준다 (입력 순서 유지).
+
+    다른 요청과 동시에 조회하는 ID는 VideoDetailBatcher가 한 번의 호출로 합친다.
+    mask(part, fields)를 주면 그 부분 응답만 받는다.
+    """
+
+    unique_ids = list(dict.fromkeys(vid for vid in video_ids if vid))
+    if not unique_ids:
+        return {}
+    return _video_detail_batcher(mask).fetch(youtube, unique_ids)
+
+
+# 검색 응답 필드별로 videos().list 리소스에서 읽는 경로
+_SEARCH_FIELD_SOURCES: Dict[str, Tuple[str, ...]] = {
+    "url": ("id",),
+    "video_id": ("id",),
+    "title": ("snippet/title",),
+    "date_fmt": ("snippet/publishedAt",),
+    "published_at_iso": ("snippet/publishedAt",),
+    "channel_title": ("snippet/channelTitle",),
+    "channel_id": ("snippet/channelId",),
+    "view_count": ("statistics/viewCount",),
+    "dur_seconds": ("contentDetails/duration",),
+    "dur_hms": ("contentDetails/duration",),
+    "thumbnails": ("snippet/thumbnails",),
+    "language": ("snippet/defaultAudioLanguage", "snippet/defaultLanguage"),
+    "has_captions": ("contentDetails/caption",),
+    "matched_keywords": (),
+    "matched_channels": (),
+}
+_THUMBNAIL_SIZES = ("default", "medium", "high", "standard", "maxres")
+
+
+def _invalid_search_fields(fields: List[str]) -> List[str]:
+    invalid = []
+    for field in fields:
+        name, dot, size = field.partition(".")
+        if name not in _SEARCH_FIELD_SOURCES or (dot and (name != "thumbnails" or size not in _THUMBNAIL_SIZES)):
+            invalid.append(field)
+    return invalid
+
+
+def _video_detail_mask(
+    fields: Optional[List[str]],
+    *,
+    sort_by: str = "views",
+    min_views: int = 0,
+    length_filter: bool = False,
+) -> Optional[Tuple[str, str]]:
+    """응답 필드 목록을 videos().list의 (part, fields) 부분 응답 마스크로 바꾼다. fields가 없으면 None(전체)."""
+
+    if fields is None:
+        return None
+    # 항목 생성(id, 제목)과 정렬(게시일)에는 항상 필요하다.
+    paths = {"id", "snippet/title", "snippet/publishedAt"}
+    if sort_by == "views" or min_views:
+        paths.add("statistics/viewCount")
+    if length_filter:
+        paths.add("contentDetails/duration")
+    for field in fields:
+        name, _, size = field.partition(".")
+        if name == "thumbnails" and size:
+            paths.add(f"snippet/thumbnails/{size}")
+        else:
+            paths.update(_SEARCH_FIELD_SOURCES.get(name, ()))
+    # 상위 경로를 통째로 받으면 하위 경로는 따로 적지 않는다.
+    paths = {path for path in paths if not any(path.startswith(other + "/") for other in paths)}
+
+    tree: Dict[str, Any] = {}
+    for path in sorted(paths):
+        node = tree
+        for segment in path.split("/"):
+            node = node.setdefault(segment, {})
+
+    def render(node: Dict[str, Any]) -> str:
+        return ",".join(key + (f"({render(child)})" if child else "") for key, child in node.items())
+
+    part = ",".join(key for key in ("snippet", "statistics", "contentDetails") if key in tree)
+    return part, f"items({render(tree)})"
+
+
+def _search_projector(fields: List[str]) -> Callable[[Dict[str, Any]], Dict[str, Any]]:
+    """요청한 필드만 남기는 함수를 만든다. thumbnails.<size>는 그 크기의 썸네일만 남긴다.
+
+    _video_to_item 결과와 응답 payload 모두 같은 키를 쓰므로 어느 쪽에도 쓸 수 있다.
+    """
+
+    names = tuple(dict.fromkeys(field for field in fields if "." not in field))
+    sizes: Tuple[str, ...] = ()
+    if "thumbnails" not in names:
+        sizes = tuple(dict.fromkeys(field.partition(".")[2] for field in fields if field.startswith("thumbnails.")))
+
+    def project(item: Dict[str, Any]) -> Dict[str, Any]:
+        projected = {name: item[name] for name in names if name in item}
+        if sizes:
+            thumbnails = item.get("thumbnails") or {}
+            picked = {size: thumbnails[size] for size in sizes if size in thumbnails}
+            if picked:
+                projected["thumbnails"] = picked
+        return projected
+
+    return project
+
+
+def _video_to_item(video: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    vid = video.get("id")
+    snippet = video.get("snippet", {}) or {}
+    statistics = video.get("statistics", {}) or {}
+    content_details = video.get("contentDetails", {}) or {}
+    title = (snippet.get("title") or "").strip()
+    url = f"https://www.youtube.com/watch?v={vid}" if vid else ""
+    if not (title and url):
+        return None
+    channel_title = (snippet.get("channelTitle") or "").strip()
+    channel_id = (snippet.get("channelId") or "").strip()
+    date_raw, date_fmt = _format_upload_datestr_iso8601_to_pair(snippet.get("publishedAt") or "")
+    dur_seconds = _parse_iso8601_duration_to_seconds(content_details.get("duration") or "")
+    try:
+        view_count = int(statistics.get("viewCount")) if "viewCount" in statistics else None
+    except Exception:
+        view_count = None
+    return {
+        "url": url,
+        "title": title,
+        "video_id": vid,
+        "channel_title": channel_title,
+        "channel_id": channel_id,
+        "date_raw": date_raw,
+        "date_fmt": date_fmt,
+        "published_at_iso": snippet.get("publishedAt") or "",
+        "view_count": view_count,
+        "dur_seconds": dur_seconds,
+        "dur_hms": _fmt_hhmmss(dur_seconds),
+        "thumbnails": snippet.get("thumbnails") or {},
+        "language": snippet.get("defaultAudioLanguage")
+        or snippet.get("defaultLanguage")
+        or "",
+        "has_captions": str(content_details.get("caption", "")).lower() == "true",
+    }
 
 
 def load_channel_store() -> Dict[str, Any]:
@@ -469,27 +2474,172 @@ def load_channel_store() -> Dict[str, Any]:
 
 
 def save_channel_store(data: Dict[str, Any]):
-    with open(CHANNEL_STORE_PATH, "w", encoding="utf-8") as file:
+    tmp_path = f"{CHANNEL_STORE_PATH}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as file:
         json.dump(data, file, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, CHANNEL_STORE_PATH)
+
+
+# 채널 저장소를 읽고-고치고-쓰는 작업(추가, 삭제, 메타데이터 갱신)을 직렬화한다.
+_CHANNEL_STORE_LOCK = threading.RLock()
+
+
+def _sort_channel_entries(entries) -> List[Dict[str, Any]]:
+    return sorted(entries, key=lambda entry: (entry.get("title") or "").lower())
 
 
 def add_channel_to_store(channel_id: str, title: str):
     if not channel_id or not channel_id.startswith("UC"):
         return
-    data = load_channel_store()
-    items = {item["id"]: item for item in data.get("channels", []) if isinstance(item, dict) and "id" in item}
-    prev = items.get(channel_id)
-    if not prev or (title and prev.get("title") != title):
-        items[channel_id] = {"id": channel_id, "title": title or (prev.get("title") if prev else "")}
-        data["channels"] = sorted(items.values(), key=lambda entry: (entry.get("title") or "").lower())
-        save_channel_store(data)
+    with _CHANNEL_STORE_LOCK:
+        data = load_channel_store()
+        items = {item["id"]: item for item in data.get("channels", []) if isinstance(item, dict) and "id" in item}
+        prev = items.get(channel_id)
+        if not prev or (title and prev.get("title") != title):
+            # 갱신 작업이 채운 통계·업로드 목록 등은 그대로 둔다.
+            items[channel_id] = dict(prev or {}, id=channel_id, title=title or (prev.get("title") if prev else ""))
+            data["channels"] = _sort_channel_entries(items.values())
+            save_channel_store(data)
 
 
 def remove_channels_from_store(ids: List[str]):
-    data = load_channel_store()
-    keep = [item for item in data.get("channels", []) if item.get("id") not in set(ids)]
-    data["channels"] = keep
-    save_channel_store(data)
+    with _CHANNEL_STORE_LOCK:
+        data = load_channel_store()
+        keep = [item for item in data.get("channels", []) if item.get("id") not in set(ids)]
+        data["channels"] = keep
+        save_channel_store(data)
+
+
+CHANNEL_REFRESH_INTERVAL_SEC = _env_float("CHANNEL_REFRESH_INTERVAL_SEC", 0.0)
+CHANNEL_REFRESH_MAX_AGE_SEC = _env_float("CHANNEL_REFRESH_MAX_AGE_SEC", 6 * 3600.0)
+_CHANNEL_LIST_FIELDS = (
+    "items(id,etag,snippet(title,customUrl),contentDetails/relatedPlaylists/uploads,"
+    "statistics(subscriberCount,hiddenSubscriberCount,videoCount,viewCount))"
+)
+_CHANNEL_REFRESH_LOCK = threading.Lock()
+METRICS.describe("channel_refresh_total", "counter", "채널 메타데이터 갱신 결과별 채널 수 (outcome)")
+
+
+def _optional_int(value: Any) -> Optional[int]:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _channel_metadata(resource: Dict[str, Any]) -> Dict[str, Any]:
+    snippet = resource.get("snippet") or {}
+    statistics = resource.get("statistics") or {}
+    related = (resource.get("contentDetails") or {}).get("relatedPlaylists") or {}
+    return {
+        "title": (snippet.get("title") or "").strip(),
+        "custom_url": snippet.get("customUrl") or "",
+        "uploads_playlist_id": related.get("uploads") or "",
+        "subscriber_count": None if statistics.get("hiddenSubscriberCount") else _optional_int(statistics.get("subscriberCount")),
+        "video_count": _optional_int(statistics.get("videoCount")),
+        "view_count": _optional_int(statistics.get("viewCount")),
+        "etag": resource.get("etag") or "",
+    }
+
+
+def _channel_is_stale(entry: Dict[str, Any], now_utc: dt.datetime, max_age: float) -> bool:
+    # 손으로 고친 저장소의 None·숫자·시간대 없는 값도 갱신 전체를 멈추지 않고 오래된 것으로 본다.
+    try:
+        return (now_utc - dt.datetime.fromisoformat(entry.get("checked_at") or "")).total_seconds() >= max_age
+    except (TypeError, ValueError):
+        return True
+
+
+def refresh_channel_store(*, force: bool = False, max_age: Optional[float] = None) -> Optional[Dict[str, int]]:
+    """저장된 채널의 제목·업로드 재생목록·통계를 channels().list 50개 단위 호출로 갱신한다.
+
+    max_age 안에 확인한 채널은 건너뛰고(force면 전부 확인), etag가 같은 채널은 확인 시각만 바꾼다.
+    다른 갱신이 진행 중이면 None을 돌려준다.
+    """
+
+    if not YOUTUBE_API_KEY:
+        raise RuntimeError("YOUTUBE_API_KEY 미설정")
+    if build is None:
+        raise RuntimeError("google-api-python-client 필요")
+    if not _CHANNEL_REFRESH_LOCK.acquire(blocking=False):
+        return None
+    try:
+        now_utc = dt.datetime.now(dt.timezone.utc)
+        max_age = CHANNEL_REFRESH_MAX_AGE_SEC if max_age is None else max_age
+        entries = [item for item in load_channel_store().get("channels", []) if isinstance(item, dict) and item.get("id")]
+        due = [entry["id"] for entry in entries if force or _channel_is_stale(entry, now_utc, max_age)]
+        due = list(dict.fromkeys(due))
+
+        # API 호출은 저장소 잠금 밖에서 하고, 결과는 다시 읽은 저장소에 합친다.
+        youtube = _build_youtube_client(YOUTUBE_API_KEY) if due else None
+        fetched: Dict[str, Dict[str, Any]] = {}
+        calls = 0
+        for offset in range(0, len(due), 50):
+            chunk = due[offset : offset + 50]
+            resp = _execute_youtube(
+                youtube.channels().list(
+                    part="snippet,contentDetails,statistics",
+                    id=",".join(chunk),
+                    maxResults=50,
+                    fields=_CHANNEL_LIST_FIELDS,
+                ),
+                "youtube_channels_list",
+            )
+            calls += 1
+            for resource in resp.get("items", []):
+                if resource.get("id"):
+                    fetched[resource["id"]] = _channel_metadata(resource)
+
+        summary = {"checked": len(due), "skipped": len(entries) - len(due), "updated": 0, "unchanged": 0, "missing": 0, "calls": calls}
+        if not due:
+            return summary
+        checked_iso = dt.datetime.now(dt.timezone.utc).isoformat()
+        due_ids = set(due)
+        with _CHANNEL_STORE_LOCK:
+            data = load_channel_store()
+            for entry in data.get("channels", []):
+                if not isinstance(entry, dict) or entry.get("id") not in due_ids:
+                    continue
+                meta = fetched.get(entry["id"])
+                entry["checked_at"] = checked_iso
+                if meta is None:
+                    # 삭제·정지된 채널. 항목은 남겨 두고 표시만 한다.
+                    entry["unavailable"] = True
+                    summary["missing"] += 1
+                elif meta["etag"] and meta["etag"] == entry.get("etag") and not entry.get("unavailable"):
+                    summary["unchanged"] += 1
+                else:
+                    entry.pop("unavailable", None)
+                    entry.update({key: value for key, value in meta.items() if key != "title" or value})
+                    entry["updated_at"] = checked_iso
+                    summary["updated"] += 1
+            data["channels"] = _sort_channel_entries(data.get("channels", []))
+            save_channel_store(data)
+        for outcome in ("updated", "unchanged", "missing"):
+            if summary[outcome]:
+                METRICS.inc("channel_refresh_total", {"outcome": outcome}, float(summary[outcome]))
+        return summary
+    finally:
+        _CHANNEL_REFRESH_LOCK.release()
+
+
+_CHANNEL_REFRESH_STOP = threading.Event()
+
+
+def _channel_refresh_loop():
+    # 워커 프로세스가 여럿이어도 max_age 안에 확인한 채널은 건너뛰므로 중복 호출은 거의 없다.
+    while not _CHANNEL_REFRESH_STOP.is_set():
+        try:
+            refresh_channel_store()
+        except Exception as exc:  # pragma: no cover - 네트워크 의존
+            METRICS.inc("api_errors_total", {"route": "channel_refresh", "type": _error_type(exc)})
+        if _CHANNEL_REFRESH_STOP.wait(CHANNEL_REFRESH_INTERVAL_SEC * random.uniform(0.9, 1.1)):
+            return
+
+
+def _start_channel_refresh_scheduler():
+    if CHANNEL_REFRESH_INTERVAL_SEC > 0 and YOUTUBE_API_KEY and build is not None:
+        threading.Thread(target=_channel_refresh_loop, name="channel-refresh", daemon=True).start()
 
 
 def _ensure_netscape_cookie_text(cookie_text: str) -> str:
@@ -597,19 +2747,287 @@ def _extract_cookie_map(cookie_text: str) -> Dict[str, str]:
     return cookies
 
 
-def _build_sapisidhash_header(cookies: Dict[str, str], origin: str = "https://www.youtube.com") -> Optional[str]:
-    sapisid = cookies.get("SAPISID") or cookies.get("__Secure-3PAPISID")
-    if not sapisid:
-        return None
+def _sapisidhash(sapisid: str, origin: str = "https://www.youtube.com") -> str:
     timestamp = str(int(time.time()))
     digest_src = " ".join([timestamp, sapisid, origin])
     digest = hashlib.sha1(digest_src.encode("utf-8")).hexdigest()
     return f"SAPISIDHASH {timestamp}_{digest}"
 
 
+DEFAULT_EXTRACT_HEADERS: Dict[str, str] = {
+    "User-Agent": "Mozilla/5.0",
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+    "Accept-Language": "ko-KR,ko;q=0.9,en-US;q=0.8,en;q=0.7",
+    "Referer": "https://www.youtube.com/",
+}
+
+_COOKIE_CACHE_DIR = ""
+_COOKIE_CACHE_LOCK = threading.Lock()
+
+
+def _cookie_cache_dir() -> str:
+    global _COOKIE_CACHE_DIR
+    with _COOKIE_CACHE_LOCK:
+        if not _COOKIE_CACHE_DIR:
+            _COOKIE_CACHE_DIR = tempfile.mkdtemp(prefix="lr-policy-cookies-")
+            atexit.register(shutil.rmtree, _COOKIE_CACHE_DIR, True)
+        return _COOKIE_CACHE_DIR
+
+
+class CredentialSession:
+    """한 번만 정규화·파싱한 쿠키 세트와 그 계정의 상태.
+
+    쿠키 파일은 스레드마다 한 번만 만든다. yt_dlp가 종료 시 쿠키 파일을 다시
+    쓰기 때문에 동시에 돌아가는 작업끼리 같은 파일을 공유하지 않게 한다.
+    """
+
+    def __init__(self, cookie_text: str, label: str = ""):
+        self.cookie_text = _ensure_netscape_cookie_text(cookie_text)
+        self.key = hashlib.sha256(self.cookie_text.encode("utf-8")).hexdigest()[:16]
+        self.label = label or self.key
+        self.cookies = _extract_cookie_map(self.cookie_text)
+        self.sapisid = self.cookies.get("SAPISID") or self.cookies.get("__Secure-3PAPISID") or ""
+        self._lock = threading.Lock()
+        self._cookie_paths: Dict[int, str] = {}
+        self.successes = 0
+        self.failures = 0
+        self.consecutive_failures = 0
+        self.cooldown_until = 0.0
+        self.in_flight = 0
+        self.last_used = 0.0
+
+    @property
+    def valid(self) -> bool:
+        return bool(self.cookies)
+
+    def cookie_path(self) -> str:
+        thread_id = threading.get_ident()
+        with self._lock:
+            path = self._cookie_paths.get(thread_id)
+            if path and os.path.exists(path):
+                return path
+            path = os.path.join(_cookie_cache_dir(), f"{self.key}-{thread_id}.txt")
+            fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, "w", encoding="utf-8") as file:
+                file.write(self.cookie_text)
+            self._cookie_paths[thread_id] = path
+            return path
+
+    def http_headers(self, base: Optional[Dict[str, str]] = None) -> Dict[str, str]:
+        headers = dict(base or DEFAULT_EXTRACT_HEADERS)
+        if self.sapisid:
+            headers["Authorization"] = _sapisidhash(self.sapisid)
+            headers.setdefault("Origin", "https://www.youtube.com")
+            headers.setdefault("X-Origin", "https://www.youtube.com")
+            headers.setdefault("X-Youtube-Client-Name", "1")
+            headers.setdefault("X-Youtube-Client-Version", "2.20240501.01.00")
+        return headers
+
+    def health_score(self, now: Optional[float] = None) -> float:
+        if (now or time.time()) < self.cooldown_until:
+            return 0.0
+        # 성공률(라플라스 보정)에서 진행 중인 작업 수만큼 깎아 부하를 나눈다.
+        success_rate = (self.successes + 1) / (self.successes + self.failures + 2)
+        return success_rate / (1 + self.in_flight)
+
+    def begin(self, *, track: bool = True):
+        # 캐시된 세션은 여러 풀(실행기의 작업별 풀)이 함께 쓰므로 카운터는 세션 잠금으로 보호한다.
+        with self._lock:
+            self.last_used = time.time()
+            if track:
+                self.in_flight += 1
+
+    def end(self):
+        with self._lock:
+            self.in_flight = max(0, self.in_flight - 1)
+
+    def report(self, ok: bool, *, throttled: bool = False):
+        with self._lock:
+            if ok:
+                self.successes += 1
+                self.consecutive_failures = 0
+                return
+            self.failures += 1
+            self.consecutive_failures += 1
+            if throttled or self.consecutive_failures >= 3:
+                backoff = min(1800.0, 60.0 * (2 ** min(self.consecutive_failures - 1, 5)))
+                self.cooldown_until = time.time() + backoff
+
+
+_CREDENTIAL_CACHE_SIZE = 32
+_CREDENTIAL_SESSIONS: "collections.OrderedDict[str, CredentialSession]" = collections.OrderedDict()
+_CREDENTIAL_SESSIONS_LOCK = threading.Lock()
+
+
+def get_credential_session(cookie_text: str, label: str = "") -> Optional[CredentialSession]:
+    """쿠키 텍스트의 해시로 캐시된 세션을 돌려준다. 유효한 쿠키가 없으면 None."""
+
+    if not cookie_text or not cookie_text.strip():
+        return None
+    raw_key = hashlib.sha256(cookie_text.encode("utf-8")).hexdigest()
+    with _CREDENTIAL_SESSIONS_LOCK:
+        session = _CREDENTIAL_SESSIONS.get(raw_key)
+        if session is not None:
+            _CREDENTIAL_SESSIONS.move_to_end(raw_key)
+            return session if session.valid else None
+    session = CredentialSession(cookie_text, label)
+    with _CREDENTIAL_SESSIONS_LOCK:
+        session = _CREDENTIAL_SESSIONS.setdefault(raw_key, session)
+        _CREDENTIAL_SESSIONS.move_to_end(raw_key)
+        while len(_CREDENTIAL_SESSIONS) > _CREDENTIAL_CACHE_SIZE:
+            _CREDENTIAL_SESSIONS.popitem(last=False)
+    return session if session.valid else None
+
+
+# 가장 좋은 점수의 이 비율 이상인 계정끼리는 돌아가며 쓴다.
+CREDENTIAL_SPREAD_RATIO = _env_float("CREDENTIAL_SPREAD_RATIO", 0.7)
+
+
+class CredentialPool:
+    """여러 계정의 쿠키 세션을 상태 점수에 따라 돌려 쓴다."""
+
+    def __init__(self, sessions: Optional[List[CredentialSession]] = None):
+        self._lock = threading.Lock()
+        self._sessions: List[CredentialSession] = []
+        for session in sessions or []:
+            self.add(session)
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def add(self, session: Optional[CredentialSession]):
+        if session is None:
+            return
+        with self._lock:
+            if all(existing.key != session.key for existing in self._sessions):
+                self._sessions.append(session)
+
+    def get(self, key: str) -> Optional[CredentialSession]:
+        return next((session for session in self._sessions if session.key == key), None)
+
+    def _best(self) -> Optional[CredentialSession]:
+        if not self._sessions:
+            return None
+        now = time.time()
+        scores = {session.key: session.health_score(now) for session in self._sessions}
+        top = max(scores.values())
+        if top <= 0:
+            # 모두 쉬는 중이면 가장 먼저 풀리는 계정을 쓴다.
+            return min(self._sessions, key=lambda session: session.cooldown_until)
+        # 가장 좋은 점수에 가까운 계정들 중 가장 오래 쉰 계정을 골라 부하를 돌아가며 나눈다.
+        candidates = [session for session in self._sessions if scores[session.key] >= top * CREDENTIAL_SPREAD_RATIO]
+        return min(candidates, key=lambda session: session.last_used)
+
+    def pick(self) -> Optional[CredentialSession]:
+        """진행 중 작업 수를 늘리지 않고 계정을 고른다. release 짝이 필요 없다."""
+
+        with self._lock:
+            best = self._best()
+            if best is not None:
+                best.begin(track=False)
+            return best
+
+    def acquire(self) -> Optional[CredentialSession]:
+        with self._lock:
+            best = self._best()
+            if best is not None:
+                best.begin()
+            return best
+
+    def release(self, session: Optional[CredentialSession], ok: Optional[bool], *, throttled: bool = False):
+        """ok=None이면 요청이 나가지 않은 것이므로 계정 상태에 반영하지 않는다."""
+
+        if session is None:
+            return
+        session.end()
+        if ok is not None:
+            session.report(ok, throttled=throttled)
+
+    def snapshot(self) -> List[Dict[str, Any]]:
+        now = time.time()
+        return [
+            {
+                "key": session.key,
+                "label": session.label,
+                "successes": session.successes,
+                "failures": session.failures,
+                "cooling_down": session.cooldown_until > now,
+                "in_flight": session.in_flight,
+                "health_score": session.health_score(now),
+            }
+            for session in self._sessions
+        ]
+
+
+def load_credential_pool(extra_cookie_texts: Optional[List[str]] = None) -> CredentialPool:
+    """환경변수(YOUTUBE_COOKIE_TEXT, YOUTUBE_COOKIE_FILES)와 추가 쿠키로 풀을 구성한다."""
+
+    pool = CredentialPool()
+    for text in extra_cookie_texts or []:
+        pool.add(get_credential_session(text))
+    pool.add(get_credential_session(DEFAULT_COOKIE_TEXT, "default"))
+    for path in YOUTUBE_COOKIE_FILES:
+        try:
+            with open(path, "r", encoding="utf-8") as file:
+                pool.add(get_credential_session(file.read(), os.path.basename(path)))
+        except OSError:
+            continue
+    return pool
+
+
+CREDENTIAL_POOL = load_credential_pool()
+METRICS.register_gauge(
+    "credential_health_score",
+    "계정(쿠키 해시 앞 16자)별 상태 점수. 0이면 쉬는 중",
+    lambda: [({"credential": entry["key"]}, entry["health_score"]) for entry in CREDENTIAL_POOL.snapshot()],
+)
+
+
+def _dump_json(payload: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(payload)
+    return json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def _compress_body(body: bytes, accept_encoding: str) -> Tuple[bytes, str]:
+    """Accept-Encoding에 맞춰 (본문, Content-Encoding)을 돌려준다. 작은 본문은 그대로 둔다."""
+
+    if len(body) < RESPONSE_COMPRESSION_MIN_BYTES or not accept_encoding:
+        return body, ""
+    accepted = {part.split(";", 1)[0].strip().lower() for part in accept_encoding.split(",")}
+    if brotli is not None and "br" in accepted:
+        return brotli.compress(body, quality=4), "br"
+    if "gzip" in accepted:
+        return gzip.compress(body, compresslevel=5), "gzip"
+    return body, ""
+
+
+def _json_response(payload: Any, request: Optional[Request] = None) -> Response:
+    """이미 검증된 dict를 재검증 없이 바로 직렬화·압축해 돌려준다."""
+
+    body, encoding = _compress_body(
+        _dump_json(payload), request.headers.get("accept-encoding", "") if request is not None else ""
+    )
+    headers = {"Vary": "Accept-Encoding"}
+    if encoding:
+        headers["Content-Encoding"] = encoding
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
 class ExtractReq(BaseModel):
     urls: List[str] = Field(default_factory=list)
     cookie_text: Optional[str] = Field(default=None, description="Netscape 쿠키 텍스트")
+    include_auto_captions: bool = Field(
+        default=True,
+        description=(
+            "업로드된 자막이 없다고 표시된(caption=false) 영상도 자동 자막을 기대하고 실행기로 보낸다. "
+            "false면 사전 점검에서 '자막 없음'으로 바로 돌려준다"
+        ),
+    )
+    priority: Optional[str] = Field(
+        default=None,
+        description="interactive 또는 bulk. 비우면 URL 수(CAPTION_BULK_URL_THRESHOLD 초과면 bulk)로 정한다",
+    )
 
 
 class ExtractItem(BaseModel):
@@ -618,6 +3036,7 @@ class ExtractItem(BaseModel):
     filename: str
     text: Optional[str]
     warning: Optional[str] = None
+    deferred: bool = False
 
 
 class ExtractJobResponse(BaseModel):
@@ -626,6 +3045,7 @@ class ExtractJobResponse(BaseModel):
     queued_urls: List[str]
     workflow_url: Optional[str] = None
     message: Optional[str] = None
+    skipped: List[ExtractItem] = Field(default_factory=list)
 
 
 class ExtractJobStatus(BaseModel):
@@ -634,12 +3054,15 @@ class ExtractJobStatus(BaseModel):
     results: List[ExtractItem] = Field(default_factory=list)
     error: Optional[str] = None
     updated_at: Optional[str] = None
+    priority: Optional[str] = None
+    attempts: int = 0
 
 
 class ExtractJobCompleteReq(BaseModel):
     status: str
     results: List[ExtractItem] = Field(default_factory=list)
     error: Optional[str] = None
+    lease_id: Optional[str] = None
 
 
 class SearchReq(BaseModel):
@@ -654,6 +3077,11 @@ class SearchReq(BaseModel):
     min_views: int = 0
     len_min: Optional[int] = None
     len_max: Optional[int] = None
+    mode: str = Field(default="per_keyword", description="per_keyword | union")
+    fields: Optional[List[str]] = Field(
+        default=None,
+        description="응답에 담을 필드 목록 (예: title, url, view_count, thumbnails.medium). 비우면 전체",
+    )
 
 
 class SearchItem(BaseModel):
@@ -672,51 +3100,163 @@ class SearchItem(BaseModel):
     has_captions: bool = False
 
 
+class SearchUnionItem(SearchItem):
+    matched_keywords: List[str] = Field(default_factory=list)
+    matched_channels: List[str] = Field(default_factory=list)
+
+
+def _skipped_item(url: str, title: str, warning: str) -> Dict[str, Any]:
+    return ExtractItem(
+        url=url,
+        title=title or "(unknown)",
+        filename=(sanitize_filename(title) if title else "video") + ".txt",
+        text=None,
+        warning=warning,
+    ).dict()
+
+
+def _preflight_extract_urls(
+    urls: List[str], *, include_auto_captions: bool = True
+) -> Tuple[List[str], List[Dict[str, Any]], Dict[str, str]]:
+    """실행기로 보낼 URL을 추린다.
+
+    videos().list를 50개 단위로 한 번씩만 호출하고(캐시된 메타데이터는 재사용),
+    잘못된 URL·없는 영상(삭제·비공개)·라이브 영상은 곧바로 결과로 돌려준다.
+    contentDetails.caption은 업로드된 자막만 나타내므로, 자동 자막만 있는 영상까지 건너뛰는
+    "자막 없음" 판정은 include_auto_captions=False로 요청했을 때만 한다.
+    API 호출이 실패하면 점검 없이 모두 실행기로 보낸다.
+    반환값: (실행할 URL, 즉시 결과, URL별 제목 힌트)
+    """
+
+    video_ids = {url: _parse_video_id(url) for url in urls}
+    metas: Dict[str, Optional[Dict[str, Any]]] = {vid: VIDEO_META_CACHE.get(vid) for vid in video_ids.values() if vid}
+    missing = [vid for vid, meta in metas.items() if meta is None]
+    lookup_ok = True
+    if missing:
+        try:
+            if not YOUTUBE_API_KEY or build is None:
+                raise RuntimeError("YOUTUBE_API_KEY 미설정")
+            _fetch_video_details(_build_youtube_client(YOUTUBE_API_KEY), missing)
+            metas.update({vid: VIDEO_META_CACHE.get(vid) for vid in missing})
+        except Exception as exc:  # pragma: no cover - 네트워크 의존
+            METRICS.inc("api_errors_total", {"route": "/api/extract_captions", "type": _error_type(exc)})
+            lookup_ok = False
+
+    viable: List[str] = []
+    skipped: List[Dict[str, Any]] = []
+    titles: Dict[str, str] = {}
+    for url in urls:
+        vid = video_ids[url]
+        if not vid:
+            skipped.append(_skipped_item(url, "", "유효한 YouTube 영상 URL이 아님"))
+            continue
+        meta = metas.get(vid)
+        if meta is None:
+            if lookup_ok:
+                skipped.append(_skipped_item(url, "", "영상을 찾을 수 없음 (삭제·비공개)"))
+            else:
+                viable.append(url)
+            continue
+        if meta["live"]:
+            skipped.append(_skipped_item(url, meta["title"], "라이브·예정 영상은 자막을 추출할 수 없음"))
+            continue
+        if not meta["has_captions"] and not include_auto_captions:
+            skipped.append(_skipped_item(url, meta["title"], "자막 없음"))
+            continue
+        viable.append(url)
+        if meta["title"]:
+            titles[url] = meta["title"]
+    METRICS.inc("caption_preflight_skipped_total", value=float(len(skipped)))
+    return viable, skipped, titles
+
+
 @app.post("/api/extract_captions", response_model=ExtractJobResponse)
-def api_extract(req: ExtractReq):
+def api_extract(req: ExtractReq, response: Response, x_profile_token: str = Header(default="")):
+    if not _should_profile(x_profile_token):
+        return _create_extract_job(req)
+    with _profiling("api_extract", enabled=True, meta={"url_count": len(req.urls)}) as session:
+        result = _create_extract_job(req, profile=True)
+    if session is not None:
+        response.headers["X-Profile-Id"] = session.profile_id
+    return result
+
+
+def _create_extract_job(req: ExtractReq, *, profile: bool = False) -> ExtractJobResponse:
     if not req.urls:
         raise HTTPException(400, "urls 비어있음")
+    if req.priority is not None and req.priority not in JOB_PRIORITIES:
+        raise HTTPException(400, "priority는 interactive 또는 bulk")
+    priority = req.priority or ("bulk" if len(req.urls) > CAPTION_BULK_URL_THRESHOLD else "interactive")
 
-    if not CAPTION_WORKFLOW_REPO or not CAPTION_WORKFLOW_FILE or not CAPTION_WORKFLOW_TOKEN:
+    pull_mode = CAPTION_DISPATCH_MODE == "pull"
+    if not pull_mode and (not CAPTION_WORKFLOW_REPO or not CAPTION_WORKFLOW_FILE or not CAPTION_WORKFLOW_TOKEN):
         raise HTTPException(500, "GitHub Actions 연동 환경변수가 설정되지 않았습니다.")
-    if not CAPTION_WORKFLOW_BASE_URL:
+    if not pull_mode and not CAPTION_WORKFLOW_BASE_URL:
         raise HTTPException(500, "CAPTION_JOB_BASE_URL 환경변수가 설정되지 않았습니다.")
     if not CAPTION_INTERNAL_JOB_TOKEN:
         raise HTTPException(500, "CAPTION_JOB_TOKEN 환경변수가 설정되지 않았습니다.")
 
-    cookie_text = (req.cookie_text or "").strip() or DEFAULT_COOKIE_TEXT
-    http_headers: Dict[str, str] = {
-        "User-Agent": "Mozilla/5.0",
-        "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
-        "Accept-Language": "ko-KR,ko;q=0.9,en-US;q=0.8,en;q=0.7",
-        "Referer": "https://www.youtube.com/",
-    }
-    if cookie_text:
-        cookie_text = _ensure_netscape_cookie_text(cookie_text)
-        cookies = _extract_cookie_map(cookie_text)
-        auth_header = _build_sapisidhash_header(cookies)
-        if auth_header:
-            http_headers["Authorization"] = auth_header
-            http_headers.setdefault("Origin", "https://www.youtube.com")
-            http_headers.setdefault("X-Origin", "https://www.youtube.com")
-            http_headers.setdefault("X-Youtube-Client-Name", "1")
-            http_headers.setdefault("X-Youtube-Client-Version", "2.20240501.01.00")
+    # 요청에 쿠키가 없으면 설정된 계정 중 가장 상태가 좋은 계정을 작업에 배정한다.
+    # SAPISIDHASH는 시각이 들어가므로 실행기가 요청마다 새로 만든다.
+    request_cookie_text = (req.cookie_text or "").strip()
+    # 작업은 다른 워커 프로세스에서 끝날 수 있고 디스패치 실패 등 끝나지 않는 경로도 있으므로,
+    # 백엔드는 in_flight를 세지 않고 완료 보고 때 결과만 계정 상태에 반영한다.
+    if request_cookie_text:
+        session = get_credential_session(request_cookie_text)
+    else:
+        session = CREDENTIAL_POOL.pick()
+    cookie_text = session.cookie_text if session else ""
+    http_headers = dict(DEFAULT_EXTRACT_HEADERS)
+
+    viable_urls, skipped, titles = _preflight_extract_urls(
+        req.urls, include_auto_captions=req.include_auto_captions
+    )
 
     now_utc = dt.datetime.now(dt.timezone.utc)
     job_id = f"{now_utc.strftime('%Y%m%d%H%M%S')}-{uuid.uuid4().hex[:8]}"
     job_data = {
         "job_id": job_id,
-        "status": "queued",
-        "urls": req.urls,
-        "cookie_text": cookie_text,
+        "status": "queued" if viable_urls else "completed",
+        "requested_urls": req.urls,
+        "urls": viable_urls,
+        "titles": titles,
+        "preflight_results": skipped,
+        "cookie_text": cookie_text if viable_urls else "",
+        "credential_key": session.key if session else "",
         "http_headers": http_headers,
         "created_at": now_utc.isoformat(),
         "updated_at": now_utc.isoformat(),
-        "results": [],
+        "results": [] if viable_urls else skipped,
         "error": None,
+        "priority": priority,
+        "attempts": 0,
+        "max_attempts": CAPTION_JOB_MAX_ATTEMPTS,
+        "available_at": time.time(),
+        "lease_id": None,
+        "lease_expires_at": None,
+        # 프로파일링한 요청이 만든 작업은 실행기도 URL별로 프로파일링한다.
+        "profile": profile,
     }
     _save_job(job_data)
 
+    if not viable_urls:
+        return ExtractJobResponse(
+            job_id=job_id,
+            status="completed",
+            queued_urls=[],
+            message="실행할 영상이 없어 사전 점검 결과만 돌려줍니다.",
+            skipped=skipped,
+        )
+
+    if pull_mode:
+        return ExtractJobResponse(
+            job_id=job_id,
+            status="queued",
+            queued_urls=viable_urls,
+            message="자막 추출 작업을 대기열에 넣었습니다. 상주 실행기가 처리합니다.",
+            skipped=skipped,
+        )
+
     try:
         _dispatch_caption_workflow(job_id)
     except Exception as exc:
@@ -734,50 +3274,242 @@ def api_extract(req: ExtractReq):
     return ExtractJobResponse(
         job_id=job_id,
         status="queued",
-        queued_urls=req.urls,
+        queued_urls=viable_urls,
         workflow_url=workflow_url,
         message="GitHub Actions에 자막 추출 작업을 요청했습니다.",
+        skipped=skipped,
     )
 
 
+def _extract_item_payload(item: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    # 저장된 결과는 완료 시점에 ExtractItem으로 검증된 값이므로 필드만 골라 담는다.
+    if not isinstance(item, dict) or not isinstance(item.get("url"), str):
+        return None
+    return {
+        "url": item["url"],
+        "title": item.get("title") or "",
+        "filename": item.get("filename") or "",
+        "text": item.get("text"),
+        "warning": item.get("warning"),
+        "deferred": bool(item.get("deferred")),
+    }
+
+
 @app.get("/api/extract_captions/{job_id}", response_model=ExtractJobStatus)
-def api_extract_status(job_id: str):
+def api_extract_status(job_id: str, request: Request):
     job = _load_job(job_id)
     if not job:
         raise HTTPException(404, "작업을 찾을 수 없습니다.")
-    results_data = job.get("results") or []
-    results: List[ExtractItem] = []
-    for item in results_data:
-        try:
-            results.append(ExtractItem(**item))
-        except Exception:
-            continue
-    return ExtractJobStatus(
-        job_id=job_id,
-        status=job.get("status") or "unknown",
-        results=results,
-        error=job.get("error"),
-        updated_at=job.get("updated_at"),
+    results = [payload for payload in map(_extract_item_payload, job.get("results") or []) if payload]
+    return _json_response(
+        {
+            "job_id": job_id,
+            "status": job.get("status") or "unknown",
+            "results": results,
+            "error": job.get("error"),
+            "updated_at": job.get("updated_at"),
+            "priority": job.get("priority") or "interactive",
+            "attempts": int(job.get("attempts") or 0),
+        },
+        request,
     )
 
 
-@app.get("/internal/caption_jobs/{job_id}")
-def internal_get_caption_job(job_id: str, x_job_token: str = Header(default="")):
-    _require_internal_token(x_job_token)
-    job = _load_job(job_id)
-    if not job:
-        raise HTTPException(404, "작업을 찾을 수 없습니다.")
-    job["status"] = "running"
-    job["updated_at"] = dt.datetime.now(dt.timezone.utc).isoformat()
-    _save_job(job)
+def _runner_job_payload(job: Dict[str, Any]) -> Dict[str, Any]:
     return {
-        "job_id": job_id,
+        "job_id": job.get("job_id"),
         "urls": job.get("urls") or [],
         "cookie_text": job.get("cookie_text") or "",
         "http_headers": job.get("http_headers") or {},
+        "titles": job.get("titles") or {},
+        "lease_id": job.get("lease_id"),
+        "lease_timeout_sec": CAPTION_JOB_VISIBILITY_SEC,
+        "attempt": int(job.get("attempts") or 0),
+        "profile": bool(job.get("profile")),
     }
 
 
+def _claim_next_job(worker: str = "") -> Optional[Dict[str, Any]]:
+    """가져갈 수 있는 대기 작업 하나에 리스를 걸어 돌려준다.
+
+    interactive 작업을 먼저 내주고, CAPTION_BULK_SHARE_EVERY번에 한 번은 bulk를 먼저 내준다.
+    같은 우선순위 안에서는 대기열에 들어온 순서(available_at)대로 내준다.
+    """
+
+    global _JOB_CLAIM_COUNT
+    now = time.time()
+    ready = [
+        (job_id, entry)
+        for job_id, entry in _job_status_snapshot().items()
+        if entry["status"] == "queued" and entry["available_at"] <= now
+    ]
+    if not ready:
+        return None
+    with _JOB_CLAIM_LOCK:
+        _JOB_CLAIM_COUNT += 1
+        prefer_bulk = _JOB_CLAIM_COUNT % CAPTION_BULK_SHARE_EVERY == 0
+        ready.sort(key=lambda item: ((item[1]["priority"] == "bulk") != prefer_bulk, item[1]["available_at"], item[0]))
+        for job_id, _ in ready:
+            job = _load_job(job_id)
+            if not job:
+                _forget_job_status(job_id)
+                continue
+            if job.get("status") != "queued" or float(job.get("available_at") or 0.0) > now:
+                # 다른 워커 프로세스가 이미 가져갔거나 다시 미뤄진 작업
+                _record_job_status(job)
+                continue
+            _start_lease(job, worker)
+            return job
+    return None
+
+
+def _dispatch_due_retries():
+    """workflow 모드에서 백오프(available_at)가 끝난 재시도 작업마다 GitHub Actions를 다시 호출한다."""
+
+    if CAPTION_DISPATCH_MODE == "pull":
+        return
+    now = time.time()
+    due = [
+        job_id
+        for job_id, entry in _job_status_snapshot().items()
+        if entry["status"] == "queued" and entry["dispatch_pending"] and entry["available_at"] <= now
+    ]
+    for job_id in due:
+        with _JOB_CLAIM_LOCK:
+            job = _load_job(job_id)
+            if not job:
+                _forget_job_status(job_id)
+                continue
+            if (
+                job.get("status") != "queued"
+                or not job.get("dispatch_pending")
+                or float(job.get("available_at") or 0.0) > now
+            ):
+                # 다른 워커 프로세스가 이미 다시 호출했거나 상태가 바뀐 작업
+                _record_job_status(job)
+                continue
+            job["dispatch_pending"] = False
+            _save_job(job)
+        try:
+            _dispatch_caption_workflow(job_id)
+        except Exception as exc:  # pragma: no cover - 네트워크 의존
+            with _JOB_CLAIM_LOCK:
+                job = _load_job(job_id)
+                if job and job.get("status") == "queued":
+                    job["status"] = "failed"
+                    job["error"] = f"GitHub Actions 재요청 실패: {exc}"
+                    job["cookie_text"] = ""
+                    job["updated_at"] = dt.datetime.now(dt.timezone.utc).isoformat()
+                    _save_job(job)
+
+
+CAPTION_QUEUE_MAINTENANCE_SEC = _env_float("CAPTION_QUEUE_MAINTENANCE_SEC", 5.0)
+_JOB_MAINTENANCE_STOP = threading.Event()
+
+
+def _job_queue_maintenance_loop():
+    # 리스 회수와 재시도 디스패치는 사용자 요청 밖에서 한다. 워커 프로세스마다 돌아도
+    # 작업 파일 조작은 _JOB_CLAIM_LOCK으로 직렬화되므로 같은 작업을 두 번 처리하지 않는다.
+    while not _JOB_MAINTENANCE_STOP.is_set():
+        try:
+            _refresh_job_status_index()
+            _reclaim_expired_leases()
+            _dispatch_due_retries()
+        except Exception as exc:  # pragma: no cover - 파일 시스템·네트워크 의존
+            METRICS.inc("api_errors_total", {"route": "caption_queue_maintenance", "type": _error_type(exc)})
+        if _JOB_MAINTENANCE_STOP.wait(CAPTION_QUEUE_MAINTENANCE_SEC):
+            return
+
+
+def _start_job_queue_maintenance():
+    if CAPTION_QUEUE_MAINTENANCE_SEC > 0:
+        threading.Thread(target=_job_queue_maintenance_loop, name="caption-queue-maintenance", daemon=True).start()
+
+
+@app.post("/internal/caption_jobs/claim")
+async def internal_claim_caption_job(
+    wait: float = Query(25.0, ge=0.0, le=60.0),
+    worker: str = Query(""),
+    x_job_token: str = Header(default=""),
+):
+    """상주 실행기용 long-poll. 대기 작업이 생길 때까지 최대 wait초 기다리고, 없으면 204를 돌려준다.
+
+    돌려준 작업에는 리스가 걸려 있으며, 실행기는 lease_timeout_sec 안에 하트비트로 연장해야 한다.
+    기다리는 동안은 이벤트 루프에서 대기하므로 쉬는 실행기가 많아도 스레드 풀을 차지하지 않는다.
+    파일을 다루는 가져가기·색인 갱신만 잠깐씩 스레드 풀에서 돌린다.
+    """
+
+    _require_internal_token(x_job_token)
+    deadline = time.monotonic() + wait
+    waiter = (asyncio.get_running_loop(), asyncio.Event())
+    with _JOB_QUEUE_WAITERS_LOCK:
+        _JOB_QUEUE_WAITERS.add(waiter)
+    try:
+        await run_in_threadpool(_refresh_job_status_index)
+        while True:
+            # 가져가기 전에 지워 두어야 그 사이에 들어온 알림을 놓치지 않는다.
+            waiter[1].clear()
+            job = await run_in_threadpool(_claim_next_job, worker)
+            if job is not None:
+                return _runner_job_payload(job)
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return Response(status_code=204)
+            try:
+                await asyncio.wait_for(waiter[1].wait(), min(remaining, 2.0))
+            except asyncio.TimeoutError:
+                # 다른 워커 프로세스가 만든 작업은 알림이 오지 않으므로 주기적으로 다시 훑는다.
+                await run_in_threadpool(_refresh_job_status_index)
+    finally:
+        with _JOB_QUEUE_WAITERS_LOCK:
+            _JOB_QUEUE_WAITERS.discard(waiter)
+
+
+class CaptionJobLeaseReq(BaseModel):
+    lease_id: str
+
+
+@app.post("/internal/caption_jobs/{job_id}/heartbeat")
+def internal_heartbeat_caption_job(
+    job_id: str,
+    payload: CaptionJobLeaseReq,
+    x_job_token: str = Header(default=""),
+):
+    _require_internal_token(x_job_token)
+    with _JOB_CLAIM_LOCK:
+        job = _load_job(job_id)
+        if not job:
+            raise HTTPException(404, "작업을 찾을 수 없습니다.")
+        if job.get("status") != "running" or job.get("lease_id") != payload.lease_id:
+            raise HTTPException(409, "리스가 만료되어 작업이 회수되었습니다.")
+        job["lease_expires_at"] = time.time() + CAPTION_JOB_VISIBILITY_SEC
+        _save_job(job)
+    return {"lease_id": payload.lease_id, "lease_timeout_sec": CAPTION_JOB_VISIBILITY_SEC}
+
+
+@app.get("/internal/caption_jobs/{job_id}")
+def internal_get_caption_job(job_id: str, x_job_token: str = Header(default="")):
+    _require_internal_token(x_job_token)
+    with _JOB_CLAIM_LOCK:
+        job = _load_job(job_id)
+        if not job:
+            raise HTTPException(404, "작업을 찾을 수 없습니다.")
+        if job.get("status") != "queued" or float(job.get("available_at") or 0.0) > time.time():
+            # 끝났거나 다른 실행기가 리스를 쥔 작업, 백오프 중인 작업은 다시 내주지 않는다.
+            raise HTTPException(409, "가져갈 수 있는 상태의 작업이 아닙니다.")
+        _start_lease(job, "workflow")
+    return _runner_job_payload(job)
+
+
+def _merge_preflight_results(job: Dict[str, Any], results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """사전 점검 결과, 앞선 시도에서 끝난 결과, 실행기 결과를 요청한 URL 순서대로 합친다."""
+
+    merged = list(job.get("preflight_results") or []) + list(job.get("partial_results") or []) + results
+    order = {url: idx for idx, url in enumerate(job.get("requested_urls") or [])}
+    merged.sort(key=lambda item: order.get(item.get("url"), len(order)))
+    return merged
+
+
 @app.post("/internal/caption_jobs/{job_id}/complete")
 def internal_complete_caption_job(
     job_id: str,
@@ -785,40 +3517,231 @@ def internal_complete_caption_job(
     x_job_token: str = Header(default=""),
 ):
     _require_internal_token(x_job_token)
-    job = _load_job(job_id)
-    if not job:
-        raise HTTPException(404, "작업을 찾을 수 없습니다.")
-    now_iso = dt.datetime.now(dt.timezone.utc).isoformat()
-    job["status"] = payload.status
-    job["updated_at"] = now_iso
-    job["error"] = payload.error
-    job["results"] = [item.dict() for item in payload.results]
-    job["cookie_text"] = ""
-    _save_job(job)
+    with _JOB_CLAIM_LOCK:
+        job = _load_job(job_id)
+        if not job:
+            raise HTTPException(404, "작업을 찾을 수 없습니다.")
+        if payload.lease_id and job.get("lease_id") != payload.lease_id:
+            # 리스가 만료돼 다른 실행기가 가져간 작업의 늦은 보고
+            raise HTTPException(409, "리스가 만료되어 작업이 회수되었습니다.")
+        now_iso = dt.datetime.now(dt.timezone.utc).isoformat()
+        items = [item.dict() for item in payload.results]
+        deferred_urls = [item["url"] for item in items if item["deferred"]]
+        pooled_session = CREDENTIAL_POOL.get(job.get("credential_key") or "")
+        if payload.status == "failed":
+            requeued = _retry_or_dead_letter(job, payload.error or "자막 추출 실패")
+        elif (
+            payload.status == "completed"
+            and deferred_urls
+            and int(job.get("attempts") or 0) < int(job.get("max_attempts") or CAPTION_JOB_MAX_ATTEMPTS)
+        ):
+            # 요청 제한으로 보류된 영상만 백오프 뒤 다시 시도한다. 끝난 결과는 partial_results에 쌓아 두었다가
+            # 최종 결과에 합친다. 시도 횟수를 다 쓰면 아래 완료 경로로 가서 deferred 표시만 남긴다.
+            job["partial_results"] = list(job.get("partial_results") or []) + [
+                item for item in items if not item["deferred"]
+            ]
+            job["urls"] = deferred_urls
+            if pooled_session is not None:
+                # 제한에 걸린 계정 대신 지금 가장 상태가 좋은 계정으로 다시 시도한다.
+                pooled_session.report(False, throttled=True)
+                replacement = CREDENTIAL_POOL.pick()
+                if replacement is not None:
+                    job["credential_key"] = replacement.key
+                    job["cookie_text"] = replacement.cookie_text
+            requeued = _retry_or_dead_letter(job, f"요청 제한으로 보류된 영상 {len(deferred_urls)}개 재시도")
+        else:
+            requeued = False
+            job["status"] = payload.status
+            job["updated_at"] = now_iso
+            job["error"] = payload.error
+            job["results"] = _merge_preflight_results(job, items)
+            job["cookie_text"] = ""
+            job["lease_id"] = None
+            job["lease_expires_at"] = None
+            _save_job(job)
+    if requeued:
+        # 백오프가 끝나면 _dispatch_due_retries가 다시 호출한다.
+        return {"status": job["status"], "updated_at": now_iso}
+    if job["status"] == "dead_letter":
+        if pooled_session is not None:
+            pooled_session.report(False)
+        return {"status": job["status"], "updated_at": now_iso}
+    try:
+        TRANSCRIPT_INDEX.index_results(job_id, job["results"])
+    except Exception as exc:  # pragma: no cover - 색인 실패가 작업 완료를 막지 않게 한다
+        METRICS.inc("api_errors_total", {"route": "/internal/caption_jobs/{job_id}/complete", "type": _error_type(exc)})
+    if pooled_session is not None:
+        throttled = bool(deferred_urls)
+        pooled_session.report(payload.status == "completed" and not throttled, throttled=throttled)
     return {"status": job["status"], "updated_at": now_iso}
 
 
-@app.post("/api/search_videos", response_model=Dict[str, List[SearchItem]])
-def api_search(req: SearchReq):
+def _search_item_payload(item: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "url": item["url"],
+        "title": item["title"],
+        "date_fmt": item["date_fmt"],
+        "channel_title": item["channel_title"],
+        "view_count": item["view_count"],
+        "dur_seconds": item["dur_seconds"],
+        "dur_hms": item["dur_hms"],
+        "channel_id": item["channel_id"],
+        "video_id": item.get("video_id") or "",
+        "published_at_iso": item.get("published_at_iso") or "",
+        "thumbnails": item.get("thumbnails") or {},
+        "language": item.get("language") or "",
+        "has_captions": bool(item.get("has_captions")),
+    }
+
+
+def _filter_search_items(items: List[Dict[str, Any]], req: SearchReq) -> List[Dict[str, Any]]:
+    out: List[Dict[str, Any]] = []
+    for item in items:
+        view_count = item.get("view_count")
+        if isinstance(req.min_views, int) and (view_count is not None) and view_count < req.min_views:
+            continue
+        if req.len_min is not None and item.get("dur_seconds", 0) < req.len_min:
+            continue
+        if req.len_max is not None and item.get("dur_seconds", 0) > req.len_max:
+            continue
+        out.append(item)
+    return out
+
+
+def _search_union(req: SearchReq) -> List[Dict[str, Any]]:
+    """모든 키워드·채널 검색 결과를 하나로 합쳐 중복 없이 정렬한다.
+
+    키워드별 결과는 per_keyword 모드와 같은 규칙으로 고르되, 영상 상세 조회는
+    전체에서 중복을 뺀 ID로 한 번만(50개 단위) 수행한다.
+    """
+
+    if build is None:
+        raise RuntimeError("google-api-python-client 필요")
+    youtube = _build_youtube_client(YOUTUBE_API_KEY)
+    channel_ids: Dict[str, str] = {}
+    for channel in req.channel_ids:
+        try:
+            channel_ids[channel] = _resolve_channel_id(youtube, channel)
+        except Exception:  # pragma: no cover - 네트워크 의존
+            channel_ids[channel] = ""
+
+    searched: List[Tuple[str, str, List[str]]] = []
+    for keyword in req.keywords:
+        for channel in req.channel_ids or [""]:
+            params = _build_search_params(
+                keyword or "",
+                max_results=req.limit,
+                time_filter=req.time_filter,
+                custom_from=req.custom_from_iso,
+                custom_to=req.custom_to_iso,
+                duration_filter=req.duration_filter,
+                sort_by=req.sort_by,
+                channel_id=channel_ids.get(channel, ""),
+            )
+            try:
+                video_ids = _search_video_ids(youtube, params)
+            except Exception as exc:  # pragma: no cover - 네트워크 의존
+                METRICS.inc("api_errors_total", {"route": "/api/search_videos", "type": _error_type(exc)})
+                video_ids = []
+            searched.append((keyword, channel, video_ids))
+
+    all_ids = [vid for _, _, video_ids in searched for vid in video_ids]
+    try:
+        details = _fetch_video_details(youtube, all_ids, _search_detail_mask(req))
+    except Exception as exc:  # pragma: no cover - 네트워크 의존
+        METRICS.inc("api_errors_total", {"route": "/api/search_videos", "type": _error_type(exc)})
+        details = {}
+    items_by_id = {vid: item for vid, item in ((vid, _video_to_item(video)) for vid, video in details.items()) if item}
+
+    union: Dict[str, Dict[str, Any]] = {}
+    for keyword in req.keywords:
+        combined: Dict[str, Dict[str, Any]] = {}
+        matched_channels: Dict[str, List[str]] = {}
+        for kw, channel, video_ids in searched:
+            if kw != keyword:
+                continue
+            per_channel = [items_by_id[vid] for vid in video_ids if vid in items_by_id]
+            _sort_search_items(per_channel, req.sort_by)
+            for item in per_channel[: req.limit]:
+                combined.setdefault(item["video_id"], item)
+                if channel:
+                    matched_channels.setdefault(item["video_id"], []).append(channel)
+        ranked = list(combined.values())
+        _sort_search_items(ranked, req.sort_by)
+        for item in _filter_search_items(ranked[: req.limit], req):
+            entry = union.get(item["video_id"])
+            if entry is None:
+                entry = dict(_search_item_payload(item), date_raw=item["date_raw"], matched_keywords=[], matched_channels=[])
+                union[item["video_id"]] = entry
+            if keyword not in entry["matched_keywords"]:
+                entry["matched_keywords"].append(keyword)
+            for channel in matched_channels.get(item["video_id"], []):
+                if channel not in entry["matched_channels"]:
+                    entry["matched_channels"].append(channel)
+
+    items = list(union.values())
+    _sort_search_items(items, req.sort_by)
+    for item in items:
+        item.pop("date_raw", None)
+    if req.fields is not None:
+        items = list(map(_search_projector(req.fields), items))
+    return items
+
+
+def _search_detail_mask(req: SearchReq) -> Optional[Tuple[str, str]]:
+    return _video_detail_mask(
+        req.fields,
+        sort_by=req.sort_by,
+        min_views=req.min_views,
+        length_filter=req.len_min is not None or req.len_max is not None,
+    )
+
+
+@app.post("/api/search_videos", response_model=Dict[str, List[Union[SearchUnionItem, SearchItem]]])
+def api_search(req: SearchReq, request: Request, x_profile_token: str = Header(default="")):
+    """키워드별 결과를 돌려준다. mode="union"이면 {"items": [...]} 하나로 합쳐 돌려준다."""
+
     if not YOUTUBE_API_KEY:
         raise HTTPException(500, "서버에 YOUTUBE_API_KEY 환경변수 미설정")
     if not req.keywords:
         raise HTTPException(400, "keywords 비어있음")
-
-    def _filter_local(items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-        out: List[Dict[str, Any]] = []
-        for item in items:
-            view_count = item.get("view_count")
-            if isinstance(req.min_views, int) and (view_count is not None) and view_count < req.min_views:
-                continue
-            if req.len_min is not None and item.get("dur_seconds", 0) < req.len_min:
-                continue
-            if req.len_max is not None and item.get("dur_seconds", 0) > req.len_max:
-                continue
-            out.append(item)
-        return out
-
-    merged: Dict[str, List[SearchItem]] = {}
+    if req.mode not in ("per_keyword", "union"):
+        raise HTTPException(400, "mode는 per_keyword 또는 union")
+    invalid_fields = _invalid_search_fields(req.fields or [])
+    if invalid_fields:
+        raise HTTPException(400, f"알 수 없는 fields: {', '.join(invalid_fields)}")
+    if req.fields is not None and not req.fields:
+        # 빈 목록은 생략한 것과 같이 전체 필드를 돌려준다.
+        req = req.copy(update={"fields": None})
+
+    # 여러 관리자가 같은 화면을 동시에 열면 같은 검색이 한꺼번에 들어오므로 하나로 합친다.
+    flight_key = json.dumps(req.dict(), sort_keys=True, ensure_ascii=False)
+    if not _should_profile(x_profile_token):
+        return _json_response(SEARCH_FLIGHT.do(flight_key, lambda: _run_search(req)), request)
+    meta = {"mode": req.mode, "keywords": len(req.keywords), "channels": len(req.channel_ids)}
+    with _profiling("api_search", enabled=True, meta=meta) as session:
+        payload = SEARCH_FLIGHT.do(flight_key, lambda: _run_search(req))
+    response = _json_response(payload, request)
+    if session is not None:
+        response.headers["X-Profile-Id"] = session.profile_id
+    return response
+
+
+SEARCH_FLIGHT = SingleFlight("api_search", timeout=_env_float("SEARCH_SINGLEFLIGHT_TIMEOUT_SEC", 120.0))
+
+
+def _run_search(req: SearchReq) -> Dict[str, List[Dict[str, Any]]]:
+    if req.mode == "union":
+        try:
+            items = _search_union(req)
+        except Exception as exc:  # pragma: no cover
+            METRICS.inc("api_errors_total", {"route": "/api/search_videos", "type": _error_type(exc)})
+            items = []
+        return {"items": items}
+
+    merged: Dict[str, List[Dict[str, Any]]] = {}
+    detail_mask = _search_detail_mask(req)
+    project = _search_projector(req.fields) if req.fields is not None else None
     for keyword in req.keywords:
         key = keyword or ""
         try:
@@ -836,22 +3759,14 @@ def api_search(req: SearchReq):
                         duration_filter=req.duration_filter,
                         sort_by=req.sort_by,
                         channel_filter=channel_id,
+                        detail_mask=detail_mask,
                     )
                     for item in items:
                         if item["url"] in seen_urls:
                             continue
                         seen_urls.add(item["url"])
                         combined.append(item)
-                if req.sort_by == "views":
-                    combined.sort(
-                        key=lambda item: (
-                            0 if isinstance(item["view_count"], int) else 1,
-                            -(item["view_count"] or 0),
-                            item["date_raw"] or "00000000",
-                        )
-                    )
-                else:
-                    combined.sort(key=lambda item: item["date_raw"] or "00000000", reverse=True)
+                _sort_search_items(combined, req.sort_by)
                 items_for_keyword = combined[: req.limit]
             else:
                 items_for_keyword = search_youtube_videos_api(
@@ -864,34 +3779,130 @@ def api_search(req: SearchReq):
                     duration_filter=req.duration_filter,
                     sort_by=req.sort_by,
                     channel_filter="",
+                    detail_mask=detail_mask,
                 )
-        except HttpError:  # pragma: no cover - 네트워크 의존
+        except HttpError as exc:  # pragma: no cover - 네트워크 의존
+            METRICS.inc("api_errors_total", {"route": "/api/search_videos", "type": _error_type(exc)})
             items_for_keyword = []
-        except Exception:  # pragma: no cover
+        except Exception as exc:  # pragma: no cover
+            METRICS.inc("api_errors_total", {"route": "/api/search_videos", "type": _error_type(exc)})
             items_for_keyword = []
 
-        filtered = _filter_local(items_for_keyword)
-        merged[keyword] = [
-            SearchItem(
-                url=item["url"],
-                title=item["title"],
-                date_fmt=item["date_fmt"],
-                channel_title=item["channel_title"],
-                view_count=item["view_count"],
-                dur_seconds=item["dur_seconds"],
-                dur_hms=item["dur_hms"],
-                channel_id=item["channel_id"],
-                video_id=item.get("video_id") or "",
-                published_at_iso=item.get("published_at_iso") or "",
-                thumbnails=item.get("thumbnails") or {},
-                language=item.get("language") or "",
-                has_captions=bool(item.get("has_captions")),
-            )
-            for item in filtered
-        ]
+        filtered = _filter_search_items(items_for_keyword, req)
+        if project is not None:
+            merged[keyword] = list(map(project, filtered))
+        else:
+            merged[keyword] = [_search_item_payload(item) for item in filtered]
+    # response_model은 문서용으로만 남기고, 검증된 dict를 바로 직렬화한다.
     return merged
 
 
+@app.get("/api/transcripts/search")
+def api_transcripts_search(
+    request: Request,
+    q: str = Query(..., min_length=1),
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+):
+    try:
+        items = TRANSCRIPT_INDEX.search(q, limit=limit, offset=offset)
+    except sqlite3.Error as exc:
+        raise HTTPException(400, f"검색어를 처리할 수 없습니다: {exc}")
+    return _json_response({"query": q, "items": items}, request)
+
+
+@app.get("/metrics", include_in_schema=False)
+def get_metrics(authorization: str = Header(default="")):
+    if METRICS_TOKEN and authorization != f"Bearer {METRICS_TOKEN}":
+        raise HTTPException(403, "지표 토큰 불일치")
+    return PlainTextResponse(METRICS.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+
+def _require_profile_token(x_profile_token: str):
+    if not PROFILE_TOKEN:
+        raise HTTPException(404, "프로파일링이 설정되지 않았습니다.")
+    if x_profile_token != PROFILE_TOKEN:
+        raise HTTPException(403, "프로파일 토큰 불일치")
+
+
+@app.get("/api/profiles", include_in_schema=False)
+def list_profiles(
+    request: Request,
+    limit: int = Query(50, ge=1, le=500),
+    name: str = Query(""),
+    x_profile_token: str = Header(default=""),
+):
+    _require_profile_token(x_profile_token)
+    try:
+        names = sorted((n for n in os.listdir(PROFILE_DIR) if n.endswith(".json")), reverse=True)
+    except OSError:
+        names = []
+    items: List[Dict[str, Any]] = []
+    for file_name in names:
+        if name and f"-{name}-" not in file_name:
+            continue
+        try:
+            with open(os.path.join(PROFILE_DIR, file_name), "r", encoding="utf-8") as file:
+                record = json.load(file)
+        except (OSError, ValueError):
+            continue
+        items.append({key: record.get(key) for key in ("profile_id", "name", "started_at", "duration_ms", "cpu_profile", "error", "meta")})
+        if len(items) >= limit:
+            break
+    return _json_response({"items": items}, request)
+
+
+class ProfileUploadReq(BaseModel):
+    record: Dict[str, Any]
+    prof_b64: str = ""
+
+
+PROFILE_UPLOAD_MAX_BYTES = int(_env_float("PROFILE_UPLOAD_MAX_BYTES", 16 * 1024 * 1024))
+
+
+@app.post("/internal/profiles", include_in_schema=False)
+def internal_upload_profile(payload: ProfileUploadReq, x_job_token: str = Header(default="")):
+    """실행기가 남긴 프로파일을 받아 백엔드 PROFILE_DIR에 저장한다.
+
+    GitHub Actions 실행기의 작업 디렉터리는 실행이 끝나면 사라지므로, /api/profiles로
+    조회·내려받기할 수 있게 여기로 올려 둔다.
+    """
+
+    _require_internal_token(x_job_token)
+    profile_id = str(payload.record.get("profile_id") or "")
+    if not _PROFILE_ID_RE.match(profile_id):
+        raise HTTPException(400, "잘못된 프로파일 ID")
+    if len(payload.prof_b64) > PROFILE_UPLOAD_MAX_BYTES * 4 // 3 + 4:
+        raise HTTPException(413, "프로파일이 너무 큽니다.")
+    try:
+        prof_bytes = base64.b64decode(payload.prof_b64, validate=True) if payload.prof_b64 else b""
+    except (binascii.Error, ValueError):
+        raise HTTPException(400, "prof_b64가 올바른 base64가 아닙니다.")
+    record = dict(payload.record)
+    record["cpu_profile"] = bool(prof_bytes)
+    record["source"] = "runner"
+    _save_profile_record(record, prof_bytes)
+    return {"profile_id": profile_id}
+
+
+@app.get("/api/profiles/{profile_id}", include_in_schema=False)
+def get_profile(
+    profile_id: str,
+    fmt: str = Query("json", alias="format", pattern="^(json|prof)$"),
+    x_profile_token: str = Header(default=""),
+):
+    """json은 구간 시간과 상위 함수 요약, prof는 pstats/snakeviz로 여는 cProfile 원본."""
+
+    _require_profile_token(x_profile_token)
+    if not _PROFILE_ID_RE.match(profile_id):
+        raise HTTPException(400, "잘못된 프로파일 ID")
+    path = os.path.join(PROFILE_DIR, f"{profile_id}.{fmt}")
+    if not os.path.exists(path):
+        raise HTTPException(404, "프로파일을 찾을 수 없습니다.")
+    media_type = "application/json" if fmt == "json" else "application/octet-stream"
+    return FileResponse(path, media_type=media_type, filename=os.path.basename(path))
+
+
 @app.get("/api/channel_store")
 def get_channel_store():
     return load_channel_store()
@@ -922,6 +3933,28 @@ def remove_channels(payload: Dict[str, Any] = Body(...)):
     return load_channel_store()
 
 
+@app.post("/api/channel_store/refresh")
+def refresh_channels(force: bool = Query(False)):
+    """저장된 채널 메타데이터를 갱신한다. force가 아니면 최근에 확인한 채널은 건너뛴다."""
+
+    if not YOUTUBE_API_KEY:
+        raise HTTPException(500, "서버에 YOUTUBE_API_KEY 환경변수 미설정")
+    try:
+        summary = refresh_channel_store(force=force)
+    except Exception as exc:  # pragma: no cover - 네트워크 의존
+        METRICS.inc("api_errors_total", {"route": "/api/channel_store/refresh", "type": _error_type(exc)})
+        raise HTTPException(502, f"채널 정보 갱신 실패: {exc}")
+    if summary is None:
+        raise HTTPException(409, "채널 정보 갱신이 이미 진행 중입니다.")
+    return dict(load_channel_store(), refresh=summary)
+
+
+app.add_event_handler("startup", _start_channel_refresh_scheduler)
+app.add_event_handler("shutdown", _CHANNEL_REFRESH_STOP.set)
+app.add_event_handler("startup", _start_job_queue_maintenance)
+app.add_event_handler("shutdown", _JOB_MAINTENANCE_STOP.set)
+
+
 if __name__ == "__main__":  # pragma: no cover
     import uvicorn
 